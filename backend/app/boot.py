@@ -0,0 +1,207 @@
+"""
+Boot sequence shared by every worker.
+
+The schema step runs once per schema change: workers compare a
+fingerprint of the models against the `schema_migrations` table and only
+the first one to take the schema lock creates tables and adds missing
+columns and indexes; the rest wait for the lock and find the work done.
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from sqlalchemy import Column, DateTime, String, Table, UniqueConstraint, inspect, select, text
+from sqlalchemy.schema import AddConstraint, CreateIndex
+from app.database import Base, engine, refresh_sqlite_replicas
+
+SCHEMA_LOCK_PATH = os.getenv(
+    "SCHEMA_LOCK_PATH",
+    os.path.join(tempfile.gettempdir(), "hrcompliance-schema.lock")
+)
+DB_WARM_CONNECTIONS = int(os.getenv("DB_WARM_CONNECTIONS", "2"))
+POSTGRES_SCHEMA_LOCK_KEY = 72_410_001  # Arbitrary application-wide advisory lock id
+
+schema_migrations = Table(
+    "schema_migrations",
+    Base.metadata,
+    Column("fingerprint", String(64), primary_key=True),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+class BootState:
+    """Readiness flag and step timings reported by /health/ready"""
+
+    def __init__(self):
+        self.ready = False
+        self.started_at = time.perf_counter()
+        self.timings = {}
+
+    @contextmanager
+    def step(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = round((time.perf_counter() - started) * 1000, 1)
+
+    def mark_ready(self):
+        self.timings["total"] = round((time.perf_counter() - self.started_at) * 1000, 1)
+        self.ready = True
+
+boot_state = BootState()
+
+def _import_models():
+    """Register every model on Base.metadata"""
+    from app.models import archive, audit, client, document, notification, report, scorecard, storage, task, user  # noqa: F401
+
+def schema_fingerprint() -> str:
+    """Stable hash of the tables, columns, indexes and unique constraints the models declare"""
+    _import_models()
+    parts = []
+    for table in sorted(Base.metadata.tables.values(), key=lambda t: t.name):
+        parts.append(table.name)
+        parts.extend(f"{c.name}:{c.type}:{c.nullable}" for c in table.columns)
+        parts.extend(sorted(index.name or "" for index in table.indexes))
+        parts.extend(sorted(c.name or "" for c in table.constraints if c.name))
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+def _fingerprint_applied(connection, fingerprint: str) -> bool:
+    if not inspect(connection).has_table(schema_migrations.name):
+        return False
+    row = connection.execute(
+        select(schema_migrations.c.fingerprint).where(schema_migrations.c.fingerprint == fingerprint)
+    ).first()
+    return row is not None
+
+@contextmanager
+def schema_lock(connection):
+    """Cross-process lock around schema changes (advisory lock on Postgres, file lock otherwise)"""
+    if connection.dialect.name == "postgresql":
+        # Session-level lock; commit so the caller can open its own transaction
+        connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": POSTGRES_SCHEMA_LOCK_KEY})
+        connection.commit()
+        try:
+            yield
+        finally:
+            connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": POSTGRES_SCHEMA_LOCK_KEY})
+            connection.commit()
+        return
+
+    try:
+        import fcntl
+    except ImportError:  # Non-POSIX: single process deployments only
+        yield
+        return
+
+    with open(SCHEMA_LOCK_PATH, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def _add_missing_columns_and_indexes(connection):
+    """
+    Additive migration: new columns (nullable or with a server default), indexes and unique constraints.
+
+    A column with info={"backfill": <expression>} is filled from that expression when it is added.
+    """
+    inspector = inspect(connection)
+    preparer = connection.dialect.identifier_preparer
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+
+        existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            column_type = column.type.compile(dialect=connection.dialect)
+            ddl = f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {preparer.format_column(column)} {column_type}"
+            default = getattr(column.server_default, "arg", None)
+            if isinstance(default, str):  # Constant defaults only; SQLite rejects expressions here
+                ddl += f" DEFAULT {default}"
+                if not column.nullable:
+                    ddl += " NOT NULL"
+            connection.execute(text(ddl))
+            backfill = column.info.get("backfill")
+            if backfill is not None:
+                # Derived column: compute it for rows that predate it, leaving onupdate timestamps alone
+                untouched = {c.name: c for c in table.columns if c.onupdate is not None}
+                connection.execute(table.update().values({**untouched, column.name: backfill}))
+
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        existing_indexes |= {c["name"] for c in inspector.get_unique_constraints(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                connection.execute(CreateIndex(index))
+        for constraint in table.constraints:
+            if not isinstance(constraint, UniqueConstraint) or constraint.name in existing_indexes:
+                continue
+            if connection.dialect.name == "sqlite":
+                # SQLite cannot ALTER in a constraint; a unique index enforces the same thing
+                columns = ", ".join(preparer.format_column(c) for c in constraint.columns)
+                connection.execute(text(
+                    f"CREATE UNIQUE INDEX {preparer.quote(constraint.name)} "
+                    f"ON {preparer.format_table(table)} ({columns})"
+                ))
+            else:
+                connection.execute(AddConstraint(constraint))
+
+def ensure_schema() -> bool:
+    """Bring the database schema up to date; returns True if this process applied changes"""
+    fingerprint = schema_fingerprint()
+
+    # Fast path: nothing to do and no lock taken
+    with engine.connect() as connection:
+        if _fingerprint_applied(connection, fingerprint):
+            return False
+
+    with engine.connect() as connection:
+        with schema_lock(connection):
+            with connection.begin():
+                if _fingerprint_applied(connection, fingerprint):
+                    return False  # Another worker finished while we waited
+                Base.metadata.create_all(bind=connection)
+                _add_missing_columns_and_indexes(connection)
+                connection.execute(schema_migrations.insert().values(
+                    fingerprint=fingerprint, applied_at=datetime.utcnow()
+                ))
+    return True
+
+def warm_database_pool(connections: int = DB_WARM_CONNECTIONS):
+    """Open pool connections up front so the first requests don't pay for connecting"""
+    opened = []
+    try:
+        for _ in range(max(1, connections)):
+            connection = engine.connect()
+            connection.execute(text("SELECT 1"))
+            opened.append(connection)
+    finally:
+        for connection in opened:
+            connection.close()
+
+def ping_database():
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+def warm_password_backend():
+    """Load and self-test the bcrypt backend before the first login"""
+    from app.utils.auth import get_password_context
+    get_password_context().handler().get_backend()
+
+def run_boot_sequence():
+    """Blocking boot steps; run in a worker thread from the startup hook"""
+    with boot_state.step("schema"):
+        ensure_schema()
+    with boot_state.step("replicas"):
+        refresh_sqlite_replicas()  # Local SQLite replicas start from the migrated primary
+    with boot_state.step("upload_dir"):
+        os.makedirs("uploads", exist_ok=True)
+    with boot_state.step("db_pool"):
+        warm_database_pool()
+    with boot_state.step("password_backend"):
+        warm_password_backend()
@@ -1,31 +1,279 @@
-from sqlalchemy import create_engine
+from fastapi import Request, Response
+from jose import jwt, JWTError
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from typing import Dict, List, Optional
+import asyncio
+import itertools
 import os
+import sqlite3
+import threading
+import time
 
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./hr_compliance.db")
 
+# Read replicas (comma-separated URLs); empty means every read goes to the primary
+READ_REPLICA_URLS = [url.strip() for url in os.getenv("READ_REPLICA_URLS", "").split(",") if url.strip()]
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_LAG_CHECK_SECONDS = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "1"))
+REPLICA_SYNC_SECONDS = float(os.getenv("REPLICA_SYNC_SECONDS", "2"))
+LAST_WRITE_COOKIE = "last_write_at"
+
+# Connection pool profile (ignored for in-memory SQLite)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))
+
+def sqlite_path(url: str) -> Optional[str]:
+    """Filesystem path of a file-backed SQLite URL, else None"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite" or parsed.database in (None, "", ":memory:"):
+        return None
+    return parsed.database
+
+class PoolMonitor:
+    """Pool counters for one engine, reported by pool_stats()"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.connects = 0
+        self.checkouts = 0
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        self.connects += 1
+        apply_statement_timeout(self.engine.dialect.name, dbapi_connection)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self.checkouts += 1
+
+    def stats(self) -> Dict:
+        pool = self.engine.pool
+        stats = {"connects": self.connects, "checkouts": self.checkouts}
+        if hasattr(pool, "checkedout"):
+            stats.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+                max_overflow=getattr(pool, "_max_overflow", None),
+            )
+        return stats
+
+def apply_statement_timeout(dialect: str, dbapi_connection):
+    """Per-connection statement timeout so a runaway query can't hold a pooled connection"""
+    if DB_STATEMENT_TIMEOUT_MS <= 0:
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        if dialect == "postgresql":
+            cursor.execute(f"SET statement_timeout = {DB_STATEMENT_TIMEOUT_MS}")
+        elif dialect in ("mysql", "mariadb"):
+            cursor.execute(f"SET SESSION max_execution_time = {DB_STATEMENT_TIMEOUT_MS}")
+    finally:
+        cursor.close()
+    if dialect == "postgresql":
+        dbapi_connection.commit()  # Don't leave the SET's implicit transaction open
+
+def _create_engine(url: str):
+    options = {"connect_args": {"check_same_thread": False} if "sqlite" in url else {}}
+    if "sqlite" not in url or sqlite_path(url) is not None:
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=DB_POOL_PRE_PING,
+        )
+    return create_engine(url, **options)
+
 # Create SQLAlchemy engine
-engine = create_engine(
-    DATABASE_URL, 
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
+engine = _create_engine(DATABASE_URL)
+replica_engines = [_create_engine(url) for url in READ_REPLICA_URLS]
+pool_monitors = {"primary": PoolMonitor(engine)}
+pool_monitors.update({f"replica_{i}": PoolMonitor(e) for i, e in enumerate(replica_engines)})
+
+pool_timeouts = 0
+
+def note_pool_timeout():
+    """Count a request that gave up waiting for a pooled connection"""
+    global pool_timeouts
+    pool_timeouts += 1
+
+def pool_stats() -> Dict:
+    """Pool size, usage and counters for the primary and each replica"""
+    stats = {name: monitor.stats() for name, monitor in pool_monitors.items()}
+    stats["request_timeouts"] = pool_timeouts
+    return stats
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False)
 
 # Create Base class for models
 Base = declarative_base()
 
+class ReplicaRouter:
+    """
+    Picks the session for read-only requests.
+
+    Replicas are used round-robin while their measured lag is within
+    REPLICA_MAX_LAG_SECONDS. A request stays on the primary when its
+    caller may otherwise miss a recent write: the caller committed
+    something itself (last-write cookie), its token was just issued, or a
+    change event for its client arrived inside the lag window.
+    """
+
+    def __init__(self, replicas: List):
+        self.replicas = replicas
+        self._cycle = itertools.cycle(range(len(replicas))) if replicas else None
+        self._lag: Dict[int, float] = {}
+        self._lag_checked_at: Dict[int, float] = {}
+        self._client_writes: Dict[int, float] = {}
+        self._last_write = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def measure_lag(self, replica) -> float:
+        """Seconds the replica may be behind the primary"""
+        path = sqlite_path(str(replica.url))
+        if path is not None:
+            # Local stand-in: a backup copy is as old as its last refresh
+            return time.time() - os.path.getmtime(path)
+        with replica.connect() as connection:
+            if connection.dialect.name == "postgresql":
+                return float(connection.execute(text(
+                    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+                )).scalar())
+            return 0.0
+
+    def _replica_lag(self, index: int) -> float:
+        now = time.monotonic()
+        if now - self._lag_checked_at.get(index, 0.0) >= REPLICA_LAG_CHECK_SECONDS:
+            try:
+                lag = self.measure_lag(self.replicas[index])
+            except Exception:
+                lag = float("inf")  # Unreachable replicas are skipped until the next check
+            self._lag[index] = lag
+            self._lag_checked_at[index] = now
+        return self._lag[index]
+
+    def pick(self):
+        """Next replica engine within the lag tolerance, or None"""
+        if not self.replicas:
+            return None
+        with self._lock:
+            for _ in range(len(self.replicas)):
+                index = next(self._cycle)
+                if self._replica_lag(index) <= REPLICA_MAX_LAG_SECONDS:
+                    return self.replicas[index]
+        return None
+
+    def note_change(self, event: dict):
+        """Event bus listener: remember when each client's data last changed"""
+        now = time.monotonic()
+        self._last_write = now
+        if event.get("client_id") is not None:
+            self._client_writes[event["client_id"]] = now
+
+    def needs_primary(self, request: Request) -> bool:
+        """Whether a replica read could miss a write this caller should see"""
+        wall_now = time.time()
+        try:
+            if wall_now - float(request.cookies.get(LAST_WRITE_COOKIE, 0)) < REPLICA_MAX_LAG_SECONDS:
+                return True
+        except ValueError:
+            pass
+
+        claims = {}
+        authorization = request.headers.get("authorization", "")
+        token = authorization[7:] if authorization.lower().startswith("bearer ") else request.query_params.get("token")
+        if token:
+            try:
+                # Routing hint only; get_current_user still verifies the token
+                claims = jwt.get_unverified_claims(token)
+            except JWTError:
+                claims = {}
+        if wall_now - claims.get("iat", 0) < REPLICA_MAX_LAG_SECONDS:
+            return True
+
+        cutoff = time.monotonic() - REPLICA_MAX_LAG_SECONDS
+        if claims.get("cid") is not None:
+            return self._client_writes.get(claims["cid"], 0.0) > cutoff
+        return self._last_write > cutoff  # Admins (and older tokens) see every client's data
+
+    def session(self, request: Request):
+        replica = None if self.needs_primary(request) else self.pick()
+        if replica is None:
+            return SessionLocal()
+        db = ReplicaSessionLocal(bind=replica)
+        db.info["replica"] = True
+        return db
+
+# Process-wide replica router
+replica_router = ReplicaRouter(replica_engines)
+
+def refresh_sqlite_replicas():
+    """Copy the primary into file-backed SQLite replicas with the backup API"""
+    source_path = sqlite_path(DATABASE_URL)
+    if source_path is None:
+        return
+    for replica in replica_engines:
+        target_path = sqlite_path(str(replica.url))
+        if target_path is None:
+            continue
+        source = sqlite3.connect(source_path)
+        target = sqlite3.connect(target_path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+
+async def run_sqlite_replica_sync():
+    """Background loop refreshing SQLite replicas every REPLICA_SYNC_SECONDS"""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(REPLICA_SYNC_SECONDS)
+        try:
+            await loop.run_in_executor(None, refresh_sqlite_replicas)
+        except Exception as e:
+            print(f"Replica refresh failed: {e}")
+
 # Dependency to get database session
-def get_db():
+def get_db(response: Response):
     db = SessionLocal()
+    if replica_router.enabled:
+        # Keep this caller on the primary until replicas have caught up with its write
+        @event.listens_for(db, "after_commit")
+        def remember_write(session):
+            response.set_cookie(LAST_WRITE_COOKIE, str(time.time()),
+                                max_age=int(REPLICA_MAX_LAG_SECONDS) + 1, httponly=True, samesite="lax")
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Dependency for read-only routes: a replica when one is fresh enough, else the primary
+def get_read_db(request: Request):
+    db = replica_router.session(request)
     try:
         yield db
     finally:
         db.close()
 
-# Initialize database tables
+# Initialize database tables (one-time, lock-protected; see app.boot)
 def init_db():
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    from app.boot import ensure_schema
+    ensure_schema()
\ No newline at end of file
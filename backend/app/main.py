@@ -1,11 +1,28 @@
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import init_db
-from app.routes import auth, admin, client, documents
-import os
+from fastapi.concurrency import run_in_threadpool
+from app.boot import boot_state, run_boot_sequence, ping_database
+from app.database import replica_router, run_sqlite_replica_sync, pool_stats, note_pool_timeout, DB_POOL_TIMEOUT
+from app.routes import auth, admin, client, documents, events, reports, uploads
+from app.utils.events import event_bus
+from app.utils.rate_limit import login_admission
+from app.utils.scheduler import deadline_scheduler, TASK_SCHEDULER_ENABLED
+from app.utils.recurrence import run_recurring_task_generator
+from app.utils.archive import run_archiver, ARCHIVE_ENABLED
+from app.utils.audit import audit_log
+from app.utils.resumable import run_upload_cleanup
+from app.utils.storage_usage import run_storage_reconciler
+from app.utils.scorecards import scorecard_refresher
+from app.utils.reports import report_worker
+from app.utils.notifications import notification_dispatcher, NOTIFICATIONS_ENABLED
+from app.utils.access_cache import document_access_cache
+from app.utils.response_cache import response_cache
+import asyncio
+import math
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -27,7 +44,20 @@ app.add_middleware(
 app.include_router(auth.router, prefix="/api")
 app.include_router(admin.router, prefix="/api")
 app.include_router(client.router, prefix="/api")
+app.include_router(uploads.router, prefix="/api")  # Before documents: /documents/{document_id} would shadow it
 app.include_router(documents.router, prefix="/api")
+app.include_router(events.router, prefix="/api")
+app.include_router(reports.router, prefix="/api")
+
+# Pool exhaustion: shed load with 503 instead of letting requests hang
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    note_pool_timeout()
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database busy, please retry"},
+        headers={"Retry-After": str(max(1, math.ceil(DB_POOL_TIMEOUT / 2)))}
+    )
 
 # Serve static files and templates
 app.mount("/static", StaticFiles(directory="frontend/static"), name="static")
@@ -80,16 +110,104 @@ async def health_check():
     """Health check endpoint for deployment monitoring"""
     return {"status": "healthy", "message": "HR Compliance Platform is running"}
 
-# Initialize database on startup
+@app.get("/health/live")
+async def liveness_check():
+    """Liveness probe: the process is up and serving requests"""
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness probe: boot sequence finished and the database answers"""
+    if not boot_state.ready:
+        return JSONResponse(status_code=503, content={"status": "starting", "boot_ms": boot_state.timings})
+    
+    try:
+        await run_in_threadpool(ping_database)
+    except Exception as e:
+        return JSONResponse(status_code=503, content={"status": "database_unavailable", "detail": str(e)})
+    
+    return {
+        "status": "ready",
+        "boot_ms": boot_state.timings,
+        "pool": pool_stats(),
+        "caches": {**document_access_cache.stats(), "admin_lists": response_cache.stats()},
+        "audit": audit_log.stats()
+    }
+
+# Boot sequence on startup
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database tables on startup"""
-    init_db()
+    """Run the boot sequence and start background services"""
+    # Schema step (once across workers), upload dir, DB pool and bcrypt warm-up
+    await run_in_threadpool(run_boot_sequence)
+    
+    # Write buffered audit entries off the request path
+    audit_log.start()
+    
+    # Join the cross-worker change event fan-out
+    await event_bus.start()
+    
+    # Route readers of recently changed clients to the primary while replicas catch up
+    event_bus.add_listener(replica_router.note_change)
+    app.state.replica_sync = asyncio.create_task(run_sqlite_replica_sync()) if replica_router.enabled else None
+    
+    # The database may have changed while no worker was running
+    await run_in_threadpool(response_cache.invalidate)
+    
+    # Drop cached document access sets and metadata when documents or assignments change
+    event_bus.add_listener(document_access_cache.on_event)
     
-    # Create uploads directory if it doesn't exist
-    os.makedirs("uploads", exist_ok=True)
+    # Let newly created accounts past every worker's unknown-email cache
+    event_bus.add_listener(login_admission.on_event)
     
-    print("HR Compliance Platform started successfully!")
+    # Start task reminder/escalation timers
+    if TASK_SCHEDULER_ENABLED:
+        await deadline_scheduler.start()
+    
+    # Keep recurring task occurrences materialized
+    app.state.recurring_tasks = asyncio.create_task(run_recurring_task_generator())
+    
+    # Move cold soft-deleted rows and closed inquiries to the archive tier
+    app.state.archiver = asyncio.create_task(run_archiver()) if ARCHIVE_ENABLED else None
+    
+    # Expire abandoned resumable uploads
+    app.state.upload_cleanup = asyncio.create_task(run_upload_cleanup())
+    
+    # Recompute storage totals from the source tables
+    app.state.storage_reconciler = asyncio.create_task(run_storage_reconciler())
+    
+    # Keep client scorecards in step with task, inquiry and assignment changes
+    event_bus.add_listener(scorecard_refresher.on_event)
+    app.state.scorecard_refresher = asyncio.create_task(scorecard_refresher.run())
+    
+    # Render queued compliance reports in a process pool
+    app.state.report_worker = asyncio.create_task(report_worker.run())
+    
+    # Email queued client notifications as digests
+    app.state.notifier = asyncio.create_task(notification_dispatcher.run()) if NOTIFICATIONS_ENABLED else None
+    
+    boot_state.mark_ready()
+    print(f"HR Compliance Platform started successfully in {boot_state.timings['total']} ms!")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release background resources on shutdown"""
+    app.state.recurring_tasks.cancel()
+    app.state.upload_cleanup.cancel()
+    app.state.storage_reconciler.cancel()
+    app.state.scorecard_refresher.cancel()
+    app.state.report_worker.cancel()
+    report_worker.stop()
+    if app.state.archiver is not None:
+        app.state.archiver.cancel()
+    if app.state.notifier is not None:
+        app.state.notifier.cancel()
+        notification_dispatcher.stop()
+    if app.state.replica_sync is not None:
+        app.state.replica_sync.cancel()
+    await deadline_scheduler.stop()
+    await run_in_threadpool(audit_log.stop)  # Drain buffered audit entries
+    event_bus.stop()
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database import Base
+
+class ArchivedRecord(Base):
+    """Cold copy of a soft-deleted or closed row moved out of its hot table"""
+    __tablename__ = "archived_records"
+
+    id = Column(Integer, primary_key=True, index=True)
+    entity = Column(String(50), nullable=False)  # task, inquiry, assignment, document, client
+    record_id = Column(Integer, nullable=False)  # Primary key in the source table
+    client_id = Column(Integer, nullable=True)  # Owning client, for per-client archive views
+    payload = Column(JSON, nullable=False)  # Column values as stored, restorable as-is
+    closed_at = Column(DateTime(timezone=True), nullable=True)  # When the row went inactive or was resolved
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("entity", "record_id", name="uq_archived_records_entity_record"),
+        Index("ix_archived_records_entity_client", "entity", "client_id", "archived_at"),
+    )
+
+    def __repr__(self):
+        return f"<ArchivedRecord(entity='{self.entity}', record_id={self.record_id})>"
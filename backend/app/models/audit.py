@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
+from app.database import Base
+
+class AuditLog(Base):
+    """Append-only record of who changed what; rows are never updated or deleted"""
+    __tablename__ = "audit_log"
+
+    id = Column(Integer, primary_key=True)
+    entity = Column(String(50), nullable=False)  # client, task, assignment, inquiry, document
+    entity_id = Column(Integer, nullable=True)
+    action = Column(String(50), nullable=False)  # created, updated, deleted, escalated, archived, restored, ...
+    user_id = Column(Integer, nullable=True)  # None for system jobs (scheduler, generators, archiver)
+    client_id = Column(Integer, nullable=True)
+    changes = Column(JSON, nullable=True)  # {field: [old, new]}
+    occurred_at = Column(DateTime(timezone=True), nullable=False)
+
+    # Keyset pagination (id descending) per entity and per user
+    __table_args__ = (
+        Index("ix_audit_log_entity", "entity", "entity_id", "id"),
+        Index("ix_audit_log_user", "user_id", "id"),
+    )
+
+    def __repr__(self):
+        return f"<AuditLog(entity='{self.entity}', entity_id={self.entity_id}, action='{self.action}')>"
@@ -17,6 +17,8 @@ class Client(Base):
     address = Column(Text, nullable=True)
     notes = Column(Text, nullable=True)  # Internal admin notes
     is_active = Column(Boolean, default=True)
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped on writes to tasks, assignments, inquiries
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Row version for optimistic concurrency
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -26,5 +28,8 @@ class Client(Base):
     tasks = relationship("Task", back_populates="client")
     inquiries = relationship("ClientInquiry", back_populates="client")
     
+    # ORM flushes update WHERE version = <loaded version> and increment it
+    __mapper_args__ = {"version_id_col": version}
+    
     def __repr__(self):
         return f"<Client(company_name='{self.company_name}', industry='{self.industry}')>"
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, ForeignKey, Boolean, JSON, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -20,9 +20,14 @@ class Document(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # Versioning: the file columns above always mirror the latest version
+    current_version = Column(Integer, nullable=False, default=1, server_default="1")
+    sha256 = Column(String(64), nullable=True, index=True)  # Content digest for deduplicated storage
+    
     # Relationships
     uploaded_by = relationship("User")
     assignments = relationship("DocumentAssignment", back_populates="document")
+    versions = relationship("DocumentVersion", back_populates="document", order_by="DocumentVersion.version_number")
     
     def __repr__(self):
         return f"<Document(filename='{self.original_filename}', type='{self.document_type}')>"
@@ -38,6 +43,7 @@ class DocumentAssignment(Base):
     assigned_at = Column(DateTime(timezone=True), server_default=func.now())
     notes = Column(Text, nullable=True)  # Assignment-specific notes
     is_active = Column(Boolean, default=True)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
     document = relationship("Document", back_populates="assignments")
@@ -45,4 +51,65 @@ class DocumentAssignment(Base):
     assigned_by = relationship("User")
     
     def __repr__(self):
-        return f"<DocumentAssignment(doc_id={self.document_id}, client_id={self.client_id})>"
\ No newline at end of file
+        return f"<DocumentAssignment(doc_id={self.document_id}, client_id={self.client_id})>"
+
+class DocumentVersion(Base):
+    """Immutable file revision of a document; files with the same digest are stored once"""
+    __tablename__ = "document_versions"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    document_id = Column(Integer, ForeignKey("documents.id"), nullable=False)
+    version_number = Column(Integer, nullable=False)
+    filename = Column(String(255), nullable=False)
+    original_filename = Column(String(255), nullable=False)
+    file_path = Column(String(500), nullable=False)  # May be shared with other versions/documents
+    file_size = Column(Integer, nullable=False)
+    mime_type = Column(String(100), nullable=False)
+    sha256 = Column(String(64), nullable=True, index=True)  # None for versions backfilled from legacy uploads
+    change_note = Column(Text, nullable=True)
+    uploaded_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    document = relationship("Document", back_populates="versions")
+    uploaded_by = relationship("User")
+    
+    __table_args__ = (
+        UniqueConstraint("document_id", "version_number", name="uq_document_versions_number"),
+    )
+    
+    def __repr__(self):
+        return f"<DocumentVersion(document_id={self.document_id}, version={self.version_number})>"
+
+class UploadSession(Base):
+    """Resumable (tus-style) upload in progress; chunks are written in place into a preallocated file"""
+    __tablename__ = "upload_sessions"
+    
+    id = Column(String(36), primary_key=True)  # Random UUID, also the upload URL token
+    original_filename = Column(String(255), nullable=False)
+    mime_type = Column(String(100), nullable=False)
+    upload_length = Column(BigInteger, nullable=False)
+    storage_path = Column(String(500), nullable=False)
+    received_ranges = Column(JSON, nullable=False, default=list)  # Sorted, merged [start, end) byte ranges
+    revision = Column(Integer, nullable=False, default=0)  # Optimistic lock for concurrent chunk bookkeeping
+    status = Column(String(20), nullable=False, default="active")  # active, completing, completed
+    
+    # What to create once every byte has arrived
+    document_id = Column(Integer, ForeignKey("documents.id"), nullable=True)  # Set for a new version
+    description = Column(Text, nullable=True)
+    document_type = Column(String(100), nullable=False, default="general")
+    change_note = Column(Text, nullable=True)
+    result_document_id = Column(Integer, nullable=True)
+    sha256 = Column(String(64), nullable=True)
+    
+    created_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    __table_args__ = (
+        Index("ix_upload_sessions_status_expires", "status", "expires_at"),
+    )
+    
+    def __repr__(self):
+        return f"<UploadSession(id='{self.id}', length={self.upload_length}, status='{self.status}')>"
\ No newline at end of file
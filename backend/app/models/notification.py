@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+class NotificationOutbox(Base):
+    """Client email notifications, written in the same transaction as the change they announce"""
+    __tablename__ = "notification_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    recipient_email = Column(String(255), nullable=False)
+    recipient_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    client_id = Column(Integer, ForeignKey("clients.id"), nullable=True)
+    kind = Column(String(50), nullable=False)  # inquiry_response, task_created, document_assigned
+    entity_id = Column(Integer, nullable=True)
+    subject = Column(String(255), nullable=False)  # One line; also the digest entry title
+    body = Column(Text, nullable=True)
+
+    # Delivery state
+    status = Column(String(20), nullable=False, default="pending", server_default="pending")  # pending, sent, failed
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False)  # End of the digest window, then backoff
+    claim_token = Column(String(36), nullable=True)
+    claimed_until = Column(DateTime(timezone=True), nullable=True)  # A delivery worker holds the row until then
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Delivery workers look for pending rows that are due
+        Index("ix_notification_outbox_status_due", "status", "next_attempt_at"),
+        Index("ix_notification_outbox_recipient", "recipient_email", "status"),
+        Index("ix_notification_outbox_claim", "claim_token"),
+    )
+
+    def __repr__(self):
+        return f"<NotificationOutbox(recipient='{self.recipient_email}', kind='{self.kind}', status='{self.status}')>"
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database import Base
+
+class ComplianceReport(Base):
+    """A per-client compliance report snapshot; queued rows are the generation queue"""
+    __tablename__ = "compliance_reports"
+
+    id = Column(Integer, primary_key=True, index=True)
+    client_id = Column(Integer, ForeignKey("clients.id"), nullable=False)
+    format = Column(String(10), nullable=False)  # html, pdf
+    data_version = Column(Integer, nullable=False)  # Client data_version when requested
+    client_version = Column(Integer, nullable=False)  # Client row version when requested
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, ready, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    file_path = Column(String(500), nullable=True)  # Storage key once ready
+    file_size = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+    requested_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # One report per client, format and data snapshot: the cache key
+        UniqueConstraint("client_id", "format", "data_version", "client_version", name="uq_compliance_reports_snapshot"),
+        # Dispatchers take the oldest queued reports first
+        Index("ix_compliance_reports_status_created", "status", "created_at"),
+    )
+
+    @property
+    def download_url(self):
+        return f"/api/reports/{self.id}/download" if self.status == "ready" else None
+
+    def __repr__(self):
+        return f"<ComplianceReport(client_id={self.client_id}, format='{self.format}', status='{self.status}')>"
@@ -0,0 +1,55 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+class ClientScorecard(Base):
+    """Precomputed compliance metrics per client, recomputed when the client's data_version moves"""
+    __tablename__ = "client_scorecards"
+
+    id = Column(Integer, primary_key=True, index=True)
+    client_id = Column(Integer, ForeignKey("clients.id"), nullable=False, unique=True)
+    data_version = Column(Integer, nullable=False)  # Client data_version the metrics were computed at
+    client_version = Column(Integer, nullable=False)  # Client row version (industry) they were computed at
+
+    # Active tasks
+    open_tasks = Column(Integer, nullable=False, default=0)
+    overdue_tasks = Column(Integer, nullable=False, default=0)
+    completed_tasks = Column(Integer, nullable=False, default=0)
+    total_tasks = Column(Integer, nullable=False, default=0)  # Excluding cancelled
+    completion_rate = Column(Float, nullable=True)  # None without tasks
+
+    # Inquiries not yet resolved
+    open_inquiries = Column(Integer, nullable=False, default=0)
+    open_high_inquiries = Column(Integer, nullable=False, default=0)  # High or urgent
+
+    # Required document types (per industry) the client has an active assignment for
+    required_documents = Column(Integer, nullable=False, default=0)
+    covered_documents = Column(Integer, nullable=False, default=0)
+    document_coverage = Column(Float, nullable=True)  # None when nothing is required
+
+    risk_score = Column(Float, nullable=False, default=0)
+    next_overdue_at = Column(DateTime(timezone=True), nullable=True)  # Overdue count goes stale then
+    computed_at = Column(DateTime(timezone=True), nullable=False)
+
+    client = relationship("Client")
+
+    __table_args__ = (
+        # One index per ranking sort key
+        Index("ix_client_scorecards_risk_score", "risk_score"),
+        Index("ix_client_scorecards_overdue_tasks", "overdue_tasks"),
+        Index("ix_client_scorecards_completion_rate", "completion_rate"),
+        Index("ix_client_scorecards_document_coverage", "document_coverage"),
+        Index("ix_client_scorecards_open_high_inquiries", "open_high_inquiries"),
+        Index("ix_client_scorecards_next_overdue_at", "next_overdue_at"),
+    )
+
+    @property
+    def company_name(self) -> str:
+        return self.client.company_name
+
+    @property
+    def industry(self) -> str:
+        return self.client.industry
+
+    def __repr__(self):
+        return f"<ClientScorecard(client_id={self.client_id}, risk_score={self.risk_score})>"
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime, BigInteger, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database import Base
+
+class StorageUsage(Base):
+    """Running storage totals per client, per uploader and overall, kept in step with document writes"""
+    __tablename__ = "storage_usage"
+
+    id = Column(Integer, primary_key=True, index=True)
+    scope = Column(String(20), nullable=False)  # client, uploader, total
+    owner_id = Column(Integer, nullable=False)  # Client or user id; 0 for total
+    bytes_used = Column(BigInteger, nullable=False, default=0)
+    file_count = Column(Integer, nullable=False, default=0)  # Assigned documents (client) or stored versions
+    reconciled_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("scope", "owner_id", name="uq_storage_usage_scope_owner"),
+    )
+
+    def __repr__(self):
+        return f"<StorageUsage(scope='{self.scope}', owner_id={self.owner_id}, bytes_used={self.bytes_used})>"
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Enum, Index, JSON, UniqueConstraint, case
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 import enum
 from app.database import Base
@@ -18,6 +18,23 @@ class TaskPriority(enum.Enum):
     HIGH = "high"
     URGENT = "urgent"
 
+# Work queue order: lower ranks are claimed first
+PRIORITY_RANKS = {
+    TaskPriority.URGENT.value: 0,
+    TaskPriority.HIGH.value: 1,
+    TaskPriority.MEDIUM.value: 2,
+    TaskPriority.LOW.value: 3,
+}
+
+def priority_rank_default(context) -> int:
+    """Insert default for priority_rank, so Core inserts that only set priority still rank correctly"""
+    priority = context.get_current_parameters().get("priority")
+    return PRIORITY_RANKS.get(getattr(priority, "value", priority), PRIORITY_RANKS["medium"])
+
+def enum_values(enum_class):
+    """Persist enum values (e.g. "pending"), which is what the API and filters use"""
+    return [member.value for member in enum_class]
+
 class Task(Base):
     """Compliance tasks and internal notes model"""
     __tablename__ = "tasks"
@@ -26,18 +43,24 @@ class Task(Base):
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     task_type = Column(String(100), nullable=False)  # compliance_audit, training, note, etc.
-    status = Column(Enum(TaskStatus), default=TaskStatus.PENDING)
-    priority = Column(Enum(TaskPriority), default=TaskPriority.MEDIUM)
+    status = Column(Enum(TaskStatus, values_callable=enum_values), default=TaskStatus.PENDING)
+    priority = Column(Enum(TaskPriority, values_callable=enum_values), default=TaskPriority.MEDIUM)
     due_date = Column(DateTime(timezone=True), nullable=True)
     completed_date = Column(DateTime(timezone=True), nullable=True)
     
+    # Deadline scheduler bookkeeping (reset when due_date changes)
+    reminder_sent_at = Column(DateTime(timezone=True), nullable=True)
+    escalated_at = Column(DateTime(timezone=True), nullable=True)
+    
     # Foreign keys
     client_id = Column(Integer, ForeignKey("clients.id"), nullable=False)
     created_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     assigned_to_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    template_id = Column(Integer, ForeignKey("recurring_task_templates.id"), nullable=True)  # Set for generated occurrences
     
     # Metadata
     is_active = Column(Boolean, default=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Row version for optimistic concurrency
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -46,6 +69,14 @@ class Task(Base):
     created_by = relationship("User", foreign_keys=[created_by_id], back_populates="created_tasks")
     assigned_to = relationship("User", foreign_keys=[assigned_to_id])
     
+    __table_args__ = (
+        # Range scans for open tasks by deadline (scheduler, overdue counts)
+        Index("ix_tasks_status_due_date", "status", "due_date"),
+        # One occurrence per template, client and due date keeps generation idempotent
+        UniqueConstraint("template_id", "client_id", "due_date", name="uq_tasks_template_occurrence"),
+    )
+    __mapper_args__ = {"version_id_col": version}
+    
     def __repr__(self):
         return f"<Task(title='{self.title}', status='{self.status.value}', client_id={self.client_id})>"
 
@@ -58,7 +89,16 @@ class ClientInquiry(Base):
     description = Column(Text, nullable=False)
     inquiry_type = Column(String(100), nullable=False)  # question, incident, complaint, etc.
     status = Column(String(50), default="open")  # open, in_review, resolved, closed
-    priority = Column(Enum(TaskPriority), default=TaskPriority.MEDIUM)
+    priority = Column(Enum(TaskPriority, values_callable=enum_values), default=TaskPriority.MEDIUM)
+    # Sortable mirror of priority for the work queue index; existing rows are backfilled on migration
+    priority_rank = Column(
+        Integer, nullable=False, default=priority_rank_default, server_default="2",
+        info={"backfill": case(
+            PRIORITY_RANKS,
+            value=priority,
+            else_=PRIORITY_RANKS["medium"]
+        )}
+    )
     
     # Foreign keys
     client_id = Column(Integer, ForeignKey("clients.id"), nullable=False)
@@ -70,7 +110,11 @@ class ClientInquiry(Base):
     resolution_notes = Column(Text, nullable=True)
     resolved_at = Column(DateTime(timezone=True), nullable=True)
     
+    # Work queue lease: held by assigned_to_id until it expires (then the inquiry is claimable again)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    
     # Metadata
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Row version for optimistic concurrency
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -79,5 +123,50 @@ class ClientInquiry(Base):
     submitted_by = relationship("User", foreign_keys=[submitted_by_id])
     assigned_to = relationship("User", foreign_keys=[assigned_to_id])
     
+    __table_args__ = (
+        # Claim-next walks open inquiries in queue order
+        Index("ix_client_inquiries_queue", "status", "priority_rank", "created_at"),
+    )
+    __mapper_args__ = {"version_id_col": version}
+    
+    @validates("priority")
+    def _sync_priority_rank(self, key, priority):
+        value = getattr(priority, "value", priority)
+        self.priority_rank = PRIORITY_RANKS.get(value, PRIORITY_RANKS["medium"])
+        return priority
+    
+    def __repr__(self):
+        return f"<ClientInquiry(subject='{self.subject}', status='{self.status}', client_id={self.client_id})>"
+
+class RecurringTaskTemplate(Base):
+    """Schedule for compliance tasks that repeat (annual training, quarterly audits, etc.)"""
+    __tablename__ = "recurring_task_templates"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    title = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+    task_type = Column(String(100), nullable=False)
+    priority = Column(Enum(TaskPriority, values_callable=enum_values), default=TaskPriority.MEDIUM)
+    
+    # Schedule: RRULE subset (FREQ, INTERVAL, COUNT, UNTIL, BYMONTH, BYMONTHDAY) anchored at starts_at
+    recurrence_rule = Column(String(255), nullable=False)
+    starts_at = Column(DateTime(timezone=True), nullable=False)
+    
+    # Targeting: explicit client list wins over industry; neither means all active clients
+    target_industry = Column(String(100), nullable=True)
+    target_client_ids = Column(JSON, nullable=True)
+    
+    # Generation bookkeeping
+    generated_until = Column(DateTime(timezone=True), nullable=True)
+    
+    # Metadata
+    created_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # Relationships
+    created_by = relationship("User")
+    
     def __repr__(self):
-        return f"<ClientInquiry(subject='{self.subject}', status='{self.status}', client_id={self.client_id})>"
\ No newline at end of file
+        return f"<RecurringTaskTemplate(title='{self.title}', rule='{self.recurrence_rule}')>"
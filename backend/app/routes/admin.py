@@ -1,18 +1,46 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
-from app.database import get_db
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, contains_eager, joinedload
+from app.database import get_db, get_read_db
 from app.models.user import User
 from app.models.client import Client
 from app.models.document import Document, DocumentAssignment
-from app.models.task import Task, ClientInquiry
+from app.models.task import Task, ClientInquiry, RecurringTaskTemplate
+from app.models.archive import ArchivedRecord
+from app.models.audit import AuditLog
+from app.models.storage import StorageUsage
+from app.models.scorecard import ClientScorecard
 from app.schemas.models import (
     ClientCreate, ClientUpdate, ClientResponse,
-    TaskCreate, TaskUpdate, TaskResponse,
+    TaskCreate, TaskUpdate, TaskResponse, TaskBulkUpdate, TaskBulkResult, TaskBulkOutcome,
+    TaskTemplateCreate, TaskTemplateResponse,
     DocumentAssignmentCreate, DocumentAssignmentResponse,
-    UserCreate, UserResponse
+    UserCreate, UserResponse,
+    ArchivedRecordResponse,
+    AuditLogPage,
+    StorageUsageResponse,
+    AdminInquiryResponse,
+    ClientScorecardResponse
 )
 from app.utils.auth import get_admin_user, get_password_hash
+from app.utils.events import event_bus
+from app.utils.response_cache import response_cache
+from app.utils.inquiry_queue import (
+    claim_next_inquiry, renew_inquiry_lease, release_inquiry, check_inquiry_lease, lease_available_to
+)
+from app.utils.versioning import (
+    VersionConflict, bump_client_version, if_match_versions, precondition_failed, row_etag, update_versioned
+)
+from app.utils.notifications import enqueue_notification
+from app.utils.task_updates import bulk_update_tasks, schedule_values, status_values
+from app.utils.archive import archive_cold_records, restore_record, POLICIES_BY_ENTITY, ARCHIVE_RETENTION_DAYS
+from app.utils.recurrence import parse_rrule, materialize_recurring_tasks, RECURRING_TASK_LOOKAHEAD_DAYS
+from app.utils.scorecards import SORT_COLUMNS, rebuild_scorecards, refresh_scorecards, scorecard_refresher
+from app.utils.storage_usage import (
+    QuotaExceeded, QUOTAS, charge_assignment, release_assignment, reconcile_storage_usage
+)
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -35,49 +63,57 @@ async def get_clients(
     skip: int = 0,
     limit: int = 100,
     industry: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_admin_user)
 ):
     """Get all clients with optional filtering"""
-    query = db.query(Client).filter(Client.is_active == True)
+    def load():
+        query = db.query(Client).filter(Client.is_active == True)
+        
+        if industry:
+            query = query.filter(Client.industry == industry)
+        
+        return query.offset(skip).limit(limit).all()
     
-    if industry:
-        query = query.filter(Client.industry == industry)
-    
-    clients = query.offset(skip).limit(limit).all()
-    return clients
+    params = {"skip": skip, "limit": limit, "industry": industry or None}
+    return response_cache.respond(db, "admin.clients", params, ClientResponse, load, models=(Client,))
 
 @router.get("/clients/{client_id}", response_model=ClientResponse)
 async def get_client(
     client_id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_admin_user)
 ):
-    """Get specific client by ID"""
+    """Get specific client by ID (the ETag is the If-Match value for updates)"""
     client = db.query(Client).filter(Client.id == client_id).first()
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
+    response.headers["ETag"] = row_etag(client.version)
     return client
 
 @router.put("/clients/{client_id}", response_model=ClientResponse)
 async def update_client(
     client_id: int,
     client_update: ClientUpdate,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_admin_user)
 ):
-    """Update client information"""
-    client = db.query(Client).filter(Client.id == client_id).first()
-    if not client:
-        raise HTTPException(status_code=404, detail="Client not found")
-    
+    """Update client information; with If-Match, only if nobody changed it since (412 otherwise)"""
     update_data = client_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(client, field, value)
+    try:
+        client = update_versioned(db, Client, client_id, update_data, if_match_versions(request))
+    except LookupError:
+        raise HTTPException(status_code=404, detail="Client not found")
+    except VersionConflict as e:
+        raise precondition_failed(e)
     
+    result = ClientResponse.model_validate(client)  # Before the commit expires the row
     db.commit()
-    db.refresh(client)
-    return client
+    response.headers["ETag"] = row_etag(result.version)
+    return result
 
 @router.delete("/clients/{client_id}")
 async def deactivate_client(
@@ -126,6 +162,7 @@ async def create_user(
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+    event_bus.publish("user", "created", db_user.id, db_user.client_id, email=db_user.email)
     return db_user
 
 @router.get("/users", response_model=List[UserResponse])
@@ -133,17 +170,20 @@ async def get_users(
     skip: int = 0,
     limit: int = 100,
     client_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_admin_user)
 ):
     """Get all users with optional client filtering"""
-    query = db.query(User).filter(User.is_active == True)
-    
-    if client_id:
-        query = query.filter(User.client_id == client_id)
+    def load():
+        query = db.query(User).filter(User.is_active == True)
+        
+        if client_id:
+            query = query.filter(User.client_id == client_id)
+        
+        return query.offset(skip).limit(limit).all()
     
-    users = query.offset(skip).limit(limit).all()
-    return users
+    params = {"skip": skip, "limit": limit, "client_id": client_id or None}
+    return response_cache.respond(db, "admin.users", params, UserResponse, load, models=(User,))
 
 # Document Assignment
 @router.post("/documents/assign", response_model=DocumentAssignmentResponse)
@@ -154,7 +194,10 @@ async def assign_document_to_client(
 ):
     """Assign a document to a client"""
     # Validate document exists
-    document = db.query(Document).filter(Document.id == assignment_data.document_id).first()
+    document = db.query(Document).filter(
+        Document.id == assignment_data.document_id,
+        Document.is_active == True
+    ).first()
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
     
@@ -182,8 +225,19 @@ async def assign_document_to_client(
     )
     
     db.add(db_assignment)
+    try:
+        charge_assignment(db, assignment_data.client_id, document.file_size)
+    except QuotaExceeded as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=str(e))
+    bump_client_version(db, [assignment_data.client_id])
+    enqueue_notification(db, "document_assigned", assignment_data.client_id,
+                         f"New document available: {document.original_filename}",
+                         assignment_data.notes, entity_id=document.id)
     db.commit()
     db.refresh(db_assignment)
+    event_bus.publish("assignment", "created", db_assignment.id, db_assignment.client_id,
+                      document_id=db_assignment.document_id)
     
     # Load related data
     db_assignment = db.query(DocumentAssignment).options(
@@ -198,21 +252,50 @@ async def get_document_assignments(
     document_id: Optional[int] = None,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_admin_user)
 ):
     """Get document assignments with optional filtering"""
-    query = db.query(DocumentAssignment).options(
-        joinedload(DocumentAssignment.document)
-    ).filter(DocumentAssignment.is_active == True)
+    def load():
+        query = db.query(DocumentAssignment).options(
+            joinedload(DocumentAssignment.document)
+        ).filter(DocumentAssignment.is_active == True)
+        
+        if client_id:
+            query = query.filter(DocumentAssignment.client_id == client_id)
+        if document_id:
+            query = query.filter(DocumentAssignment.document_id == document_id)
+        
+        return query.offset(skip).limit(limit).all()
     
-    if client_id:
-        query = query.filter(DocumentAssignment.client_id == client_id)
-    if document_id:
-        query = query.filter(DocumentAssignment.document_id == document_id)
+    params = {"skip": skip, "limit": limit, "client_id": client_id or None, "document_id": document_id or None}
+    # Each assignment embeds its document
+    return response_cache.respond(db, "admin.assignments", params, DocumentAssignmentResponse, load,
+                                  models=(DocumentAssignment, Document))
+
+@router.delete("/documents/assignments/{assignment_id}")
+async def remove_document_assignment(
+    assignment_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Unassign a document from a client"""
+    assignment = db.query(DocumentAssignment).filter(
+        DocumentAssignment.id == assignment_id,
+        DocumentAssignment.is_active == True
+    ).first()
+    if not assignment:
+        raise HTTPException(status_code=404, detail="Assignment not found")
     
-    assignments = query.offset(skip).limit(limit).all()
-    return assignments
+    assignment.is_active = False
+    if assignment.document.is_active:
+        release_assignment(db, assignment.client_id, assignment.document.file_size)
+    bump_client_version(db, [assignment.client_id])
+    db.commit()
+    event_bus.publish("assignment", "deleted", assignment.id, assignment.client_id,
+                      document_id=assignment.document_id)
+    
+    return {"message": "Assignment removed successfully"}
 
 # Task Management
 @router.post("/tasks", response_model=TaskResponse)
@@ -227,8 +310,15 @@ async def create_task(
         created_by_id=current_user.id
     )
     db.add(db_task)
+    bump_client_version(db, [db_task.client_id])
+    db.flush()
+    due = f"Due {db_task.due_date:%Y-%m-%d}. " if db_task.due_date else ""
+    enqueue_notification(db, "task_created", db_task.client_id, f"New compliance task: {db_task.title}",
+                         f"{due}{db_task.description or ''}".strip(), entity_id=db_task.id)
     db.commit()
     db.refresh(db_task)
+    event_bus.publish("task", "created", db_task.id, db_task.client_id,
+                      due_date=db_task.due_date, status=db_task.status.value)
     return db_task
 
 @router.get("/tasks", response_model=List[TaskResponse])
@@ -237,7 +327,7 @@ async def get_tasks(
     status: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_admin_user)
 ):
     """Get tasks with optional filtering"""
@@ -255,30 +345,137 @@ async def get_tasks(
 async def update_task(
     task_id: int,
     task_update: TaskUpdate,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_admin_user)
 ):
-    """Update task"""
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task:
+    """Update task; with If-Match, only if nobody changed it since (412 otherwise)"""
+    update_data = task_update.dict(exclude_unset=True)
+    update_data.update(status_values(update_data, datetime.utcnow()))
+    update_data.update(schedule_values(update_data))
+    
+    try:
+        task = update_versioned(db, Task, task_id, update_data, if_match_versions(request))
+    except LookupError:
         raise HTTPException(status_code=404, detail="Task not found")
+    except VersionConflict as e:
+        raise precondition_failed(e)
     
-    update_data = task_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(task, field, value)
+    bump_client_version(db, [task.client_id])
+    result = TaskResponse.model_validate(task)  # Before the commit expires the row
+    is_active = task.is_active
+    db.commit()
+    event_bus.publish("task", "updated", result.id, result.client_id,
+                      due_date=result.due_date, status=result.status.value, is_active=is_active)
+    response.headers["ETag"] = row_etag(result.version)
+    return result
+
+@router.post("/tasks/bulk", response_model=TaskBulkResult)
+async def bulk_update_tasks_route(
+    bulk: TaskBulkUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Change status, assignee, priority or due date of many tasks in one statement"""
+    try:
+        updated, unchanged, missing = bulk_update_tasks(
+            db,
+            bulk.changes.dict(exclude_unset=True),
+            task_ids=bulk.task_ids,
+            filters=bulk.filter.dict() if bulk.filter is not None else None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    results = [TaskResponse.model_validate(task) for task in updated]  # Before the commit expires the rows
+    db.commit()
+    for result in results:
+        event_bus.publish("task", "updated", result.id, result.client_id,
+                          due_date=result.due_date, status=result.status.value, is_active=True)
+    
+    outcomes = {result.id: TaskBulkOutcome(task_id=result.id, outcome="updated", version=result.version)
+                for result in results}
+    outcomes.update((task_id, TaskBulkOutcome(task_id=task_id, outcome="unchanged")) for task_id in unchanged)
+    outcomes.update((task_id, TaskBulkOutcome(task_id=task_id, outcome="not_found")) for task_id in missing)
+    order = list(dict.fromkeys(bulk.task_ids)) if bulk.task_ids is not None else sorted(outcomes)
+    return TaskBulkResult(updated=len(results), outcomes=[outcomes[task_id] for task_id in order])
+
+# Recurring Task Templates
+@router.post("/task-templates", response_model=TaskTemplateResponse)
+async def create_task_template(
+    template_data: TaskTemplateCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Create a recurring task template and generate its upcoming occurrences"""
+    try:
+        parse_rrule(template_data.recurrence_rule)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
+    db_template = RecurringTaskTemplate(
+        **template_data.dict(),
+        created_by_id=current_user.id
+    )
+    db.add(db_template)
     db.commit()
-    db.refresh(task)
-    return task
+    db.refresh(db_template)
+    
+    # One template can target thousands of clients; insert them off the event loop
+    await run_in_threadpool(materialize_recurring_tasks, db, template_ids=[db_template.id])
+    db.refresh(db_template)
+    return db_template
+
+@router.get("/task-templates", response_model=List[TaskTemplateResponse])
+async def get_task_templates(
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Get active recurring task templates"""
+    templates = db.query(RecurringTaskTemplate).filter(
+        RecurringTaskTemplate.is_active == True
+    ).offset(skip).limit(limit).all()
+    return templates
+
+@router.delete("/task-templates/{template_id}")
+async def deactivate_task_template(
+    template_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Stop generating occurrences for a template (already generated tasks are kept)"""
+    template = db.query(RecurringTaskTemplate).filter(RecurringTaskTemplate.id == template_id).first()
+    if not template:
+        raise HTTPException(status_code=404, detail="Template not found")
+    
+    template.is_active = False
+    db.commit()
+    return {"message": "Template deactivated successfully"}
+
+@router.post("/task-templates/generate")
+async def generate_recurring_tasks(
+    lookahead_days: int = RECURRING_TASK_LOOKAHEAD_DAYS,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Materialize upcoming occurrences for all active templates (idempotent)"""
+    if not 1 <= lookahead_days <= 366:
+        raise HTTPException(status_code=400, detail="lookahead_days must be between 1 and 366")
+    
+    created = await run_in_threadpool(materialize_recurring_tasks, db, lookahead_days=lookahead_days)
+    return {"created": created}
 
 # Client Inquiries Management
-@router.get("/inquiries", response_model=List)
+@router.get("/inquiries", response_model=List[AdminInquiryResponse])
 async def get_client_inquiries(
     client_id: Optional[int] = None,
     status: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_admin_user)
 ):
     """Get client inquiries with optional filtering"""
@@ -289,25 +486,272 @@ async def get_client_inquiries(
     if status:
         query = query.filter(ClientInquiry.status == status)
     
-    inquiries = query.offset(skip).limit(limit).all()
+    # Queue order: most urgent first, then oldest
+    inquiries = query.order_by(
+        ClientInquiry.priority_rank, ClientInquiry.created_at
+    ).offset(skip).limit(limit).all()
     return inquiries
 
-@router.put("/inquiries/{inquiry_id}/respond")
+@router.post("/inquiries/claim", response_model=AdminInquiryResponse)
+async def claim_next_open_inquiry(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Lease the most urgent, oldest open inquiry nobody else is working on (204 if none)"""
+    inquiry = claim_next_inquiry(db, current_user.id)
+    if inquiry is None:
+        return Response(status_code=204)
+    event_bus.publish("inquiry", "claimed", inquiry.id, inquiry.client_id, assigned_to_id=current_user.id)
+    return inquiry
+
+@router.post("/inquiries/{inquiry_id}/renew", response_model=AdminInquiryResponse)
+async def renew_inquiry_claim(
+    inquiry_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Extend the lease on an inquiry you claimed"""
+    try:
+        return renew_inquiry_lease(db, inquiry_id, current_user.id)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.post("/inquiries/{inquiry_id}/release", response_model=AdminInquiryResponse)
+async def release_inquiry_claim(
+    inquiry_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Put an inquiry you claimed back in the queue"""
+    try:
+        inquiry = release_inquiry(db, inquiry_id, current_user.id)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    event_bus.publish("inquiry", "released", inquiry.id, inquiry.client_id)
+    return inquiry
+
+@router.put("/inquiries/{inquiry_id}/respond", response_model=AdminInquiryResponse)
 async def respond_to_inquiry(
     inquiry_id: int,
     response_data: dict,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_admin_user)
 ):
-    """Respond to client inquiry"""
-    inquiry = db.query(ClientInquiry).filter(ClientInquiry.id == inquiry_id).first()
-    if not inquiry:
+    """Respond to client inquiry; with If-Match, only if nobody changed it since (412 otherwise)"""
+    values = {
+        "admin_response": response_data.get("response"),
+        "status": response_data.get("status", "in_review"),
+        "assigned_to_id": current_user.id,
+        "lease_expires_at": None,  # Responding ends the claim
+    }
+    try:
+        inquiry = update_versioned(db, ClientInquiry, inquiry_id, values, if_match_versions(request),
+                                   conditions=(lease_available_to(current_user.id, datetime.utcnow()),))
+    except LookupError:
         raise HTTPException(status_code=404, detail="Inquiry not found")
+    except VersionConflict as e:
+        try:
+            check_inquiry_lease(e.current, current_user.id)
+        except ValueError as lease_error:
+            raise HTTPException(status_code=409, detail=str(lease_error))
+        raise precondition_failed(e)
     
-    inquiry.admin_response = response_data.get("response")
-    inquiry.status = response_data.get("status", "in_review")
-    inquiry.assigned_to_id = current_user.id
-    
+    bump_client_version(db, [inquiry.client_id])
+    if inquiry.admin_response:
+        enqueue_notification(db, "inquiry_response", inquiry.client_id, f"Response to your inquiry: {inquiry.subject}",
+                             inquiry.admin_response, entity_id=inquiry.id, user_id=inquiry.submitted_by_id)
+    result = AdminInquiryResponse.model_validate(inquiry)  # Before the commit expires the row
     db.commit()
-    db.refresh(inquiry)
-    return inquiry
\ No newline at end of file
+    event_bus.publish("inquiry", "updated", result.id, result.client_id)
+    response.headers["ETag"] = row_etag(result.version)
+    return result
+
+# Archive
+@router.get("/archive", response_model=List[ArchivedRecordResponse])
+async def get_archived_records(
+    entity: Optional[str] = None,
+    client_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Browse archived records, newest first"""
+    query = db.query(ArchivedRecord)
+    
+    if entity:
+        query = query.filter(ArchivedRecord.entity == entity)
+    if client_id:
+        query = query.filter(ArchivedRecord.client_id == client_id)
+    
+    return query.order_by(ArchivedRecord.archived_at.desc(), ArchivedRecord.id.desc()).offset(skip).limit(limit).all()
+
+@router.get("/archive/{entity}/{record_id}", response_model=ArchivedRecordResponse)
+async def get_archived_record(
+    entity: str,
+    record_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Get one archived record by its original id"""
+    record = db.query(ArchivedRecord).filter(
+        ArchivedRecord.entity == entity,
+        ArchivedRecord.record_id == record_id
+    ).first()
+    if not record:
+        raise HTTPException(status_code=404, detail="Archived record not found")
+    return record
+
+@router.post("/archive/{entity}/{record_id}/restore")
+async def restore_archived_record(
+    entity: str,
+    record_id: int,
+    reactivate: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Move an archived record back into its table, optionally reactivating it"""
+    if entity not in POLICIES_BY_ENTITY:
+        raise HTTPException(status_code=400, detail=f"entity must be one of {', '.join(POLICIES_BY_ENTITY)}")
+    
+    try:
+        restore_record(db, entity, record_id, reactivate=reactivate)
+    except LookupError:
+        raise HTTPException(status_code=404, detail="Archived record not found")
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    return {"message": f"{entity.capitalize()} restored successfully", "entity": entity, "record_id": record_id}
+
+@router.post("/archive/run")
+async def run_archive(
+    retention_days: int = ARCHIVE_RETENTION_DAYS,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Archive soft-deleted rows and closed inquiries older than the retention window"""
+    if retention_days < 1:
+        raise HTTPException(status_code=400, detail="retention_days must be at least 1")
+    
+    # Batches pause between commits; keep that off the event loop
+    archived = await run_in_threadpool(archive_cold_records, db, retention_days=retention_days)
+    return {"archived": archived}
+
+# Audit Log
+@router.get("/audit", response_model=AuditLogPage)
+async def get_audit_log(
+    entity: Optional[str] = None,
+    entity_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    before_id: Optional[int] = None,
+    limit: int = 100,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Page through audit entries newest first, per entity and/or per user"""
+    if not 1 <= limit <= 500:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 500")
+    if entity_id is not None and entity is None:
+        raise HTTPException(status_code=400, detail="entity_id requires entity")
+    
+    # Keyset pagination on id keeps every page an index range scan
+    query = db.query(AuditLog)
+    if entity:
+        query = query.filter(AuditLog.entity == entity)
+    if entity_id is not None:
+        query = query.filter(AuditLog.entity_id == entity_id)
+    if user_id is not None:
+        query = query.filter(AuditLog.user_id == user_id)
+    if before_id is not None:
+        query = query.filter(AuditLog.id < before_id)
+    
+    items = query.order_by(AuditLog.id.desc()).limit(limit).all()
+    next_before_id = items[-1].id if len(items) == limit else None
+    return {"items": items, "next_before_id": next_before_id}
+
+# Storage Usage
+@router.get("/storage/usage", response_model=List[StorageUsageResponse])
+async def get_storage_usage(
+    scope: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Storage totals per client, per uploader and overall, largest first"""
+    if scope is not None and scope not in QUOTAS:
+        raise HTTPException(status_code=400, detail=f"scope must be one of {', '.join(QUOTAS)}")
+    
+    query = db.query(StorageUsage)
+    if scope:
+        query = query.filter(StorageUsage.scope == scope)
+    
+    rows = query.order_by(StorageUsage.bytes_used.desc(), StorageUsage.id).offset(skip).limit(limit).all()
+    return [
+        StorageUsageResponse.model_validate(row).model_copy(update={"quota_bytes": QUOTAS[row.scope] or None})
+        for row in rows
+    ]
+
+@router.post("/storage/reconcile")
+async def reconcile_storage(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Recompute storage totals from documents and assignments, reporting any drift"""
+    # Recounts every document and assignment; keep it off the event loop
+    return {"drifted": await run_in_threadpool(reconcile_storage_usage, db)}
+
+# Client Scorecards
+@router.get("/scorecards", response_model=List[ClientScorecardResponse])
+async def get_client_scorecards(
+    response: Response,
+    sort: str = "-risk_score",
+    industry: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 50,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """
+    Rank active clients by a scorecard metric; "-" sorts descending (default: most at risk first).
+    Served as stored; X-Scorecards-Refreshed-At tells when the background refresh last ran.
+    """
+    column = SORT_COLUMNS.get(sort.lstrip("-"))
+    if column is None:
+        raise HTTPException(status_code=400, detail=f"Sort by one of: {', '.join(SORT_COLUMNS)}")
+    
+    if scorecard_refresher.last_refreshed_at is not None:
+        response.headers["X-Scorecards-Refreshed-At"] = scorecard_refresher.last_refreshed_at.isoformat() + "Z"
+    
+    query = db.query(ClientScorecard).join(ClientScorecard.client).options(
+        contains_eager(ClientScorecard.client)
+    ).filter(Client.is_active == True)
+    if industry:
+        query = query.filter(Client.industry == industry)
+    
+    order = column.desc() if sort.startswith("-") else column.asc()
+    return query.order_by(order.nulls_last(), ClientScorecard.client_id).offset(skip).limit(min(limit, 500)).all()
+
+@router.post("/scorecards/refresh")
+async def refresh_client_scorecards(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Recompute the stale scorecards now instead of waiting for the background refresh"""
+    return {"refreshed": await run_in_threadpool(refresh_scorecards, db)}
+
+@router.post("/scorecards/rebuild")
+async def rebuild_client_scorecards(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Recompute every client's scorecard from the source tables"""
+    # Recomputes every active client batch by batch; keep it off the event loop
+    return {"rebuilt": await run_in_threadpool(rebuild_scorecards, db)}
@@ -1,34 +1,57 @@
 from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.user import User
 from app.schemas.models import LoginRequest, Token, UserCreate, UserResponse
 from app.utils.auth import (
-    authenticate_user, 
     create_access_token, 
     get_password_hash,
+    verify_password,
     ACCESS_TOKEN_EXPIRE_MINUTES,
     get_current_active_user
 )
+from app.utils.events import event_bus
+from app.utils.rate_limit import login_admission, too_many_requests
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 @router.post("/login", response_model=Token)
-async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(login_data: LoginRequest, request: Request, db: Session = Depends(get_db)):
     """Authenticate user and return JWT token"""
-    user = authenticate_user(db, login_data.email, login_data.password)
+    invalid_credentials = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Incorrect email or password",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    # Throttle by IP and account before any DB or bcrypt work
+    login_admission.admit(login_admission.client_ip(request), login_data.email)
+
+    if login_admission.is_known_unknown(login_data.email):
+        raise invalid_credentials
+
+    user = db.query(User).filter(User.email == login_data.email).first()
     if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect email or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        login_admission.remember_unknown(login_data.email)
+        raise invalid_credentials
+
+    # Cap concurrent bcrypt verifications and keep them off the event loop
+    if not login_admission.acquire_verification_slot():
+        raise too_many_requests(1, detail="Login service busy, please retry")
+    try:
+        password_ok = await run_in_threadpool(verify_password, login_data.password, user.hashed_password)
+    finally:
+        login_admission.release_verification_slot()
+
+    if not password_ok:
+        raise invalid_credentials
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data={"sub": user.email, "cid": user.client_id}, expires_delta=access_token_expires
     )
     
     return {"access_token": access_token, "token_type": "bearer"}
@@ -57,6 +80,7 @@ async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+    event_bus.publish("user", "created", db_user.id, db_user.client_id, email=db_user.email)
     
     return db_user
 
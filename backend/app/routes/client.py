@@ -1,10 +1,12 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session, joinedload
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.user import User
-from app.models.document import DocumentAssignment
+from app.models.document import Document, DocumentAssignment
 from app.models.task import Task, ClientInquiry
+from app.models.archive import ArchivedRecord
 from app.schemas.models import (
     DocumentAssignmentResponse,
     TaskResponse,
@@ -12,12 +14,25 @@ from app.schemas.models import (
     ClientInquiryResponse
 )
 from app.utils.auth import get_client_user
+from app.utils.bundle import BundleEntry, stream_zip, unique_names
+from app.utils.storage import get_storage
+from app.utils.events import event_bus
+from app.utils.versioning import (
+    bump_client_version,
+    get_client_version,
+    client_etag,
+    etag_matches,
+    not_modified,
+    set_etag
+)
 
 router = APIRouter(prefix="/client", tags=["client"])
 
 @router.get("/documents", response_model=List[DocumentAssignmentResponse])
 async def get_assigned_documents(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_client_user)
 ):
     """Get documents assigned to the current user's client"""
@@ -29,6 +44,11 @@ async def get_assigned_documents(
             detail="Admin users must specify client_id"
         )
     
+    etag = client_etag("documents", client_id, get_client_version(db, client_id))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
     assignments = db.query(DocumentAssignment).options(
         joinedload(DocumentAssignment.document)
     ).filter(
@@ -38,9 +58,56 @@ async def get_assigned_documents(
     
     return assignments
 
+@router.get("/documents/bundle")
+async def download_document_bundle(
+    document_ids: Optional[List[int]] = Query(None),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_client_user)
+):
+    """Download the client's assigned documents (all, or the given document_ids) as one streamed ZIP"""
+    client_id = current_user.client_id
+    if current_user.is_admin and client_id is None:
+        raise HTTPException(
+            status_code=400, 
+            detail="Admin users must specify client_id"
+        )
+    
+    # One query checks access to every requested document
+    query = db.query(
+        Document.id, Document.file_path, Document.original_filename, Document.file_size,
+        Document.updated_at, Document.created_at
+    ).join(DocumentAssignment, DocumentAssignment.document_id == Document.id).filter(
+        DocumentAssignment.client_id == client_id,
+        DocumentAssignment.is_active == True,
+        Document.is_active == True
+    )
+    if document_ids:
+        query = query.filter(Document.id.in_(set(document_ids)))
+    documents = {row.id: row for row in query.order_by(Document.id).all()}
+    
+    if document_ids and set(document_ids) - set(documents):
+        raise HTTPException(status_code=403, detail="Access denied")
+    if not documents:
+        raise HTTPException(status_code=404, detail="No documents to download")
+    
+    rows = list(documents.values())
+    entries = [
+        BundleEntry(row.file_path, name, row.file_size, row.updated_at or row.created_at)
+        for row, name in zip(rows, unique_names(row.original_filename for row in rows))
+    ]
+    db.close()  # Release the connection before streaming
+    
+    return StreamingResponse(
+        stream_zip(entries, get_storage().open),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="documents.zip"'}
+    )
+
 @router.get("/tasks", response_model=List[TaskResponse])
 async def get_client_tasks(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_client_user)
 ):
     """Get tasks for the current user's client"""
@@ -51,6 +118,11 @@ async def get_client_tasks(
             detail="Admin users must specify client_id"
         )
     
+    etag = client_etag("tasks", client_id, get_client_version(db, client_id))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
     tasks = db.query(Task).filter(
         Task.client_id == client_id,
         Task.is_active == True
@@ -79,13 +151,17 @@ async def submit_inquiry(
     )
     
     db.add(db_inquiry)
+    bump_client_version(db, [client_id])
     db.commit()
     db.refresh(db_inquiry)
+    event_bus.publish("inquiry", "created", db_inquiry.id, db_inquiry.client_id)
     return db_inquiry
 
 @router.get("/inquiries", response_model=List[ClientInquiryResponse])
 async def get_client_inquiries(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_client_user)
 ):
     """Get inquiries submitted by the current user's client"""
@@ -96,16 +172,43 @@ async def get_client_inquiries(
             detail="Admin users must specify client_id"
         )
     
+    etag = client_etag("inquiries", client_id, get_client_version(db, client_id))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
     inquiries = db.query(ClientInquiry).filter(
         ClientInquiry.client_id == client_id
     ).order_by(ClientInquiry.created_at.desc()).all()
     
     return inquiries
 
+@router.get("/inquiries/archived", response_model=List[ClientInquiryResponse])
+async def get_archived_inquiries(
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_client_user)
+):
+    """Get the current user's client's closed inquiries that were moved to the archive"""
+    client_id = current_user.client_id
+    if current_user.is_admin and client_id is None:
+        raise HTTPException(
+            status_code=400, 
+            detail="Admin users must specify client_id"
+        )
+    
+    records = db.query(ArchivedRecord).filter(
+        ArchivedRecord.entity == "inquiry",
+        ArchivedRecord.client_id == client_id
+    ).order_by(ArchivedRecord.archived_at.desc()).offset(skip).limit(limit).all()
+    
+    return [record.payload for record in records]
+
 @router.get("/inquiries/{inquiry_id}", response_model=ClientInquiryResponse)
 async def get_inquiry_detail(
     inquiry_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_client_user)
 ):
     """Get specific inquiry details"""
@@ -124,7 +227,9 @@ async def get_inquiry_detail(
 
 @router.get("/dashboard/summary")
 async def get_client_dashboard_summary(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_client_user)
 ):
     """Get dashboard summary for client"""
@@ -135,6 +240,12 @@ async def get_client_dashboard_summary(
             detail="Admin users must specify client_id"
         )
     
+    # Upcoming tasks depend on the current time as well as the data
+    etag = client_etag("summary", client_id, get_client_version(db, client_id), time_dependent=True)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
     # Count assigned documents
     document_count = db.query(DocumentAssignment).filter(
         DocumentAssignment.client_id == client_id,
@@ -157,6 +268,15 @@ async def get_client_dashboard_summary(
     # Get upcoming tasks (next 7 days)
     from datetime import datetime, timedelta
     next_week = datetime.utcnow() + timedelta(days=7)
+    
+    # Count overdue tasks
+    overdue_tasks = db.query(Task).filter(
+        Task.client_id == client_id,
+        Task.due_date < datetime.utcnow(),
+        Task.status.in_(["pending", "in_progress"]),
+        Task.is_active == True
+    ).count()
+
     upcoming_tasks = db.query(Task).filter(
         Task.client_id == client_id,
         Task.due_date <= next_week,
@@ -168,6 +288,7 @@ async def get_client_dashboard_summary(
     return {
         "document_count": document_count,
         "pending_tasks": pending_tasks,
+        "overdue_tasks": overdue_tasks,
         "open_inquiries": open_inquiries,
         "upcoming_tasks": [
             {
@@ -1,17 +1,40 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.user import User
-from app.models.document import Document
-from app.schemas.models import DocumentResponse, DocumentCreate
+from app.models.document import Document, DocumentAssignment, DocumentVersion
+from app.schemas.models import DocumentResponse, DocumentCreate, DocumentVersionResponse
 from app.utils.auth import get_current_active_user, get_admin_user
-from app.utils.file_handler import handle_file_upload, delete_file
-import os
+from app.utils.file_handler import handle_file_upload
+from app.utils.document_store import create_document, add_document_version, file_in_use
+from app.utils.storage import get_storage
+from app.utils.access_cache import CachedDocument, document_access_cache
+from app.utils.storage_usage import QuotaExceeded, check_upload_quota, release_document
+from app.utils.events import event_bus
+from app.utils.response_cache import response_cache
+from app.utils.versioning import bump_client_version
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
+def _ensure_document_access(db: Session, document_id: int, user: User) -> CachedDocument:
+    """Look up a document the user may read (admins, or clients it is assigned to)"""
+    document = document_access_cache.document(db, document_id)
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+    
+    if not document_access_cache.can_access(db, user, document_id):
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    return document
+
+def _check_upload_quota(db: Session, uploader_id: int, file: UploadFile):
+    """Refuse an over-quota upload before it is written to storage (the body is already spooled)"""
+    try:
+        check_upload_quota(db, uploader_id, file.size or 0)
+    except QuotaExceeded as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
 @router.post("/upload", response_model=DocumentResponse)
 async def upload_document(
     file: UploadFile = File(...),
@@ -21,28 +44,30 @@ async def upload_document(
     current_user: User = Depends(get_admin_user)
 ):
     """Upload a new document (admin only)"""
+    _check_upload_quota(db, current_user.id, file)
+    
     try:
         # Handle file upload
-        unique_filename, file_path, file_size = await handle_file_upload(file)
+        unique_filename, file_path, file_size, sha256 = await handle_file_upload(file)
         
-        # Create document record
-        db_document = Document(
+        # Create document record (identical content already on disk is reused)
+        return create_document(
+            db,
+            uploaded_by_id=current_user.id,
             filename=unique_filename,
             original_filename=file.filename or "unknown",
             file_path=file_path,
             file_size=file_size,
             mime_type=file.content_type or "application/octet-stream",
+            sha256=sha256,
             description=description,
-            document_type=document_type,
-            uploaded_by_id=current_user.id
+            document_type=document_type
         )
         
-        db.add(db_document)
-        db.commit()
-        db.refresh(db_document)
-        
-        return db_document
-        
+    except QuotaExceeded as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -51,77 +76,44 @@ async def get_documents(
     document_type: str = None,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_admin_user)
 ):
     """Get all documents with optional filtering (admin only)"""
-    query = db.query(Document).filter(Document.is_active == True)
-    
-    if document_type:
-        query = query.filter(Document.document_type == document_type)
+    def load():
+        query = db.query(Document).filter(Document.is_active == True)
+        
+        if document_type:
+            query = query.filter(Document.document_type == document_type)
+        
+        return query.offset(skip).limit(limit).all()
     
-    documents = query.offset(skip).limit(limit).all()
-    return documents
+    params = {"skip": skip, "limit": limit, "document_type": document_type or None}
+    return response_cache.respond(db, "documents", params, DocumentResponse, load, models=(Document,))
 
 @router.get("/{document_id}", response_model=DocumentResponse)
 async def get_document(
     document_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get specific document details"""
-    document = db.query(Document).filter(Document.id == document_id).first()
-    if not document:
-        raise HTTPException(status_code=404, detail="Document not found")
-    
-    # Check access permissions
-    if not current_user.is_admin:
-        # For client users, check if document is assigned to their client
-        from app.models.document import DocumentAssignment
-        assignment = db.query(DocumentAssignment).filter(
-            DocumentAssignment.document_id == document_id,
-            DocumentAssignment.client_id == current_user.client_id,
-            DocumentAssignment.is_active == True
-        ).first()
-        
-        if not assignment:
-            raise HTTPException(status_code=403, detail="Access denied")
-    
-    return document
+    return _ensure_document_access(db, document_id, current_user).response
 
 @router.get("/{document_id}/download")
 async def download_document(
     document_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Download document file"""
-    document = db.query(Document).filter(Document.id == document_id).first()
-    if not document:
-        raise HTTPException(status_code=404, detail="Document not found")
+    document = _ensure_document_access(db, document_id, current_user)
     
-    # Check access permissions
-    if not current_user.is_admin:
-        # For client users, check if document is assigned to their client
-        from app.models.document import DocumentAssignment
-        assignment = db.query(DocumentAssignment).filter(
-            DocumentAssignment.document_id == document_id,
-            DocumentAssignment.client_id == current_user.client_id,
-            DocumentAssignment.is_active == True
-        ).first()
-        
-        if not assignment:
-            raise HTTPException(status_code=403, detail="Access denied")
-    
-    # Check if file exists
-    if not os.path.exists(document.file_path):
+    # Stream the file, or redirect to the storage backend
+    try:
+        return get_storage().download_response(document.file_path, document.original_filename, document.mime_type)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="File not found")
-    
-    return FileResponse(
-        path=document.file_path,
-        filename=document.original_filename,
-        media_type=document.mime_type
-    )
 
 @router.delete("/{document_id}")
 async def delete_document(
@@ -135,6 +127,7 @@ async def delete_document(
         raise HTTPException(status_code=404, detail="Document not found")
     
     # Deactivate document record
+    was_active = document.is_active
     document.is_active = False
     
     # Deactivate all assignments
@@ -143,19 +136,102 @@ async def delete_document(
         DocumentAssignment.document_id == document_id
     ).all()
     
+    deactivated = []
     for assignment in assignments:
+        if assignment.is_active:
+            deactivated.append((assignment.id, assignment.client_id))
         assignment.is_active = False
     
+    if was_active:
+        release_document(db, document, [client_id for _, client_id in deactivated])
+    bump_client_version(db, [client_id for _, client_id in deactivated])
     db.commit()
     
-    # Optionally delete physical file
-    delete_file(document.file_path)
+    event_bus.publish("document", "deleted", document_id)
+    for assignment_id, client_id in deactivated:
+        event_bus.publish("assignment", "deleted", assignment_id, client_id, document_id=document_id)
+    
+    # Delete physical files no other document still shares
+    file_paths = {document.file_path} | {version.file_path for version in document.versions}
+    for file_path in file_paths:
+        if not file_in_use(db, file_path, document_id):
+            get_storage().delete(file_path)
     
     return {"message": "Document deleted successfully"}
 
+@router.post("/{document_id}/versions", response_model=DocumentResponse)
+async def upload_document_version(
+    document_id: int,
+    file: UploadFile = File(...),
+    change_note: str = "",
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Replace a document's file with a new version; existing assignments follow it (admin only)"""
+    document = db.query(Document).filter(Document.id == document_id, Document.is_active == True).first()
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+    _check_upload_quota(db, current_user.id, file)
+    
+    unique_filename, file_path, file_size, sha256 = await handle_file_upload(file)
+    try:
+        return add_document_version(
+            db, document,
+            uploaded_by_id=current_user.id,
+            filename=unique_filename,
+            original_filename=file.filename,
+            file_path=file_path,
+            file_size=file_size,
+            mime_type=file.content_type or "application/octet-stream",
+            sha256=sha256,
+            change_note=change_note
+        )
+    except QuotaExceeded as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.get("/{document_id}/versions", response_model=List[DocumentVersionResponse])
+async def get_document_versions(
+    document_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """List a document's versions, newest first"""
+    _ensure_document_access(db, document_id, current_user)
+    
+    versions = db.query(DocumentVersion).filter(
+        DocumentVersion.document_id == document_id
+    ).order_by(DocumentVersion.version_number.desc()).all()
+    return versions
+
+@router.get("/{document_id}/versions/{version_number}/download")
+async def download_document_version(
+    document_id: int,
+    version_number: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Download a specific (possibly older) version of a document"""
+    document = _ensure_document_access(db, document_id, current_user)
+    
+    version = db.query(DocumentVersion).filter(
+        DocumentVersion.document_id == document_id,
+        DocumentVersion.version_number == version_number
+    ).first()
+    if not version and version_number == document.current_version:
+        version = document  # Legacy document without version rows
+    if not version:
+        raise HTTPException(status_code=404, detail="Version not found")
+    
+    try:
+        return get_storage().download_response(version.file_path, version.original_filename, version.mime_type)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+
 @router.get("/types/list")
 async def get_document_types(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get list of available document types"""
@@ -0,0 +1,51 @@
+import asyncio
+import json
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from app.database import SessionLocal
+from app.utils.auth import get_user_from_token
+from app.utils.events import (
+    event_bus,
+    client_channel,
+    ADMIN_CHANNEL,
+    EVENTS_KEEPALIVE_SECONDS
+)
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+@router.get("/stream")
+async def stream_events(request: Request, token: str = Query(...)):
+    """Server-Sent Events stream of change notifications for the current user"""
+    # EventSource cannot send headers, so the JWT comes in the query string.
+    # The session is closed before streaming so no connection is held open.
+    with SessionLocal() as db:
+        user = get_user_from_token(db, token)
+        if user is None or not user.is_active:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
+        if user.is_admin:
+            channels = [ADMIN_CHANNEL]
+        elif user.client_id is not None:
+            channels = [client_channel(user.client_id)]
+        else:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Client access required")
+
+    queue = event_bus.subscribe(channels)
+
+    async def event_stream():
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=EVENTS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: change\ndata: {json.dumps(event, default=str)}\n\n"
+        finally:
+            event_bus.unsubscribe(queue, channels)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
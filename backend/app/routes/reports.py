@@ -0,0 +1,77 @@
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.models.user import User
+from app.models.client import Client
+from app.models.report import ComplianceReport
+from app.schemas.models import ReportRequest, ReportResponse
+from app.utils.auth import get_current_active_user
+from app.utils.reports import PENDING_STATUSES, READY, REPORT_POLL_SECONDS, media_type, request_report
+from app.utils.storage import get_storage
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+def _get_report(db: Session, report_id: int, user: User) -> ComplianceReport:
+    """A report the user may see: admins see all, client users their own client's"""
+    report = db.query(ComplianceReport).filter(ComplianceReport.id == report_id).first()
+    if not report:
+        raise HTTPException(status_code=404, detail="Report not found")
+    if not user.is_admin and report.client_id != user.client_id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    return report
+
+def _with_poll_hint(report: ComplianceReport, response: Response) -> ComplianceReport:
+    if report.status in PENDING_STATUSES:
+        response.status_code = 202
+        response.headers["Retry-After"] = str(max(1, int(REPORT_POLL_SECONDS)))
+    return report
+
+@router.post("", response_model=ReportResponse)
+async def create_report(
+    report_request: ReportRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Queue a compliance report of a client's current data (202), or return the cached one (200)"""
+    client_id = report_request.client_id
+    if not current_user.is_admin:
+        if current_user.client_id is None or client_id not in (None, current_user.client_id):
+            raise HTTPException(status_code=403, detail="Access denied")
+        client_id = current_user.client_id
+    elif client_id is None:
+        raise HTTPException(status_code=400, detail="Admin users must specify client_id")
+    
+    try:
+        report = request_report(db, client_id, report_request.format.value, current_user.id)
+    except LookupError:
+        raise HTTPException(status_code=404, detail="Client not found")
+    return _with_poll_hint(report, response)
+
+@router.get("/{report_id}", response_model=ReportResponse)
+async def get_report(
+    report_id: int,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Poll a report's status (202 while queued or running; a "report" event is also published when it finishes)"""
+    return _with_poll_hint(_get_report(db, report_id, current_user), response)
+
+@router.get("/{report_id}/download")
+async def download_report(
+    report_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Download a finished report"""
+    report = _get_report(db, report_id, current_user)
+    if report.status != READY:
+        raise HTTPException(status_code=409, detail=f"Report is {report.status}")
+    
+    company_name = db.query(Client.company_name).filter(Client.id == report.client_id).scalar() or "client"
+    filename = f"{company_name} compliance report {report.completed_at:%Y-%m-%d}.{report.format}"
+    try:
+        return get_storage().download_response(report.file_path, filename, media_type(report.format))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
@@ -0,0 +1,215 @@
+import base64
+import binascii
+import os
+from typing import Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.models.user import User
+from app.models.document import Document, UploadSession
+from app.utils.auth import get_admin_user
+from app.utils.file_handler import ALLOWED_EXTENSIONS
+from app.utils.storage_usage import QuotaExceeded, check_upload_quota
+from app.utils.resumable import (
+    RESUMABLE_MAX_FILE_SIZE, complete_upload, contiguous_offset, create_upload_session,
+    format_ranges, record_received_range, terminate_upload, write_chunk
+)
+from datetime import datetime, timezone
+
+router = APIRouter(prefix="/documents/uploads", tags=["uploads"])
+
+TUS_VERSION = "1.0.0"
+TUS_EXTENSIONS = "creation,expiration,termination"
+
+def _parse_metadata(header: Optional[str]) -> Dict[str, str]:
+    """Decode a tus Upload-Metadata header ("key base64value,key2 base64value2")"""
+    metadata = {}
+    for pair in (header or "").split(","):
+        parts = pair.strip().split(" ", 1)
+        if not parts[0]:
+            continue
+        try:
+            metadata[parts[0]] = base64.b64decode(parts[1]).decode() if len(parts) == 2 else ""
+        except (binascii.Error, UnicodeDecodeError):
+            raise HTTPException(status_code=400, detail=f"Invalid Upload-Metadata value for '{parts[0]}'")
+    return metadata
+
+def _http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S GMT")
+
+def _status_headers(upload: UploadSession, ranges=None) -> Dict[str, str]:
+    ranges = upload.received_ranges if ranges is None else ranges
+    headers = {
+        "Tus-Resumable": TUS_VERSION,
+        "Upload-Offset": str(contiguous_offset(ranges or [])),
+        "Upload-Length": str(upload.upload_length),
+        "Upload-Ranges": format_ranges(ranges or []),
+        "Upload-Expires": _http_date(upload.expires_at),
+        "Cache-Control": "no-store",
+    }
+    if upload.result_document_id is not None:
+        headers["Upload-Document-Id"] = str(upload.result_document_id)
+    return headers
+
+def _get_upload(db: Session, upload_id: str) -> UploadSession:
+    upload = db.query(UploadSession).filter(UploadSession.id == upload_id).first()
+    if not upload:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    expires_at = upload.expires_at if upload.expires_at.tzinfo else upload.expires_at.replace(tzinfo=timezone.utc)
+    if upload.status == "active" and expires_at < datetime.now(timezone.utc):
+        raise HTTPException(status_code=410, detail="Upload expired")
+    return upload
+
+@router.options("/")
+async def upload_options():
+    """Advertise the supported tus protocol version, extensions and size limit"""
+    return Response(status_code=204, headers={
+        "Tus-Resumable": TUS_VERSION,
+        "Tus-Version": TUS_VERSION,
+        "Tus-Extension": TUS_EXTENSIONS,
+        "Tus-Max-Size": str(RESUMABLE_MAX_FILE_SIZE),
+    })
+
+@router.post("/", status_code=201)
+async def create_upload(
+    request: Request,
+    filename: Optional[str] = None,
+    description: Optional[str] = None,
+    document_type: Optional[str] = None,
+    document_id: Optional[int] = None,
+    change_note: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Start a resumable upload of a new document, or of a new version when document_id is given (admin only)"""
+    try:
+        upload_length = int(request.headers.get("Upload-Length", ""))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Upload-Length header is required")
+    if upload_length <= 0:
+        raise HTTPException(status_code=400, detail="Upload-Length must be positive")
+    if upload_length > RESUMABLE_MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large. Maximum size: {RESUMABLE_MAX_FILE_SIZE // (1024*1024)}MB"
+        )
+
+    try:
+        check_upload_quota(db, current_user.id, upload_length)
+    except QuotaExceeded as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    # Query parameters win over tus metadata
+    metadata = _parse_metadata(request.headers.get("Upload-Metadata"))
+    filename = filename or metadata.get("filename")
+    if not filename:
+        raise HTTPException(status_code=400, detail="A filename is required")
+    file_extension = os.path.splitext(filename)[1].lower()
+    if file_extension not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
+        )
+
+    if document_id is None and metadata.get("document_id"):
+        try:
+            document_id = int(metadata["document_id"])
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid document_id")
+    if document_id is not None:
+        document = db.query(Document.id).filter(Document.id == document_id, Document.is_active == True).first()
+        if not document:
+            raise HTTPException(status_code=404, detail="Document not found")
+
+    upload = create_upload_session(
+        db,
+        created_by_id=current_user.id,
+        original_filename=filename,
+        mime_type=metadata.get("filetype") or metadata.get("mime_type") or "application/octet-stream",
+        upload_length=upload_length,
+        description=description or metadata.get("description"),
+        document_type=document_type or metadata.get("document_type") or "general",
+        document_id=document_id,
+        change_note=change_note or metadata.get("change_note")
+    )
+
+    headers = _status_headers(upload)
+    headers["Location"] = str(request.url_for("get_upload_status", upload_id=upload.id))
+    return Response(status_code=201, headers=headers)
+
+@router.head("/{upload_id}", name="get_upload_status")
+async def get_upload_status(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Report how much of an upload has arrived, so clients can resume (admin only)"""
+    upload = _get_upload(db, upload_id)
+    return Response(status_code=200, headers=_status_headers(upload))
+
+@router.patch("/{upload_id}")
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """
+    Write one chunk at Upload-Offset (admin only).
+
+    Unlike plain tus, chunks may target any offset, so a client can send
+    several in parallel; HEAD reports the received ranges. The document is
+    created when the last missing byte arrives.
+    """
+    if request.headers.get("Content-Type") != "application/offset+octet-stream":
+        raise HTTPException(status_code=415, detail="Content-Type must be application/offset+octet-stream")
+    try:
+        offset = int(request.headers.get("Upload-Offset", ""))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Upload-Offset header is required")
+
+    upload = _get_upload(db, upload_id)
+    if upload.status != "active":
+        raise HTTPException(status_code=409, detail="Upload already completed")
+    if offset < 0 or offset >= upload.upload_length:
+        raise HTTPException(status_code=400, detail="Upload-Offset outside the upload")
+    upload_length = upload.upload_length
+    content_length = request.headers.get("Content-Length")
+    if content_length and content_length.isdigit() and offset + int(content_length) > upload_length:
+        raise HTTPException(status_code=400, detail="Chunk exceeds Upload-Length")
+    storage_path = upload.storage_path
+    db.commit()  # Don't hold a pooled connection while the body streams in
+
+    try:
+        written = await write_chunk(upload_id, storage_path, offset, upload_length, request.stream())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    ranges = record_received_range(db, upload_id, offset, offset + written)
+    if contiguous_offset(ranges) == upload_length:
+        try:
+            complete_upload(db, upload_id)
+        except QuotaExceeded as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+
+    upload = db.query(UploadSession).filter(UploadSession.id == upload_id).first()
+    return Response(status_code=204, headers=_status_headers(upload, ranges))
+
+@router.delete("/{upload_id}", status_code=204)
+async def cancel_upload(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Abandon an upload and discard its data (admin only)"""
+    upload = db.query(UploadSession).filter(UploadSession.id == upload_id).first()
+    if not upload:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    if upload.status == "completing":
+        raise HTTPException(status_code=409, detail="Upload is being completed")
+    terminate_upload(db, upload)
+    return Response(status_code=204, headers={"Tus-Resumable": TUS_VERSION})
@@ -62,6 +62,7 @@ class ClientUpdate(BaseModel):
 class ClientResponse(ClientBase):
     id: int
     is_active: bool
+    version: int = 1
     created_at: datetime
     updated_at: Optional[datetime] = None
     
@@ -88,11 +89,27 @@ class DocumentResponse(DocumentBase):
     mime_type: str
     uploaded_by_id: int
     is_active: bool
+    current_version: int = 1
     created_at: datetime
     
     class Config:
         from_attributes = True
 
+class DocumentVersionResponse(BaseModel):
+    id: int
+    document_id: int
+    version_number: int
+    original_filename: str
+    file_size: int
+    mime_type: str
+    sha256: Optional[str] = None
+    change_note: Optional[str] = None
+    uploaded_by_id: int
+    created_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
 # Document assignment schemas
 class DocumentAssignmentCreate(BaseModel):
     document_id: int
@@ -138,6 +155,59 @@ class TaskResponse(TaskBase):
     created_by_id: int
     assigned_to_id: Optional[int] = None
     completed_date: Optional[datetime] = None
+    version: int = 1
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+# Bulk task update schemas
+class TaskBulkFilter(BaseModel):
+    client_id: Optional[int] = None
+    status: Optional[TaskStatusEnum] = None
+    due_from: Optional[datetime] = None
+    due_to: Optional[datetime] = None  # Exclusive
+
+class TaskBulkChanges(BaseModel):
+    status: Optional[TaskStatusEnum] = None
+    priority: Optional[TaskPriorityEnum] = None
+    assigned_to_id: Optional[int] = None
+    due_date: Optional[datetime] = None
+
+class TaskBulkUpdate(BaseModel):
+    task_ids: Optional[List[int]] = None
+    filter: Optional[TaskBulkFilter] = None
+    changes: TaskBulkChanges
+
+class TaskBulkOutcome(BaseModel):
+    task_id: int
+    outcome: str  # updated, unchanged, not_found
+    version: Optional[int] = None
+
+class TaskBulkResult(BaseModel):
+    updated: int
+    outcomes: List[TaskBulkOutcome]
+
+# Recurring task template schemas
+class TaskTemplateBase(BaseModel):
+    title: str
+    description: Optional[str] = None
+    task_type: str
+    priority: TaskPriorityEnum = TaskPriorityEnum.MEDIUM
+    recurrence_rule: str
+    starts_at: datetime
+    target_industry: Optional[str] = None
+    target_client_ids: Optional[List[int]] = None
+
+class TaskTemplateCreate(TaskTemplateBase):
+    pass
+
+class TaskTemplateResponse(TaskTemplateBase):
+    id: int
+    created_by_id: int
+    generated_until: Optional[datetime] = None
+    is_active: bool
     created_at: datetime
     updated_at: Optional[datetime] = None
     
@@ -163,12 +233,107 @@ class ClientInquiryResponse(ClientInquiryBase):
     admin_response: Optional[str] = None
     resolution_notes: Optional[str] = None
     resolved_at: Optional[datetime] = None
+    version: int = 1
     created_at: datetime
     updated_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
 
+class AdminInquiryResponse(ClientInquiryResponse):
+    """An inquiry with its work queue lease, for admins"""
+    lease_expires_at: Optional[datetime] = None
+
+# Archive schemas
+class ArchivedRecordResponse(BaseModel):
+    id: int
+    entity: str
+    record_id: int
+    client_id: Optional[int] = None
+    payload: dict
+    closed_at: Optional[datetime] = None
+    archived_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+# Audit schemas
+class AuditLogResponse(BaseModel):
+    id: int
+    entity: str
+    entity_id: Optional[int] = None
+    action: str
+    user_id: Optional[int] = None
+    client_id: Optional[int] = None
+    changes: Optional[dict] = None
+    occurred_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class AuditLogPage(BaseModel):
+    items: List[AuditLogResponse]
+    next_before_id: Optional[int] = None  # Pass as before_id for the next (older) page
+
+# Storage schemas
+class StorageUsageResponse(BaseModel):
+    scope: str
+    owner_id: int
+    bytes_used: int
+    file_count: int
+    quota_bytes: Optional[int] = None
+    reconciled_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+# Scorecard schemas
+class ClientScorecardResponse(BaseModel):
+    client_id: int
+    company_name: str
+    industry: str
+    risk_score: float
+    open_tasks: int
+    overdue_tasks: int
+    completed_tasks: int
+    total_tasks: int
+    completion_rate: Optional[float] = None
+    open_inquiries: int
+    open_high_inquiries: int
+    required_documents: int
+    covered_documents: int
+    document_coverage: Optional[float] = None
+    next_overdue_at: Optional[datetime] = None
+    computed_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+# Compliance report schemas
+class ReportFormatEnum(str, Enum):
+    HTML = "html"
+    PDF = "pdf"
+
+class ReportRequest(BaseModel):
+    client_id: Optional[int] = None  # Client users always get their own
+    format: ReportFormatEnum = ReportFormatEnum.HTML
+
+class ReportResponse(BaseModel):
+    id: int
+    client_id: int
+    format: str
+    status: str  # queued, running, ready, failed
+    data_version: int
+    file_size: Optional[int] = None
+    error: Optional[str] = None
+    download_url: Optional[str] = None
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
 # Authentication schemas
 class Token(BaseModel):
     access_token: str
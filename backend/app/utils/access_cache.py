@@ -0,0 +1,194 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, FrozenSet, Hashable, NamedTuple, Optional
+from sqlalchemy.orm import Session
+from app.database import REPLICA_MAX_LAG_SECONDS
+from app.models.document import Document, DocumentAssignment
+from app.models.user import User
+from app.schemas.models import DocumentResponse
+
+# Document access cache configuration
+DOCUMENT_ACCESS_CACHE_CLIENTS = int(os.getenv("DOCUMENT_ACCESS_CACHE_CLIENTS", "1024"))
+DOCUMENT_METADATA_CACHE_SIZE = int(os.getenv("DOCUMENT_METADATA_CACHE_SIZE", "4096"))
+# Safety net for invalidations lost between workers (peer events are best effort)
+DOCUMENT_CACHE_TTL_SECONDS = float(os.getenv("DOCUMENT_CACHE_TTL_SECONDS", "300"))
+
+# How long an invalidation is remembered to fence off loads that started before it
+INVALIDATION_MEMORY_SECONDS = max(60.0, 2 * REPLICA_MAX_LAG_SECONDS)
+
+_MISSING = object()
+
+class LRUCache:
+    """
+    Thread-safe LRU map with a TTL and hit/miss counters.
+
+    Loads are fenced against invalidations: a value whose load started
+    before the latest invalidation of its key (or within `settle` seconds
+    after it, for reads from a lagging replica) is returned to the caller
+    but not stored, so a racing request can't put stale data back.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._invalidated: Dict[Hashable, float] = {}
+        self._cleared_at = 0.0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable):
+        """Cached value, or _MISSING"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] < now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value, loaded_at: float, settle: float = 0.0) -> bool:
+        """Store a value loaded at loaded_at unless the key was invalidated since"""
+        with self._lock:
+            fence = max(self._cleared_at, self._invalidated.get(key, 0.0))
+            if fence and fence + settle >= loaded_at:
+                return False
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], object], settle: float = 0.0):
+        """Cached value, or loader()'s result (stored unless it is None)"""
+        value = self.get(key)
+        if value is not _MISSING:
+            return value
+        loaded_at = time.monotonic()
+        value = loader()
+        if value is not None:
+            self.put(key, value, loaded_at, settle)
+        return value
+
+    def invalidate(self, key: Hashable):
+        now = time.monotonic()
+        with self._lock:
+            self._entries.pop(key, None)
+            self._invalidated[key] = now
+            self.invalidations += 1
+            if len(self._invalidated) > self.max_entries:
+                cutoff = now - INVALIDATION_MEMORY_SECONDS
+                self._invalidated = {k: at for k, at in self._invalidated.items() if at > cutoff}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._invalidated.clear()
+            self._cleared_at = time.monotonic()
+            self.invalidations += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+class CachedDocument(NamedTuple):
+    """Snapshot of a document row: its API representation plus what downloads need"""
+    id: int
+    response: DocumentResponse
+    file_path: str
+    original_filename: str
+    mime_type: str
+    current_version: int
+    is_active: bool
+
+def _settle(db: Session) -> float:
+    """Replica reads may trail an invalidation by up to the allowed lag"""
+    return REPLICA_MAX_LAG_SECONDS if db.info.get("replica") else 0.0
+
+class DocumentAccessCache:
+    """
+    Per-worker cache of each client's accessible document ids and of
+    document metadata, so document reads and downloads are checked with a
+    set lookup instead of two queries.
+
+    Entries are dropped by the event bus listener on_event() whenever an
+    assignment or document changes, in this worker or a peer.
+    """
+
+    def __init__(self, max_clients: int = DOCUMENT_ACCESS_CACHE_CLIENTS,
+                 max_documents: int = DOCUMENT_METADATA_CACHE_SIZE, ttl: float = DOCUMENT_CACHE_TTL_SECONDS):
+        self.access = LRUCache(max_clients, ttl)
+        self.documents = LRUCache(max_documents, ttl)
+
+    def accessible_ids(self, db: Session, client_id: Optional[int]) -> FrozenSet[int]:
+        """Ids of documents actively assigned to a client (one query on a miss)"""
+        if client_id is None:
+            return frozenset()
+
+        def load():
+            rows = db.query(DocumentAssignment.document_id).filter(
+                DocumentAssignment.client_id == client_id,
+                DocumentAssignment.is_active == True
+            ).all()
+            return frozenset(row.document_id for row in rows)
+
+        return self.access.get_or_load(client_id, load, _settle(db))
+
+    def can_access(self, db: Session, user: User, document_id: int) -> bool:
+        return user.is_admin or document_id in self.accessible_ids(db, user.client_id)
+
+    def document(self, db: Session, document_id: int) -> Optional[CachedDocument]:
+        """Metadata of a document (active or not), or None if there is no such row"""
+
+        def load():
+            document = db.query(Document).filter(Document.id == document_id).first()
+            if document is None:
+                return None  # Not cached: the id may be taken by the next upload
+            return CachedDocument(
+                id=document.id,
+                response=DocumentResponse.model_validate(document),
+                file_path=document.file_path,
+                original_filename=document.original_filename,
+                mime_type=document.mime_type,
+                current_version=document.current_version,
+                is_active=document.is_active
+            )
+
+        return self.documents.get_or_load(document_id, load, _settle(db))
+
+    def on_event(self, event: dict):
+        """Event bus listener: drop entries a change may have made stale"""
+        entity = event.get("entity")
+        if entity == "assignment" and event.get("client_id") is not None:
+            self.access.invalidate(event["client_id"])
+        elif entity == "document" and event.get("id") is not None:
+            self.documents.invalidate(event["id"])
+
+    def clear(self):
+        self.access.clear()
+        self.documents.clear()
+
+    def stats(self) -> Dict:
+        return {"document_access": self.access.stats(), "document_metadata": self.documents.stats()}
+
+# Process-wide document access cache
+document_access_cache = DocumentAccessCache()
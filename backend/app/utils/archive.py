@@ -0,0 +1,271 @@
+import asyncio
+import enum
+import os
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+from sqlalchemy import DateTime, Enum, exists, func, insert, not_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models.archive import ArchivedRecord
+from app.models.client import Client
+from app.models.document import Document, DocumentAssignment, DocumentVersion, UploadSession
+from app.models.notification import NotificationOutbox
+from app.models.report import ComplianceReport
+from app.models.scorecard import ClientScorecard
+from app.models.task import Task, ClientInquiry
+from app.models.user import User
+from app.utils.audit import record_change
+from app.utils.events import event_bus
+from app.utils.storage import get_storage
+from app.utils.storage_usage import charge_assignment, charge_upload
+from app.utils.versioning import bump_client_version
+
+# Archival configuration
+ARCHIVE_ENABLED = os.getenv("ARCHIVE_ENABLED", "true").lower() == "true"
+ARCHIVE_RETENTION_DAYS = int(os.getenv("ARCHIVE_RETENTION_DAYS", "180"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+ARCHIVE_BATCH_PAUSE_SECONDS = float(os.getenv("ARCHIVE_BATCH_PAUSE_SECONDS", "0.05"))
+ARCHIVE_INTERVAL_HOURS = float(os.getenv("ARCHIVE_INTERVAL_HOURS", "24"))
+
+CLOSED_INQUIRY_STATUSES = ("resolved", "closed")
+CHILDREN_KEY = "_children"  # Payload key holding child rows archived along with their parent
+
+class ArchivePolicy:
+    """Which rows of one hot table are cold enough to archive"""
+
+    def __init__(self, entity: str, model, created_column, closed_criteria, client_column=None,
+                 blockers=(), children=(), derived=(), derived_files=()):
+        self.entity = entity
+        self.model = model
+        self.client_column = client_column
+        self.closed_criteria = closed_criteria
+        self.blockers = blockers  # Hot rows that still reference this one keep it in place
+        self.children = children  # Foreign keys of rows archived and restored together with this one
+        self.derived = derived  # Foreign keys of rows rebuilt on demand, deleted with this one and never restored
+        self.derived_files = derived_files  # (foreign key, storage key column) of derived files, removed after the commit
+        # Rows without updated_at fall back to when they were created
+        self.closed_at = func.coalesce(model.updated_at, created_column)
+
+    def criteria(self, cutoff: datetime) -> List:
+        conditions = [
+            self.closed_criteria,
+            self.closed_at < cutoff,
+            # Keep the newest row hot: SQLite reuses the highest rowid once it is deleted
+            self.model.id < select(func.max(self.model.id)).scalar_subquery(),
+        ]
+        conditions.extend(not_(exists().where(blocker)) for blocker in self.blockers)
+        return conditions
+
+# Children before parents, so a row is only archived once nothing hot references it
+ARCHIVE_POLICIES = [
+    ArchivePolicy("assignment", DocumentAssignment, DocumentAssignment.assigned_at,
+                  DocumentAssignment.is_active == False, DocumentAssignment.client_id),
+    ArchivePolicy("task", Task, Task.created_at, Task.is_active == False, Task.client_id),
+    ArchivePolicy("inquiry", ClientInquiry, ClientInquiry.created_at,
+                  ClientInquiry.status.in_(CLOSED_INQUIRY_STATUSES), ClientInquiry.client_id),
+    ArchivePolicy("document", Document, Document.created_at, Document.is_active == False,
+                  blockers=(
+                      DocumentAssignment.document_id == Document.id,
+                      UploadSession.document_id == Document.id,
+                  ),
+                  children=(DocumentVersion.document_id,)),
+    ArchivePolicy("client", Client, Client.created_at, Client.is_active == False, Client.id,
+                  blockers=(
+                      User.client_id == Client.id,
+                      Task.client_id == Client.id,
+                      ClientInquiry.client_id == Client.id,
+                      DocumentAssignment.client_id == Client.id,
+                  ),
+                  derived=(ClientScorecard.client_id, ComplianceReport.client_id, NotificationOutbox.client_id),
+                  derived_files=((ComplianceReport.client_id, ComplianceReport.file_path),)),
+]
+POLICIES_BY_ENTITY = {policy.entity: policy for policy in ARCHIVE_POLICIES}
+
+def row_payload(row) -> Dict:
+    """JSON-safe column values of a model instance"""
+    payload = {}
+    for column in row.__table__.columns:
+        value = getattr(row, column.key)
+        if isinstance(value, enum.Enum):
+            value = value.value
+        elif isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        payload[column.name] = value
+    return payload
+
+def payload_values(model, payload: Dict) -> Dict:
+    """Inverse of row_payload; columns added since archiving keep their defaults"""
+    values = {}
+    for column in model.__table__.columns:
+        if column.name not in payload:
+            continue
+        value = payload[column.name]
+        if value is not None and isinstance(column.type, DateTime):
+            value = datetime.fromisoformat(value)
+        elif value is not None and isinstance(column.type, Enum) and column.type.enum_class is not None:
+            value = column.type.enum_class(value)
+        values[column.key] = value
+    return values
+
+def archive_batch(db: Session, policy: ArchivePolicy, cutoff: datetime,
+                  batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """Move up to batch_size rows into archived_records in one short transaction"""
+    model = policy.model
+    rows = db.query(model, policy.closed_at).filter(*policy.criteria(cutoff)).order_by(model.id).limit(batch_size).all()
+    if not rows:
+        return 0
+
+    ids = [row.id for row, _ in rows]
+    children = {row.id: {} for row, _ in rows}
+    for foreign_key in policy.children:
+        child_model = foreign_key.class_
+        for child in db.query(child_model).filter(foreign_key.in_(ids)).order_by(child_model.id):
+            children[getattr(child, foreign_key.key)].setdefault(child_model.__tablename__, []).append(row_payload(child))
+
+    client_ids = []
+    records = []
+    for row, closed_at in rows:
+        client_id = getattr(row, policy.client_column.key) if policy.client_column is not None else None
+        client_ids.append(client_id)
+        payload = row_payload(row)
+        if children[row.id]:
+            payload[CHILDREN_KEY] = children[row.id]
+        records.append({
+            "entity": policy.entity,
+            "record_id": row.id,
+            "client_id": client_id,
+            "payload": payload,
+            "closed_at": closed_at,
+        })
+
+    files = []
+    for foreign_key, column in policy.derived_files:
+        files.extend(key for key, in db.query(column).filter(foreign_key.in_(ids), column != None))
+
+    try:
+        db.execute(insert(ArchivedRecord), records)
+        for foreign_key in (*policy.children, *policy.derived):
+            db.query(foreign_key.class_).filter(foreign_key.in_(ids)).delete(synchronize_session=False)
+        for record in records:
+            record_change(db, policy.entity, record["record_id"], "archived", record["client_id"])
+        db.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+        bump_client_version(db, [client_id for client_id in client_ids if client_id is not None])
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raced = db.query(ArchivedRecord.id).filter(
+            ArchivedRecord.entity == policy.entity,
+            ArchivedRecord.record_id.in_(ids)
+        ).first()
+        if raced is None:
+            raise  # A reference the policy doesn't know about, not a race
+        return 0  # Another worker archived this batch first
+    db.expunge_all()
+    for key in files:
+        get_storage().delete(key)
+    # Workers drop cached access sets and document metadata for the rows that are gone
+    for record in records:
+        event_bus.publish(policy.entity, "archived", record["record_id"], record["client_id"])
+    return len(rows)
+
+def archive_cold_records(db: Session, retention_days: int = ARCHIVE_RETENTION_DAYS,
+                         batch_size: int = ARCHIVE_BATCH_SIZE) -> Dict[str, int]:
+    """Archive every policy's cold rows batch by batch; safe to run from several workers"""
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    counts = {}
+    for policy in ARCHIVE_POLICIES:
+        counts[policy.entity] = 0
+        while True:
+            try:
+                moved = archive_batch(db, policy, cutoff, batch_size)
+            except IntegrityError as e:
+                # Retrying would hit the same row; the other policies still run
+                print(f"Archiving {policy.entity} records stopped: {e}")
+                break
+            counts[policy.entity] += moved
+            if moved < batch_size:
+                break
+            time.sleep(ARCHIVE_BATCH_PAUSE_SECONDS)  # Let queued writers in between batches
+    return counts
+
+def charge_reactivated(db: Session, model, values: Dict, children: Dict):
+    """Count a reactivated document or assignment against storage again; raises QuotaExceeded"""
+    if model is Document:
+        versions = children.get(DocumentVersion) or [values]  # Documents that predate version rows
+        for version in versions:
+            charge_upload(db, version["uploaded_by_id"], version["file_size"])
+    elif model is DocumentAssignment:
+        file_size = db.query(Document.file_size).filter(
+            Document.id == values["document_id"],
+            Document.is_active == True
+        ).scalar()
+        if file_size is not None:
+            charge_assignment(db, values["client_id"], file_size)
+
+def restore_record(db: Session, entity: str, record_id: int, reactivate: bool = False):
+    """
+    Move an archived row back into its hot table under its original id.
+
+    Raises LookupError if nothing is archived under that key and ValueError
+    if a row it references is itself still archived, or (QuotaExceeded) if
+    reactivating it would take a storage total past its quota.
+    """
+    policy = POLICIES_BY_ENTITY.get(entity)
+    archived = db.query(ArchivedRecord).filter(
+        ArchivedRecord.entity == entity,
+        ArchivedRecord.record_id == record_id
+    ).first()
+    if policy is None or archived is None:
+        raise LookupError(f"No archived {entity} with id {record_id}")
+
+    model = policy.model
+    values = payload_values(model, archived.payload)
+    for column in model.__table__.columns:
+        value = values.get(column.key)
+        for foreign_key in column.foreign_keys:
+            if value is not None and db.execute(select(foreign_key.column).where(foreign_key.column == value)).first() is None:
+                raise ValueError(f"Restore {foreign_key.column.table.name} {value} first")
+
+    # A fresh updated_at restarts the retention window
+    values["updated_at"] = datetime.utcnow()
+    if reactivate and "is_active" in values:
+        values["is_active"] = True
+
+    db.execute(insert(model).values(**values))
+    restored_children = {}
+    for foreign_key in policy.children:
+        child_model = foreign_key.class_
+        child_rows = archived.payload.get(CHILDREN_KEY, {}).get(child_model.__tablename__, [])
+        restored_children[child_model] = [payload_values(child_model, child) for child in child_rows]
+        if child_rows:
+            db.execute(insert(child_model), restored_children[child_model])
+    if reactivate and "is_active" in values:
+        charge_reactivated(db, model, values, restored_children)
+    db.delete(archived)
+    record_change(db, entity, record_id, "restored", archived.client_id,
+                  {"is_active": [None, True]} if reactivate and "is_active" in values else None)
+    if archived.client_id is not None:
+        bump_client_version(db, [archived.client_id])
+    db.commit()
+
+    event_bus.publish(entity, "restored", record_id, archived.client_id)
+    return values
+
+async def run_archiver():
+    """Background loop archiving cold records every ARCHIVE_INTERVAL_HOURS"""
+    loop = asyncio.get_running_loop()
+
+    def archive():
+        with SessionLocal() as db:
+            return archive_cold_records(db)
+
+    while True:
+        try:
+            counts = await loop.run_in_executor(None, archive)
+            if any(counts.values()):
+                print(f"Archived cold records: {counts}")
+        except Exception as e:
+            print(f"Archiving failed: {e}")
+        await asyncio.sleep(ARCHIVE_INTERVAL_HOURS * 3600)
@@ -0,0 +1,215 @@
+import enum
+import os
+import threading
+import time
+from collections import deque
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import event, insert, inspect
+from app.database import SessionLocal, engine
+from app.models.audit import AuditLog
+from app.models.client import Client
+from app.models.document import Document, DocumentAssignment
+from app.models.task import Task, ClientInquiry
+
+# Audit configuration
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL_SECONDS = float(os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", "1"))
+AUDIT_MAX_BUFFER = int(os.getenv("AUDIT_MAX_BUFFER", "20000"))
+AUDIT_DRAIN_TIMEOUT_SECONDS = float(os.getenv("AUDIT_DRAIN_TIMEOUT_SECONDS", "10"))
+
+AUDITED_MODELS = {
+    Client: "client",
+    Task: "task",
+    DocumentAssignment: "assignment",
+    ClientInquiry: "inquiry",
+    Document: "document",
+}
+IGNORED_FIELDS = {"updated_at", "data_version", "version"}
+PENDING_KEY = "audit_pending"
+
+def json_value(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+class AuditBuffer:
+    """
+    In-memory queue of committed audit entries, written in batches by a
+    background thread.
+
+    Each flush inserts at most AUDIT_BATCH_SIZE rows in one transaction.
+    The buffer is bounded: once AUDIT_MAX_BUFFER entries are waiting,
+    committers write their own entries straight through instead of
+    queueing them. They never wait on the flusher, since commits run on the
+    event loop thread. stop() drains what is left before returning.
+    """
+
+    def __init__(self):
+        self._entries = deque()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self.flushed = 0
+        self.failures = 0
+        self.overflows = 0  # Commits written through because the buffer was full
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="audit-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = AUDIT_DRAIN_TIMEOUT_SECONDS):
+        """Stop the flusher after writing out everything still buffered"""
+        if self._thread is None:
+            self.flush_all()
+            return
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        self._thread = None
+        if self._entries:
+            print(f"Audit log drain timed out with {len(self._entries)} entries unwritten")
+
+    def pending(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        return {"pending": len(self._entries), "flushed": self.flushed,
+                "failures": self.failures, "overflows": self.overflows}
+
+    def extend(self, entries: Iterable[Dict]):
+        entries = list(entries)
+        if not entries:
+            return
+        if self._thread is None:
+            # No flusher (scripts, one-off jobs): write through
+            self._write(entries)
+            return
+        if len(self._entries) >= AUDIT_MAX_BUFFER:
+            # The flusher is behind (or the database was down): write these now rather than wait for it
+            self.overflows += 1
+            try:
+                self._write(entries)
+                return
+            except Exception as e:
+                self.failures += 1
+                print(f"Audit log write-through failed, buffering over the cap: {e}")
+        with self._condition:
+            self._entries.extend(entries)
+            if len(self._entries) >= AUDIT_BATCH_SIZE:
+                self._condition.notify_all()
+
+    def flush_all(self):
+        while self._entries:
+            if not self._flush_batch():
+                break
+
+    def _flush_batch(self) -> bool:
+        with self._condition:
+            batch = [self._entries.popleft() for _ in range(min(AUDIT_BATCH_SIZE, len(self._entries)))]
+        if not batch:
+            return True
+        try:
+            self._write(batch)
+        except Exception as e:
+            # Put the batch back in order and retry on the next tick
+            self.failures += 1
+            with self._condition:
+                self._entries.extendleft(reversed(batch))
+            print(f"Audit log flush failed: {e}")
+            return False
+        return True
+
+    def _write(self, batch: List[Dict]):
+        with engine.begin() as connection:
+            connection.execute(insert(AuditLog), batch)
+        self.flushed += len(batch)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._stopping and len(self._entries) < AUDIT_BATCH_SIZE:
+                    self._condition.wait(AUDIT_FLUSH_INTERVAL_SECONDS)
+                stopping = self._stopping
+            if stopping:
+                deadline = time.monotonic() + AUDIT_DRAIN_TIMEOUT_SECONDS
+                while self._entries and time.monotonic() < deadline:
+                    if not self._flush_batch():
+                        time.sleep(0.1)
+                return
+            while self._entries:
+                if not self._flush_batch():
+                    break
+
+# Process-wide audit buffer
+audit_log = AuditBuffer()
+
+def audit_entry(entity: str, entity_id: Optional[int], action: str, user_id: Optional[int] = None,
+                client_id: Optional[int] = None, changes: Optional[Dict] = None) -> Dict:
+    return {
+        "entity": entity,
+        "entity_id": entity_id,
+        "action": action,
+        "user_id": user_id,
+        "client_id": client_id,
+        "changes": changes,
+        "occurred_at": datetime.utcnow(),
+    }
+
+def record_change(db, entity: str, entity_id: Optional[int], action: str,
+                  client_id: Optional[int] = None, changes: Optional[Dict] = None):
+    """Audit a change made with bulk statements the session events can't see; written on commit"""
+    db.info.setdefault(PENDING_KEY, []).append(
+        audit_entry(entity, entity_id, action, db.info.get("user_id"), client_id, changes)
+    )
+
+def _client_id(obj) -> Optional[int]:
+    if isinstance(obj, Client):
+        return obj.id
+    return getattr(obj, "client_id", None)
+
+def _changes(state, action: str) -> Dict:
+    changes = {}
+    for attr in state.mapper.column_attrs:
+        if attr.key in IGNORED_FIELDS:
+            continue
+        history = state.attrs[attr.key].history
+        if action == "created":
+            if history.added and history.added[0] is not None:
+                changes[attr.key] = [None, json_value(history.added[0])]
+        elif action == "deleted":
+            changes[attr.key] = [json_value(state.attrs[attr.key].loaded_value), None]
+        elif history.has_changes():
+            old = history.deleted[0] if history.deleted else None
+            new = history.added[0] if history.added else None
+            if old != new:
+                changes[attr.key] = [json_value(old), json_value(new)]
+    return changes
+
+@event.listens_for(SessionLocal, "after_flush")
+def _capture_flush(session, flush_context):
+    pending = session.info.setdefault(PENDING_KEY, [])
+    user_id = session.info.get("user_id")
+    for objects, action in ((session.new, "created"), (session.dirty, "updated"), (session.deleted, "deleted")):
+        for obj in objects:
+            entity = AUDITED_MODELS.get(type(obj))
+            if entity is None:
+                continue
+            changes = _changes(inspect(obj), action)
+            if action == "updated" and not changes:
+                continue
+            pending.append(audit_entry(entity, obj.id, action, user_id, _client_id(obj), changes))
+
+@event.listens_for(SessionLocal, "after_commit")
+def _publish_committed(session):
+    audit_log.extend(session.info.pop(PENDING_KEY, []))
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_rolled_back(session):
+    session.info.pop(PENDING_KEY, None)
@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta
 from typing import Optional
+from functools import lru_cache
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
@@ -15,19 +15,22 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing (passlib/bcrypt are loaded on first use or during boot warm-up)
+@lru_cache(maxsize=None)
+def get_password_context():
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_password_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Hash a password"""
-    return pwd_context.hash(password)
+    return get_password_context().hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token"""
@@ -37,7 +40,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -62,6 +65,13 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
         return None
     return user
 
+def get_user_from_token(db: Session, token: str) -> Optional[User]:
+    """Resolve a raw JWT to its user, or None if the token is invalid"""
+    token_data = verify_token(token)
+    if token_data is None:
+        return None
+    return db.query(User).filter(User.email == token_data.email).first()
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
@@ -73,14 +83,12 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    token_data = verify_token(credentials.credentials)
-    if token_data is None:
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.email == token_data.email).first()
+    user = get_user_from_token(db, credentials.credentials)
     if user is None:
         raise credentials_exception
     
+    # Attribute writes made through this request's session to the user (audit log)
+    db.info["user_id"] = user.id
     return user
 
 def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
@@ -0,0 +1,84 @@
+import os
+import zipfile
+from contextlib import closing
+from datetime import datetime
+from typing import BinaryIO, Callable, Iterable, Iterator, List, NamedTuple, Optional
+
+# Formats that are already compressed; deflating them again costs CPU for no gain
+STORED_EXTENSIONS = {
+    ".pdf", ".docx", ".xlsx", ".pptx", ".jpg", ".jpeg", ".png", ".gif", ".zip"
+}
+BUNDLE_READ_SIZE = 64 * 1024
+
+class BundleEntry(NamedTuple):
+    file_path: str
+    name: str
+    file_size: int
+    modified: Optional[datetime] = None
+
+class _ChunkSink:
+    """Write-only, unseekable file object that hands written bytes back to the generator"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def unique_names(names: Iterable[str]) -> List[str]:
+    """Archive member names without directories or duplicates ("a.pdf", "a (2).pdf")"""
+    seen = set()
+    result = []
+    for name in names:
+        base = os.path.basename((name or "").replace("\\", "/")) or "document"
+        stem, extension = os.path.splitext(base)
+        candidate, counter = base, 1
+        while candidate.lower() in seen:
+            counter += 1
+            candidate = f"{stem} ({counter}){extension}"
+        seen.add(candidate.lower())
+        result.append(candidate)
+    return result
+
+def stream_zip(entries: Iterable[BundleEntry], opener: Callable[[str], BinaryIO]) -> Iterator[bytes]:
+    """
+    Yield a ZIP archive of the given files as it is built.
+
+    Memory stays at about one read buffer regardless of archive size and
+    nothing is written to disk: the archive goes to an unseekable sink, so
+    zipfile emits data descriptors instead of seeking back to patch headers.
+    Files the opener can't find are skipped.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode="w", allowZip64=True) as archive:
+        for entry in entries:
+            try:
+                source = opener(entry.file_path)
+            except FileNotFoundError:
+                continue
+            info = zipfile.ZipInfo(entry.name, date_time=(entry.modified or datetime.utcnow()).timetuple()[:6])
+            extension = os.path.splitext(entry.name)[1].lower()
+            info.compress_type = zipfile.ZIP_STORED if extension in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+            info.file_size = entry.file_size  # Lets zipfile pick ZIP64 headers up front
+            with closing(source), archive.open(info, mode="w") as target:
+                while block := source.read(BUNDLE_READ_SIZE):
+                    target.write(block)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            yield sink.drain()
+    yield sink.drain()  # Central directory
@@ -0,0 +1,161 @@
+from typing import Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.document import Document, DocumentAssignment, DocumentVersion
+from app.utils.events import event_bus
+from app.utils.file_handler import delete_file
+from app.utils.storage import get_storage
+from app.utils.storage_usage import QuotaExceeded, charge_upload, resize_assignments
+from app.utils.versioning import bump_client_version
+
+def store_upload(db: Session, filename: str, file_path: str, file_size: int, sha256: str) -> tuple[str, str]:
+    """
+    Move a staged upload into storage; returns (filename, file_path).
+
+    Identical content already in storage is reused and the staged copy dropped.
+    """
+    existing = db.query(DocumentVersion.filename, DocumentVersion.file_path).filter(
+        DocumentVersion.sha256 == sha256,
+        DocumentVersion.file_size == file_size
+    ).first() or db.query(Document.filename, Document.file_path).filter(
+        Document.sha256 == sha256,
+        Document.file_size == file_size
+    ).first()
+
+    storage = get_storage()
+    if existing and existing.file_path != file_path and storage.exists(existing.file_path):
+        delete_file(file_path)
+        return existing.filename, existing.file_path
+    storage.put(file_path, file_path)
+    return filename, file_path
+
+def file_in_use(db: Session, file_path: str, document_id: Optional[int] = None) -> bool:
+    """Whether another document or another document's version still stores its content at file_path"""
+    documents = db.query(Document.id).filter(Document.file_path == file_path)
+    versions = db.query(DocumentVersion.id).filter(DocumentVersion.file_path == file_path)
+    if document_id is not None:
+        documents = documents.filter(Document.id != document_id)
+        versions = versions.filter(DocumentVersion.document_id != document_id)
+    return documents.first() is not None or versions.first() is not None
+
+def create_document(db: Session, uploaded_by_id: int, filename: str, original_filename: str, file_path: str,
+                    file_size: int, mime_type: str, sha256: str, description: str = "",
+                    document_type: str = "general") -> Document:
+    """Record a stored file as a new document with version 1; commits. Raises QuotaExceeded"""
+    try:
+        charge_upload(db, uploaded_by_id, file_size)
+    except QuotaExceeded:
+        db.rollback()
+        delete_file(file_path)
+        raise
+    filename, file_path = store_upload(db, filename, file_path, file_size, sha256)
+
+    document = Document(
+        filename=filename,
+        original_filename=original_filename,
+        file_path=file_path,
+        file_size=file_size,
+        mime_type=mime_type,
+        description=description,
+        document_type=document_type,
+        uploaded_by_id=uploaded_by_id,
+        current_version=1,
+        sha256=sha256
+    )
+    document.versions.append(DocumentVersion(
+        version_number=1,
+        filename=filename,
+        original_filename=original_filename,
+        file_path=file_path,
+        file_size=file_size,
+        mime_type=mime_type,
+        sha256=sha256,
+        uploaded_by_id=uploaded_by_id
+    ))
+
+    db.add(document)
+    db.commit()
+    db.refresh(document)
+    return document
+
+def add_document_version(db: Session, document: Document, uploaded_by_id: int, filename: str,
+                         original_filename: Optional[str], file_path: str, file_size: int, mime_type: str,
+                         sha256: str, change_note: Optional[str] = None) -> Document:
+    """
+    Make a stored file the document's latest version; commits and notifies assigned clients.
+
+    Re-uploading the current content is a no-op. Raises QuotaExceeded, or
+    ValueError when a concurrent upload took the same version number.
+    """
+    if sha256 == document.sha256 and file_size == document.file_size:
+        # Unchanged content: nothing to store and no new version
+        delete_file(file_path)
+        return document
+    try:
+        charge_upload(db, uploaded_by_id, file_size)
+    except QuotaExceeded:
+        db.rollback()
+        delete_file(file_path)
+        raise
+    filename, file_path = store_upload(db, filename, file_path, file_size, sha256)
+    previous_size = document.file_size
+    original_filename = original_filename or document.original_filename
+
+    if not document.versions:
+        # Uploaded before versioning: record the current file as version 1
+        document.versions.append(DocumentVersion(
+            version_number=document.current_version or 1,
+            filename=document.filename,
+            original_filename=document.original_filename,
+            file_path=document.file_path,
+            file_size=document.file_size,
+            mime_type=document.mime_type,
+            sha256=document.sha256,
+            uploaded_by_id=document.uploaded_by_id,
+            created_at=document.created_at
+        ))
+
+    version_number = max(version.version_number for version in document.versions) + 1
+    document.versions.append(DocumentVersion(
+        version_number=version_number,
+        filename=filename,
+        original_filename=original_filename,
+        file_path=file_path,
+        file_size=file_size,
+        mime_type=mime_type,
+        sha256=sha256,
+        change_note=change_note or None,
+        uploaded_by_id=uploaded_by_id
+    ))
+
+    # The document row mirrors the latest version, so assignments need no changes
+    document.filename = filename
+    document.original_filename = original_filename
+    document.file_path = file_path
+    document.file_size = file_size
+    document.mime_type = mime_type
+    document.sha256 = sha256
+    document.current_version = version_number
+
+    assignments = db.query(DocumentAssignment.id, DocumentAssignment.client_id).filter(
+        DocumentAssignment.document_id == document.id,
+        DocumentAssignment.is_active == True
+    ).all()
+    resize_assignments(db, [assignment.client_id for assignment in assignments], file_size - previous_size)
+    bump_client_version(db, [assignment.client_id for assignment in assignments])
+
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        if not file_in_use(db, file_path):
+            get_storage().delete(file_path)
+        raise ValueError("Another version was uploaded concurrently, please retry")
+    db.refresh(document)
+
+    event_bus.publish("document", "updated", document.id, version=version_number)
+    for assignment in assignments:
+        event_bus.publish("assignment", "updated", assignment.id, assignment.client_id,
+                          document_id=document.id, version=version_number)
+
+    return document
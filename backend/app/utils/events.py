@@ -0,0 +1,187 @@
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import threading
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+# Event bus configuration
+EVENTS_SOCKET_DIR = os.getenv(
+    "EVENTS_SOCKET_DIR",
+    os.path.join(tempfile.gettempdir(), "hrcompliance-events")
+)
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))
+EVENTS_KEEPALIVE_SECONDS = float(os.getenv("EVENTS_KEEPALIVE_SECONDS", "15"))
+MAX_DATAGRAM_SIZE = 64 * 1024
+
+ADMIN_CHANNEL = "admin"
+
+def client_channel(client_id: int) -> str:
+    """Channel name carrying events for one client company"""
+    return f"client:{client_id}"
+
+class EventBus:
+    """
+    In-process pub/sub for change events with local cross-worker fan-out.
+
+    Every uvicorn worker binds a Unix datagram socket inside a shared
+    directory. Publishing delivers to the local subscribers and sends one
+    datagram to each peer socket found in that directory, so SSE clients
+    connected to any worker on the host see every change.
+    """
+
+    def __init__(self, socket_dir: str = EVENTS_SOCKET_DIR):
+        self.socket_dir = socket_dir
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._listeners: List[Callable[[dict], None]] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._recv_sock: Optional[socket.socket] = None
+        self._send_sock: Optional[socket.socket] = None
+        self._send_lock = threading.Lock()
+        self._socket_path: Optional[str] = None
+
+    async def start(self):
+        """Bind this worker's fan-out socket and start receiving peer events"""
+        self._loop = asyncio.get_running_loop()
+        if not hasattr(socket, "AF_UNIX"):
+            return  # Single-process delivery only
+
+        os.makedirs(self.socket_dir, exist_ok=True)
+        self._socket_path = os.path.join(self.socket_dir, f"{os.getpid()}-{uuid.uuid4().hex[:8]}.sock")
+        self._recv_sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._recv_sock.bind(self._socket_path)
+        self._recv_sock.setblocking(False)
+        self._send_sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._send_sock.setblocking(False)
+        self._loop.add_reader(self._recv_sock.fileno(), self._on_peer_event)
+
+    def stop(self):
+        """Stop receiving peer events and remove this worker's socket"""
+        if self._recv_sock is not None:
+            if self._loop is not None:
+                self._loop.remove_reader(self._recv_sock.fileno())
+            self._recv_sock.close()
+            self._recv_sock = None
+        if self._send_sock is not None:
+            self._send_sock.close()
+            self._send_sock = None
+        if self._socket_path and os.path.exists(self._socket_path):
+            os.unlink(self._socket_path)
+        self._socket_path = None
+
+    def add_listener(self, listener: Callable[[dict], None]):
+        """Register a callback run on the event loop for every event, local or from peers"""
+        self._listeners.append(listener)
+
+    def subscribe(self, channels: Iterable[str]) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=EVENTS_QUEUE_SIZE)
+        for channel in channels:
+            self._subscribers.setdefault(channel, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue, channels: Iterable[str]):
+        for channel in channels:
+            queues = self._subscribers.get(channel)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[channel]
+
+    def publish(self, entity: str, action: str, entity_id: Optional[int] = None,
+                client_id: Optional[int] = None, **extra):
+        """Publish a change event; call after the corresponding commit"""
+        event = {
+            "entity": entity,
+            "action": action,
+            "id": entity_id,
+            "client_id": client_id,
+            "at": datetime.utcnow().isoformat() + "Z",
+            **extra,
+        }
+        self._dispatch(event)
+        self._send_to_peers(event)
+
+    def _dispatch(self, event: dict):
+        """Deliver on the event loop thread, whichever thread published"""
+        if self._loop is None:
+            self._deliver(event)
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._deliver(event)
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._deliver, event)
+
+    def _deliver(self, event: dict):
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                print(f"Event listener failed: {e}")
+
+        channels = [ADMIN_CHANNEL]
+        if event.get("client_id") is not None:
+            channels.append(client_channel(event["client_id"]))
+
+        delivered = set()
+        for channel in channels:
+            for queue in self._subscribers.get(channel, ()):
+                if queue in delivered:
+                    continue
+                delivered.add(queue)
+                if queue.full():
+                    # Slow consumer: drop the oldest event and ask it to reload everything
+                    queue.get_nowait()
+                    event_to_send = {"entity": "*", "action": "resync"}
+                else:
+                    event_to_send = event
+                queue.put_nowait(event_to_send)
+
+    def _send_to_peers(self, event: dict):
+        if self._send_sock is None:
+            return
+        payload = json.dumps(event, default=str).encode()
+        if len(payload) > MAX_DATAGRAM_SIZE:
+            return
+
+        try:
+            entries = list(os.scandir(self.socket_dir))
+        except FileNotFoundError:
+            return
+
+        with self._send_lock:
+            for entry in entries:
+                if entry.path == self._socket_path or not entry.name.endswith(".sock"):
+                    continue
+                try:
+                    self._send_sock.sendto(payload, entry.path)
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # Socket left behind by a dead worker
+                    try:
+                        os.unlink(entry.path)
+                    except OSError:
+                        pass
+                except (BlockingIOError, OSError):
+                    # Peer is not keeping up; it will resync on its clients' next reload
+                    pass
+
+    def _on_peer_event(self):
+        while self._recv_sock is not None:
+            try:
+                payload = self._recv_sock.recv(MAX_DATAGRAM_SIZE)
+            except (BlockingIOError, InterruptedError):
+                return
+            try:
+                event = json.loads(payload)
+            except ValueError:
+                continue
+            self._deliver(event)
+
+# Process-wide event bus
+event_bus = EventBus()
@@ -1,3 +1,4 @@
+import hashlib
 import os
 import shutil
 import uuid
@@ -7,7 +8,7 @@ from pathlib import Path
 
 # Configuration
 UPLOAD_DIR = "uploads"
-MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
+MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", str(50 * 1024 * 1024)))  # 50MB; larger files use resumable uploads
 ALLOWED_EXTENSIONS = {
     ".pdf", ".doc", ".docx", ".xls", ".xlsx", 
     ".ppt", ".pptx", ".txt", ".jpg", ".jpeg", 
@@ -36,13 +37,15 @@ def validate_file(file: UploadFile) -> bool:
     
     return True
 
-async def save_upload_file(file: UploadFile, destination_path: str) -> int:
-    """Save uploaded file to destination and return file size"""
+async def save_upload_file(file: UploadFile, destination_path: str) -> tuple[int, str]:
+    """Save uploaded file to destination and return (file size, sha256 hex digest)"""
     file_size = 0
+    digest = hashlib.sha256()
     
     with open(destination_path, "wb") as buffer:
         while chunk := await file.read(8192):  # Read in 8KB chunks
             file_size += len(chunk)
+            digest.update(chunk)
             
             # Check file size limit
             if file_size > MAX_FILE_SIZE:
@@ -55,11 +58,11 @@ async def save_upload_file(file: UploadFile, destination_path: str) -> int:
             
             buffer.write(chunk)
     
-    return file_size
+    return file_size, digest.hexdigest()
 
-async def handle_file_upload(file: UploadFile) -> tuple[str, str, int]:
+async def handle_file_upload(file: UploadFile) -> tuple[str, str, int, str]:
     """
-    Handle file upload and return (unique_filename, file_path, file_size)
+    Handle file upload and return (unique_filename, file_path, file_size, sha256)
     """
     # Validate file
     validate_file(file)
@@ -72,9 +75,9 @@ async def handle_file_upload(file: UploadFile) -> tuple[str, str, int]:
     file_path = os.path.join(UPLOAD_DIR, unique_filename)
     
     # Save file
-    file_size = await save_upload_file(file, file_path)
+    file_size, sha256 = await save_upload_file(file, file_path)
     
-    return unique_filename, file_path, file_size
+    return unique_filename, file_path, file_size, sha256
 
 def delete_file(file_path: str) -> bool:
     """Delete file from filesystem"""
@@ -0,0 +1,131 @@
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.models.task import ClientInquiry
+from app.utils.audit import record_change
+from app.utils.scheduler import as_utc_naive
+from app.utils.versioning import bump_client_version
+
+# Inquiry work queue configuration
+INQUIRY_LEASE_MINUTES = float(os.getenv("INQUIRY_LEASE_MINUTES", "15"))
+INQUIRY_CLAIM_CANDIDATES = int(os.getenv("INQUIRY_CLAIM_CANDIDATES", "5"))
+
+QUEUE_STATUS = "open"
+SKIP_LOCKED_DIALECTS = {"postgresql", "mysql"}
+
+def _claimable(now: datetime):
+    """Open inquiries nobody holds an unexpired lease on"""
+    return (
+        ClientInquiry.status == QUEUE_STATUS,
+        or_(ClientInquiry.lease_expires_at == None, ClientInquiry.lease_expires_at < now),
+    )
+
+def _queue_order():
+    return ClientInquiry.priority_rank, ClientInquiry.created_at
+
+def _take(db: Session, inquiry_id: int, user_id: int, now: datetime) -> bool:
+    """Conditional update: lease the inquiry only if it is still claimable"""
+    return db.query(ClientInquiry).filter(ClientInquiry.id == inquiry_id, *_claimable(now)).update({
+        ClientInquiry.assigned_to_id: user_id,
+        ClientInquiry.lease_expires_at: now + timedelta(minutes=INQUIRY_LEASE_MINUTES),
+        ClientInquiry.version: ClientInquiry.version + 1,
+    }, synchronize_session=False) == 1
+
+def claim_next_inquiry(db: Session, user_id: int) -> Optional[ClientInquiry]:
+    """
+    Lease the highest-priority, oldest open inquiry to user_id; commits.
+
+    Postgres and MySQL lock the head of the queue with SKIP LOCKED, so
+    concurrent claimers each get a different row without waiting. Other
+    databases read a few candidates from the queue index and take the first
+    one a conditional UPDATE still finds claimable. Returns None when
+    nothing is claimable.
+    """
+    while True:
+        now = datetime.utcnow()
+        query = db.query(ClientInquiry.id, ClientInquiry.assigned_to_id).filter(*_claimable(now)).order_by(*_queue_order())
+        if db.get_bind().dialect.name in SKIP_LOCKED_DIALECTS:
+            candidates = query.with_for_update(skip_locked=True).limit(1).all()
+        else:
+            candidates = query.limit(INQUIRY_CLAIM_CANDIDATES).all()
+        if not candidates:
+            db.rollback()
+            return None
+
+        for candidate in candidates:
+            if _take(db, candidate.id, user_id, now):
+                inquiry = db.query(ClientInquiry).filter(ClientInquiry.id == candidate.id).one()
+                record_change(db, "inquiry", inquiry.id, "claimed", inquiry.client_id,
+                              {"assigned_to_id": [candidate.assigned_to_id, user_id]})
+                bump_client_version(db, [inquiry.client_id])
+                db.commit()
+                db.refresh(inquiry)
+                return inquiry
+        # Every candidate was taken by a concurrent claimer; look again
+        db.rollback()
+
+def _held_by(db: Session, inquiry_id: int, user_id: int):
+    return db.query(ClientInquiry).filter(
+        ClientInquiry.id == inquiry_id,
+        ClientInquiry.status == QUEUE_STATUS,
+        ClientInquiry.assigned_to_id == user_id,
+        ClientInquiry.lease_expires_at != None
+    )
+
+def _missing_or_not_held(db: Session, inquiry_id: int):
+    if db.query(ClientInquiry.id).filter(ClientInquiry.id == inquiry_id).first() is None:
+        raise LookupError("Inquiry not found")
+    raise ValueError("Inquiry is not claimed by you")
+
+def renew_inquiry_lease(db: Session, inquiry_id: int, user_id: int) -> ClientInquiry:
+    """
+    Extend the caller's lease by INQUIRY_LEASE_MINUTES; commits.
+
+    An expired lease can still be renewed as long as nobody else has
+    claimed the inquiry since. Raises LookupError or ValueError.
+    """
+    renewed = _held_by(db, inquiry_id, user_id).update({
+        ClientInquiry.lease_expires_at: datetime.utcnow() + timedelta(minutes=INQUIRY_LEASE_MINUTES),
+        ClientInquiry.version: ClientInquiry.version + 1,
+    }, synchronize_session=False)
+    if not renewed:
+        db.rollback()
+        _missing_or_not_held(db, inquiry_id)
+    db.commit()
+    return db.query(ClientInquiry).filter(ClientInquiry.id == inquiry_id).one()
+
+def release_inquiry(db: Session, inquiry_id: int, user_id: int) -> ClientInquiry:
+    """Give a claimed inquiry back to the queue; commits. Raises LookupError or ValueError"""
+    released = _held_by(db, inquiry_id, user_id).update({
+        ClientInquiry.assigned_to_id: None,
+        ClientInquiry.lease_expires_at: None,
+        ClientInquiry.version: ClientInquiry.version + 1,
+    }, synchronize_session=False)
+    if not released:
+        db.rollback()
+        _missing_or_not_held(db, inquiry_id)
+
+    inquiry = db.query(ClientInquiry).filter(ClientInquiry.id == inquiry_id).one()
+    record_change(db, "inquiry", inquiry_id, "released", inquiry.client_id, {"assigned_to_id": [user_id, None]})
+    bump_client_version(db, [inquiry.client_id])
+    db.commit()
+    db.refresh(inquiry)
+    return inquiry
+
+def lease_available_to(user_id: int, now: datetime):
+    """SQL condition: no other admin holds an unexpired lease"""
+    return or_(
+        ClientInquiry.lease_expires_at == None,
+        ClientInquiry.lease_expires_at < now,
+        ClientInquiry.assigned_to_id == user_id,
+    )
+
+def check_inquiry_lease(inquiry: ClientInquiry, user_id: int):
+    """Raise ValueError if another admin holds an unexpired lease on the inquiry"""
+    if inquiry.lease_expires_at is None or inquiry.assigned_to_id in (None, user_id):
+        return
+    expires_at = as_utc_naive(inquiry.lease_expires_at)
+    if expires_at > datetime.utcnow():
+        raise ValueError(f"Inquiry is claimed by another admin until {expires_at.isoformat()}Z")
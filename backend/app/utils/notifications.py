@@ -0,0 +1,307 @@
+import asyncio
+import os
+import queue
+import random
+import smtplib
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from typing import Dict, List, NamedTuple, Optional
+from sqlalchemy import DateTime, Integer, String, Text, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models.notification import NotificationOutbox
+from app.models.user import User
+
+# SMTP delivery; notifications are only queued when a server is configured
+SMTP_HOST = os.getenv("SMTP_HOST", "")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_USERNAME = os.getenv("SMTP_USERNAME", "")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "")
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "false").lower() == "true"
+SMTP_TIMEOUT_SECONDS = float(os.getenv("SMTP_TIMEOUT_SECONDS", "10"))
+SMTP_FROM = os.getenv("SMTP_FROM", "Paradigm HR Compliance <noreply@paradigm.com>")
+NOTIFICATIONS_ENABLED = os.getenv("NOTIFICATIONS_ENABLED", "true" if SMTP_HOST else "false").lower() == "true"
+
+# Outbox delivery
+NOTIFY_DIGEST_SECONDS = float(os.getenv("NOTIFY_DIGEST_SECONDS", "300"))  # Coalescing window per recipient
+NOTIFY_POLL_SECONDS = float(os.getenv("NOTIFY_POLL_SECONDS", "15"))
+NOTIFY_BATCH_RECIPIENTS = int(os.getenv("NOTIFY_BATCH_RECIPIENTS", "100"))  # Digests per delivery round
+NOTIFY_SMTP_CONNECTIONS = int(os.getenv("NOTIFY_SMTP_CONNECTIONS", "2"))
+NOTIFY_MAX_ATTEMPTS = int(os.getenv("NOTIFY_MAX_ATTEMPTS", "6"))
+NOTIFY_RETRY_BASE_SECONDS = float(os.getenv("NOTIFY_RETRY_BASE_SECONDS", "30"))  # Doubles per attempt
+NOTIFY_RETRY_MAX_SECONDS = float(os.getenv("NOTIFY_RETRY_MAX_SECONDS", "3600"))
+NOTIFY_RETENTION_DAYS = float(os.getenv("NOTIFY_RETENTION_DAYS", "30"))  # Sent and failed rows are kept this long
+
+CLAIM_SECONDS = 300  # Longer than a delivery round; an expired claim means its worker died
+DIGEST_MAX_ITEMS = 50
+PENDING, SENT, FAILED = "pending", "sent", "failed"
+
+# Queueing (call before the commit of the change being announced)
+
+def enqueue_notification(db: Session, kind: str, client_id: int, subject: str, body: Optional[str] = None,
+                         entity_id: Optional[int] = None, user_id: Optional[int] = None):
+    """
+    Queue a notification to the client's active portal users (or only
+    user_id) in the current transaction, so it is sent if and only if the
+    change commits. One INSERT ... SELECT, whatever the number of users.
+    """
+    if not NOTIFICATIONS_ENABLED:
+        return
+    recipients = select(
+        User.email,
+        User.id,
+        literal(client_id, Integer),
+        literal(kind, String),
+        literal(entity_id, Integer),
+        literal(subject[:255], String),
+        literal(body, Text),
+        literal(datetime.utcnow() + timedelta(seconds=NOTIFY_DIGEST_SECONDS), DateTime),
+    ).where(User.client_id == client_id, User.is_active == True, User.is_admin == False)
+    if user_id is not None:
+        recipients = recipients.where(User.id == user_id)
+    db.execute(insert(NotificationOutbox).from_select([
+        "recipient_email", "recipient_user_id", "client_id", "kind", "entity_id", "subject", "body", "next_attempt_at"
+    ], recipients))
+
+# Delivery
+
+class Digest(NamedTuple):
+    recipient: str
+    ids: List[int]
+    message: EmailMessage
+
+class DeliveryError(Exception):
+    def __init__(self, message: str, permanent: bool):
+        super().__init__(message)
+        self.permanent = permanent
+
+class SMTPPool:
+    """
+    Up to `size` SMTP connections kept open between sends and shared by
+    delivery threads. A connection the server has dropped is replaced once
+    per send.
+    """
+
+    def __init__(self, size: int = NOTIFY_SMTP_CONNECTIONS):
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: "queue.LifoQueue[smtplib.SMTP]" = queue.LifoQueue()
+
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT_SECONDS)
+        if SMTP_STARTTLS:
+            connection.starttls()
+        if SMTP_USERNAME:
+            connection.login(SMTP_USERNAME, SMTP_PASSWORD)
+        return connection
+
+    def _discard(self, connection: smtplib.SMTP):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def send(self, message: EmailMessage):
+        """Raises DeliveryError"""
+        with self._slots:
+            for attempt in range(2):
+                connection = None
+                if not attempt:  # A retry skips the other idle connections, which are likely just as stale
+                    try:
+                        connection = self._idle.get_nowait()
+                    except queue.Empty:
+                        pass
+                if connection is None:
+                    try:
+                        connection = self._connect()
+                    except OSError as e:
+                        raise DeliveryError(f"SMTP connect failed: {e}", permanent=False)
+                try:
+                    connection.send_message(message)
+                except smtplib.SMTPRecipientsRefused as e:
+                    self._idle.put(connection)
+                    codes = [code for code, _ in e.recipients.values()]
+                    raise DeliveryError(f"Recipient refused: {e.recipients}", permanent=all(code >= 500 for code in codes))
+                except smtplib.SMTPResponseException as e:
+                    self._idle.put(connection)
+                    raise DeliveryError(f"SMTP {e.smtp_code}: {e.smtp_error!r}", permanent=e.smtp_code >= 500)
+                except (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError) as e:
+                    self._discard(connection)
+                    if attempt:
+                        raise DeliveryError(f"SMTP connection lost: {e}", permanent=False)
+                    continue  # Idle connection timed out on the server; retry on a fresh one
+                except OSError as e:  # Includes the remaining SMTPExceptions
+                    self._discard(connection)
+                    raise DeliveryError(f"SMTP error: {e}", permanent=False)
+                self._idle.put(connection)
+                return
+
+    def close(self):
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                connection.quit()
+            except Exception:
+                self._discard(connection)
+
+def build_digest(recipient: str, rows: List[NotificationOutbox]) -> Digest:
+    """One email per recipient covering every notification claimed for them"""
+    message = EmailMessage()
+    message["From"] = SMTP_FROM
+    message["To"] = recipient
+    if len(rows) == 1:
+        message["Subject"] = rows[0].subject
+        message.set_content(f"{rows[0].subject}\n\n{rows[0].body or ''}".rstrip() + "\n")
+    else:
+        message["Subject"] = f"{len(rows)} updates from Paradigm HR Compliance"
+        sections = []
+        for row in rows[:DIGEST_MAX_ITEMS]:
+            section = f"- {row.subject}"
+            if row.body:
+                section += "\n  " + row.body.strip().replace("\n", "\n  ")
+            sections.append(section)
+        if len(rows) > DIGEST_MAX_ITEMS:
+            sections.append(f"...and {len(rows) - DIGEST_MAX_ITEMS} more. Sign in to the client portal for the rest.")
+        message.set_content("Here is what changed since our last message:\n\n" + "\n\n".join(sections) + "\n")
+    return Digest(recipient, [row.id for row in rows], message)
+
+def claim_digests(db: Session, limit: int = NOTIFY_BATCH_RECIPIENTS) -> List[Digest]:
+    """
+    Claim every pending notification of up to `limit` recipients that have
+    at least one due, and group them into one digest each; commits.
+
+    The claim is a single UPDATE, so concurrent workers never send the same
+    rows; rows whose claim expired (worker died) can be claimed again.
+    """
+    now = datetime.utcnow()
+    token = str(uuid.uuid4())
+    unclaimed = (NotificationOutbox.claimed_until == None) | (NotificationOutbox.claimed_until < now)
+    due_recipients = select(NotificationOutbox.recipient_email).where(
+        NotificationOutbox.status == PENDING,
+        NotificationOutbox.next_attempt_at <= now,
+        unclaimed
+    ).group_by(NotificationOutbox.recipient_email).order_by(
+        func.min(NotificationOutbox.next_attempt_at)
+    ).limit(limit)
+    db.execute(
+        update(NotificationOutbox)
+        .where(
+            NotificationOutbox.status == PENDING,
+            unclaimed,
+            NotificationOutbox.recipient_email.in_(due_recipients)
+        )
+        .values(claim_token=token, claimed_until=now + timedelta(seconds=CLAIM_SECONDS))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    rows = db.query(NotificationOutbox).filter(NotificationOutbox.claim_token == token).order_by(
+        NotificationOutbox.recipient_email, NotificationOutbox.id
+    ).all()
+    grouped: Dict[str, List[NotificationOutbox]] = {}
+    for row in rows:
+        grouped.setdefault(row.recipient_email, []).append(row)
+    return [build_digest(recipient, group) for recipient, group in grouped.items()]
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff with jitter, so a recovering SMTP server isn't hit all at once"""
+    delay = min(NOTIFY_RETRY_MAX_SECONDS, NOTIFY_RETRY_BASE_SECONDS * (2 ** max(0, attempts - 1)))
+    return delay * random.uniform(0.8, 1.2)
+
+def record_results(db: Session, results: List[tuple]):
+    """Apply (digest, error) outcomes to the outbox; commits"""
+    now = datetime.utcnow()
+    for digest, error in results:
+        rows = db.query(NotificationOutbox).filter(NotificationOutbox.id.in_(digest.ids))
+        if error is None:
+            rows.update({
+                NotificationOutbox.status: SENT,
+                NotificationOutbox.sent_at: now,
+                NotificationOutbox.attempts: NotificationOutbox.attempts + 1,
+                NotificationOutbox.claim_token: None,
+                NotificationOutbox.claimed_until: None,
+                NotificationOutbox.last_error: None,
+            }, synchronize_session=False)
+            continue
+        for row in rows:
+            row.attempts += 1
+            row.last_error = str(error)[:1000]
+            row.claim_token, row.claimed_until = None, None
+            if error.permanent or row.attempts >= NOTIFY_MAX_ATTEMPTS:
+                row.status = FAILED
+            else:
+                row.next_attempt_at = now + timedelta(seconds=retry_delay(row.attempts))
+    db.commit()
+
+def purge_delivered(db: Session) -> int:
+    """Delete sent and failed rows older than NOTIFY_RETENTION_DAYS; commits"""
+    cutoff = datetime.utcnow() - timedelta(days=NOTIFY_RETENTION_DAYS)
+    deleted = db.query(NotificationOutbox).filter(
+        NotificationOutbox.status.in_([SENT, FAILED]),
+        NotificationOutbox.created_at < cutoff
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+class NotificationDispatcher:
+    """
+    Drains the outbox: claims due digests, sends them in parallel over a
+    small pool of persistent SMTP connections, and records the outcome
+    (sent, retried with backoff, or failed for good).
+    """
+
+    def __init__(self, connections: int = NOTIFY_SMTP_CONNECTIONS):
+        self.smtp = SMTPPool(connections)
+        self._senders = ThreadPoolExecutor(max_workers=connections, thread_name_prefix="smtp")
+        self._last_purge = 0.0
+
+    def _send(self, digest: Digest):
+        try:
+            self.smtp.send(digest.message)
+            return digest, None
+        except DeliveryError as e:
+            return digest, e
+
+    def deliver_once(self) -> Dict[str, int]:
+        """One delivery round; returns counts of digests sent and failed"""
+        with SessionLocal() as db:
+            digests = claim_digests(db)
+            if not digests:
+                return {"sent": 0, "failed": 0}
+            results = list(self._senders.map(self._send, digests))
+            record_results(db, results)
+        failed = sum(1 for _, error in results if error is not None)
+        return {"sent": len(results) - failed, "failed": failed}
+
+    def _purge_if_due(self):
+        now = datetime.utcnow().timestamp()
+        if now - self._last_purge >= 3600:
+            with SessionLocal() as db:
+                purge_delivered(db)
+            self._last_purge = now
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                # Keep going while full batches come back
+                while True:
+                    counts = await loop.run_in_executor(None, self.deliver_once)
+                    if counts["sent"] + counts["failed"] < NOTIFY_BATCH_RECIPIENTS:
+                        break
+                await loop.run_in_executor(None, self._purge_if_due)
+            except Exception as e:
+                print(f"Notification delivery failed: {e}")
+            await asyncio.sleep(NOTIFY_POLL_SECONDS)
+
+    def stop(self):
+        self._senders.shutdown(wait=False)
+        self.smtp.close()
+
+# Process-wide outbox dispatcher
+notification_dispatcher = NotificationDispatcher()
@@ -0,0 +1,104 @@
+import textwrap
+from typing import BinaryIO, Dict, List
+
+# US Letter in points, 0.75in margins
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+MARGIN = 54
+FONT_SIZE = 10
+LEADING = 13
+HEADING_PREFIX = "# "
+# Helvetica averages about half an em per character
+WRAP_COLUMNS = int((PAGE_WIDTH - 2 * MARGIN) / (FONT_SIZE * 0.5))
+LINES_PER_PAGE = (PAGE_HEIGHT - 2 * MARGIN) // LEADING
+
+# Fixed object numbers; pages and their content streams follow
+CATALOG, PAGES, FONT_REGULAR, FONT_BOLD, INFO = 1, 2, 3, 4, 5
+
+def _escape(text: str) -> bytes:
+    data = text.encode("cp1252", errors="replace")
+    return data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+class TextPDFWriter:
+    """
+    Streams plain text into a PDF using the built-in Helvetica fonts.
+
+    Only the current page is held in memory; each finished page is
+    written out straight away. Lines starting with "# " are set in bold.
+    Call close() to write the page tree and cross-reference table.
+    """
+
+    def __init__(self, output: BinaryIO, title: str = ""):
+        self.output = output
+        self.title = title
+        self._offsets: Dict[int, int] = {}
+        self._page_ids: List[int] = []
+        self._next_id = INFO + 1
+        self._lines: List[bytes] = []
+        self._position = 0
+        self._pending = ""
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _write(self, data: bytes):
+        self.output.write(data)
+        self._position += len(data)
+
+    def _object(self, object_id: int, body: bytes):
+        self._offsets[object_id] = self._position
+        self._write(b"%d 0 obj\n" % object_id + body + b"\nendobj\n")
+
+    def write(self, text: str):
+        """Add text; lines are laid out as they complete"""
+        self._pending += text
+        *lines, self._pending = self._pending.split("\n")
+        for line in lines:
+            self.write_line(line)
+
+    def write_line(self, line: str):
+        line = line.rstrip()
+        bold = line.startswith(HEADING_PREFIX)
+        if bold:
+            line = line[len(HEADING_PREFIX):]
+        font = b"/F2" if bold else b"/F1"
+        for part in textwrap.wrap(line, WRAP_COLUMNS, subsequent_indent="    ") or [""]:
+            if len(self._lines) >= LINES_PER_PAGE:
+                self._finish_page()
+            self._lines.append(b"%s %d Tf (%s) Tj T*" % (font, FONT_SIZE, _escape(part)))
+
+    def _finish_page(self):
+        content = b"BT %d TL %d %d Td\n%s\nET" % (
+            LEADING, MARGIN, PAGE_HEIGHT - MARGIN - FONT_SIZE, b"\n".join(self._lines)
+        )
+        content_id, page_id = self._next_id, self._next_id + 1
+        self._next_id += 2
+        self._object(content_id, b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+        self._object(page_id, (
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 %d 0 R /F2 %d 0 R >> >> >>"
+        ) % (PAGES, PAGE_WIDTH, PAGE_HEIGHT, content_id, FONT_REGULAR, FONT_BOLD))
+        self._page_ids.append(page_id)
+        self._lines = []
+
+    def close(self):
+        if self._pending:
+            self.write_line(self._pending)
+            self._pending = ""
+        if self._lines or not self._page_ids:
+            self._finish_page()
+
+        kids = b" ".join(b"%d 0 R" % page_id for page_id in self._page_ids)
+        self._object(PAGES, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self._page_ids)))
+        self._object(FONT_REGULAR, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+        self._object(FONT_BOLD, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+        self._object(INFO, b"<< /Title (%s) /Producer (Paradigm HR Compliance) >>" % _escape(self.title))
+        self._object(CATALOG, b"<< /Type /Catalog /Pages %d 0 R >>" % PAGES)
+
+        xref_at = self._position
+        count = self._next_id
+        entries = [b"0000000000 65535 f \n"]
+        for object_id in range(1, count):
+            entries.append(b"%010d 00000 n \n" % self._offsets[object_id])
+        self._write(b"xref\n0 %d\n" % count + b"".join(entries))
+        self._write(b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+            count, CATALOG, INFO, xref_at
+        ))
@@ -0,0 +1,160 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from fastapi import HTTPException, Request, status
+
+# Login admission configuration
+LOGIN_IP_RATE_PER_MINUTE = float(os.getenv("LOGIN_IP_RATE_PER_MINUTE", "30"))
+LOGIN_IP_BURST = int(os.getenv("LOGIN_IP_BURST", "10"))
+LOGIN_EMAIL_RATE_PER_MINUTE = float(os.getenv("LOGIN_EMAIL_RATE_PER_MINUTE", "5"))
+LOGIN_EMAIL_BURST = int(os.getenv("LOGIN_EMAIL_BURST", "5"))
+LOGIN_MAX_CONCURRENT_VERIFICATIONS = int(os.getenv("LOGIN_MAX_CONCURRENT_VERIFICATIONS", "4"))
+LOGIN_UNKNOWN_EMAIL_TTL = float(os.getenv("LOGIN_UNKNOWN_EMAIL_TTL", "60"))
+LOGIN_TRUST_FORWARDED_FOR = os.getenv("LOGIN_TRUST_FORWARDED_FOR", "false").lower() == "true"
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at `rate` tokens per second"""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated_at")
+
+    def __init__(self, capacity: int, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+
+    def take(self, now: float) -> float:
+        """Consume one token; return 0 if admitted, otherwise seconds until a token is available"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+class KeyedRateLimiter:
+    """Token buckets keyed by an arbitrary string, bounded by LRU eviction"""
+
+    def __init__(self, capacity: int, rate_per_minute: float, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.capacity = capacity
+        self.rate = rate_per_minute / 60.0
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str) -> float:
+        """Record an attempt for key; return 0 if admitted, otherwise the retry delay in seconds"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(self.capacity, self.rate)
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            return bucket.take(now)
+
+class NegativeCache:
+    """Short-lived set of keys known not to exist (e.g. unknown login emails)"""
+
+    def __init__(self, ttl: float, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, key: str):
+        with self._lock:
+            self._entries[key] = time.monotonic() + self.ttl
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is None:
+                return False
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return False
+            return True
+
+def too_many_requests(retry_after: float, detail: str = "Too many login attempts") -> HTTPException:
+    """429 response carrying a Retry-After header in whole seconds"""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+class LoginAdmission:
+    """
+    Admission control in front of password verification.
+
+    Requests are rejected before any DB lookup or bcrypt work when the
+    client IP or target account is over its token bucket, and bcrypt runs
+    only while a slot in the global verification cap is free.
+    """
+
+    def __init__(self):
+        self.ip_limiter = KeyedRateLimiter(LOGIN_IP_BURST, LOGIN_IP_RATE_PER_MINUTE)
+        self.email_limiter = KeyedRateLimiter(LOGIN_EMAIL_BURST, LOGIN_EMAIL_RATE_PER_MINUTE)
+        self.unknown_emails = NegativeCache(LOGIN_UNKNOWN_EMAIL_TTL)
+        self._verification_slots = threading.BoundedSemaphore(LOGIN_MAX_CONCURRENT_VERIFICATIONS)
+
+    @staticmethod
+    def client_ip(request: Request) -> str:
+        """Best-effort client IP, honouring X-Forwarded-For only when configured to"""
+        if LOGIN_TRUST_FORWARDED_FOR:
+            forwarded = request.headers.get("x-forwarded-for")
+            if forwarded:
+                return forwarded.split(",")[0].strip()
+        return request.client.host if request.client else "unknown"
+
+    @staticmethod
+    def normalize_email(email: str) -> str:
+        return email.strip().lower()
+
+    def admit(self, ip: str, email: str):
+        """Raise 429 if the IP or account bucket is exhausted"""
+        retry_after = self.ip_limiter.hit(ip)
+        if retry_after:
+            raise too_many_requests(retry_after)
+
+        retry_after = self.email_limiter.hit(self.normalize_email(email))
+        if retry_after:
+            raise too_many_requests(retry_after)
+
+    # Email lookups are exact-match, so the negative cache is keyed by the raw email
+    def is_known_unknown(self, email: str) -> bool:
+        return email in self.unknown_emails
+
+    def remember_unknown(self, email: str):
+        self.unknown_emails.add(email)
+
+    def forget_unknown(self, email: str):
+        self.unknown_emails.discard(email)
+
+    def on_event(self, event: dict):
+        """Event bus listener: a new account can log in straight away on every worker"""
+        if event.get("entity") == "user" and event.get("action") == "created" and event.get("email"):
+            self.forget_unknown(event["email"])
+
+    def acquire_verification_slot(self) -> bool:
+        return self._verification_slots.acquire(blocking=False)
+
+    def release_verification_slot(self):
+        self._verification_slots.release()
+
+# Process-wide admission controller used by the login route
+login_admission = LoginAdmission()
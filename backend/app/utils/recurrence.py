@@ -0,0 +1,242 @@
+import asyncio
+import calendar
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models.client import Client
+from app.models.task import Task, TaskStatus, RecurringTaskTemplate
+from app.utils.audit import record_change
+from app.utils.events import event_bus
+from app.utils.scheduler import as_utc_naive
+from app.utils.versioning import bump_client_version
+
+# Generation configuration
+RECURRING_TASK_LOOKAHEAD_DAYS = int(os.getenv("RECURRING_TASK_LOOKAHEAD_DAYS", "45"))
+RECURRING_TASK_INTERVAL_HOURS = float(os.getenv("RECURRING_TASK_INTERVAL_HOURS", "6"))
+RECURRING_TASK_BATCH_SIZE = int(os.getenv("RECURRING_TASK_BATCH_SIZE", "1000"))
+MAX_PERIODS = 10000
+
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+
+def parse_rrule(rule: str) -> Dict:
+    """
+    Parse the supported RRULE subset, e.g. "FREQ=MONTHLY;INTERVAL=3;BYMONTHDAY=-1".
+
+    Raises ValueError for anything outside FREQ, INTERVAL, COUNT, UNTIL,
+    BYMONTH and BYMONTHDAY.
+    """
+    rule = rule.strip()
+    if rule.upper().startswith("RRULE:"):
+        rule = rule[len("RRULE:"):]
+
+    parts = {}
+    for item in rule.split(";"):
+        if not item:
+            continue
+        if "=" not in item:
+            raise ValueError(f"Malformed RRULE component: {item}")
+        key, value = item.split("=", 1)
+        parts[key.strip().upper()] = value.strip()
+
+    freq = parts.pop("FREQ", "").upper()
+    if freq not in FREQUENCIES:
+        raise ValueError(f"FREQ must be one of {', '.join(FREQUENCIES)}")
+
+    parsed = {"freq": freq, "interval": 1, "count": None, "until": None, "bymonth": [], "bymonthday": []}
+    try:
+        if "INTERVAL" in parts:
+            parsed["interval"] = int(parts.pop("INTERVAL"))
+        if "COUNT" in parts:
+            parsed["count"] = int(parts.pop("COUNT"))
+        if "UNTIL" in parts:
+            until = parts.pop("UNTIL").rstrip("Z")
+            parsed["until"] = datetime.strptime(until, "%Y%m%dT%H%M%S" if "T" in until else "%Y%m%d")
+        if "BYMONTH" in parts:
+            parsed["bymonth"] = sorted(int(m) for m in parts.pop("BYMONTH").split(","))
+        if "BYMONTHDAY" in parts:
+            parsed["bymonthday"] = [int(d) for d in parts.pop("BYMONTHDAY").split(",")]
+    except ValueError:
+        raise ValueError(f"Invalid RRULE value in: {rule}")
+
+    if parts:
+        raise ValueError(f"Unsupported RRULE components: {', '.join(sorted(parts))}")
+    if parsed["interval"] < 1 or (parsed["count"] is not None and parsed["count"] < 1):
+        raise ValueError("INTERVAL and COUNT must be positive")
+    if any(not 1 <= m <= 12 for m in parsed["bymonth"]):
+        raise ValueError("BYMONTH values must be between 1 and 12")
+    if any(d == 0 or not -31 <= d <= 31 for d in parsed["bymonthday"]):
+        raise ValueError("BYMONTHDAY values must be between -31 and 31, excluding 0")
+    return parsed
+
+def _month_days(year: int, month: int, bymonthday: List[int], default_day: int) -> List[int]:
+    last = calendar.monthrange(year, month)[1]
+    days = set()
+    for day in bymonthday or [default_day]:
+        resolved = last + day + 1 if day < 0 else day
+        if 1 <= resolved <= last:  # Skip days the month doesn't have, per RFC 5545
+            days.add(resolved)
+    return sorted(days)
+
+def _periods(rule: Dict, dtstart: datetime, skip_to: Optional[datetime]) -> Iterator[datetime]:
+    """Candidate occurrences in chronological order, starting at dtstart"""
+    at_time = dict(hour=dtstart.hour, minute=dtstart.minute, second=dtstart.second, microsecond=dtstart.microsecond)
+    interval = rule["interval"]
+
+    if rule["freq"] in ("DAILY", "WEEKLY"):
+        step = timedelta(days=interval * (7 if rule["freq"] == "WEEKLY" else 1))
+        first = 0
+        if skip_to is not None and rule["count"] is None and skip_to > dtstart:
+            first = (skip_to - dtstart) // step  # Jump straight to the window
+        for k in range(first, first + MAX_PERIODS):
+            yield dtstart + k * step
+        return
+
+    for k in range(MAX_PERIODS):
+        if rule["freq"] == "MONTHLY":
+            month_index = dtstart.month - 1 + k * interval
+            year, months = dtstart.year + month_index // 12, [month_index % 12 + 1]
+            if rule["bymonth"] and months[0] not in rule["bymonth"]:
+                continue
+        else:
+            year, months = dtstart.year + k * interval, rule["bymonth"] or [dtstart.month]
+        if year > datetime.max.year - 1:
+            return
+        for month in months:
+            for day in _month_days(year, month, rule["bymonthday"], dtstart.day):
+                yield datetime(year, month, day, **at_time)
+
+def occurrences(rule_text: str, dtstart: datetime, window_start: datetime, window_end: datetime) -> List[datetime]:
+    """Occurrences of a rule that fall in [window_start, window_end)"""
+    rule = parse_rrule(rule_text)
+    dtstart = as_utc_naive(dtstart)
+    results = []
+    seen = 0
+    for candidate in _periods(rule, dtstart, window_start):
+        if candidate < dtstart:
+            continue
+        if rule["until"] is not None and candidate > rule["until"]:
+            break
+        seen += 1
+        if rule["count"] is not None and seen > rule["count"]:
+            break
+        if candidate >= window_end:
+            break
+        if candidate >= window_start:
+            results.append(candidate)
+    return results
+
+def target_client_ids(db: Session, template: RecurringTaskTemplate) -> List[int]:
+    """Active clients a template applies to"""
+    query = db.query(Client.id).filter(Client.is_active == True)
+    if template.target_client_ids:
+        query = query.filter(Client.id.in_(template.target_client_ids))
+    elif template.target_industry:
+        query = query.filter(Client.industry == template.target_industry)
+    return [row.id for row in query.all()]
+
+def materialize_template(db: Session, template: RecurringTaskTemplate, now: datetime,
+                         lookahead_days: int = RECURRING_TASK_LOOKAHEAD_DAYS) -> List:
+    """
+    Insert missing occurrences of one template up to now + lookahead.
+
+    The whole window from now is considered on every run, so a client that
+    was created or became a target since the last run gets its upcoming
+    occurrences straight away. Up to generated_until (the high-water mark of
+    earlier runs), only clients with no upcoming occurrence of the template
+    are filled in; others already got theirs, possibly since rescheduled.
+    (client, due date) pairs that exist are skipped and the rest are
+    inserted in batches. A template's first run also covers occurrences
+    since it was created, so one starting "now" gets its first task.
+    Returns the inserted (id, client_id, due_date) rows; the caller commits.
+    """
+    window_start = now
+    if template.generated_until is None and template.created_at is not None:
+        window_start = min(now, as_utc_naive(template.created_at))
+    window_end = now + timedelta(days=lookahead_days)
+    covered_until = as_utc_naive(template.generated_until) or now
+
+    due_dates = occurrences(template.recurrence_rule, template.starts_at, window_start, window_end)
+    client_ids = target_client_ids(db, template) if due_dates else []
+
+    created = []
+    if due_dates and client_ids:
+        existing = set()
+        covered_clients = set()
+        for row in db.query(Task.client_id, Task.due_date).filter(
+            Task.template_id == template.id,
+            Task.due_date >= window_start
+        ):
+            existing.add((row.client_id, as_utc_naive(row.due_date)))
+            covered_clients.add(row.client_id)
+        rows = [
+            {
+                "title": template.title,
+                "description": template.description,
+                "task_type": template.task_type,
+                "status": TaskStatus.PENDING,
+                "priority": template.priority,
+                "due_date": due_date,
+                "client_id": client_id,
+                "created_by_id": template.created_by_id,
+                "template_id": template.id,
+                "is_active": True,
+            }
+            for due_date in due_dates
+            for client_id in client_ids
+            if (client_id, due_date) not in existing
+            and (due_date >= covered_until or client_id not in covered_clients)
+        ]
+        statement = insert(Task).returning(Task.id, Task.client_id, Task.due_date)
+        for start in range(0, len(rows), RECURRING_TASK_BATCH_SIZE):
+            created.extend(db.execute(statement, rows[start:start + RECURRING_TASK_BATCH_SIZE]).all())
+
+    template.generated_until = max(covered_until, window_end)
+    return created
+
+def materialize_recurring_tasks(db: Session, template_ids: Optional[List[int]] = None,
+                                lookahead_days: int = RECURRING_TASK_LOOKAHEAD_DAYS) -> int:
+    """Generate upcoming occurrences for active templates; safe to re-run"""
+    now = datetime.utcnow()
+    query = db.query(RecurringTaskTemplate).filter(RecurringTaskTemplate.is_active == True)
+    if template_ids:
+        query = query.filter(RecurringTaskTemplate.id.in_(template_ids))
+
+    total = 0
+    for template in query.all():
+        try:
+            created = materialize_template(db, template, now, lookahead_days)
+            for row in created:
+                record_change(db, "task", row.id, "created", row.client_id, {"template_id": [None, template.id]})
+            bump_client_version(db, [row.client_id for row in created])
+            db.commit()
+        except IntegrityError:
+            # Another worker generated the same occurrences concurrently
+            db.rollback()
+            continue
+
+        total += len(created)
+        for row in created:
+            event_bus.publish("task", "created", row.id, row.client_id,
+                              due_date=row.due_date, status=TaskStatus.PENDING.value)
+    return total
+
+async def run_recurring_task_generator():
+    """Background loop materializing occurrences every RECURRING_TASK_INTERVAL_HOURS"""
+    loop = asyncio.get_running_loop()
+
+    def generate():
+        with SessionLocal() as db:
+            return materialize_recurring_tasks(db)
+
+    while True:
+        try:
+            created = await loop.run_in_executor(None, generate)
+            if created:
+                print(f"Generated {created} recurring task occurrences")
+        except Exception as e:
+            print(f"Recurring task generation failed: {e}")
+        await asyncio.sleep(RECURRING_TASK_INTERVAL_HOURS * 3600)
@@ -0,0 +1,302 @@
+import asyncio
+import os
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, Tuple
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models.client import Client
+from app.models.document import Document, DocumentAssignment
+from app.models.report import ComplianceReport
+from app.models.task import Task, TaskStatus, ClientInquiry
+from app.models.user import User  # noqa: F401  (pool processes need every mapper the relationships name)
+from app.utils.events import event_bus
+from app.utils.scheduler import OPEN_STATUSES
+from app.utils.storage import get_storage
+
+# Report generation configuration
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", "2"))  # Processes per app worker
+REPORT_POLL_SECONDS = float(os.getenv("REPORT_POLL_SECONDS", "5"))  # Picks up reports queued by peers
+REPORT_TIMEOUT_SECONDS = float(os.getenv("REPORT_TIMEOUT_SECONDS", "600"))  # Running longer means its worker died
+REPORT_MAX_ATTEMPTS = int(os.getenv("REPORT_MAX_ATTEMPTS", "3"))
+REPORT_FETCH_SIZE = int(os.getenv("REPORT_FETCH_SIZE", "500"))  # Rows per round trip while streaming
+REPORT_TEMPLATES_DIR = os.getenv("REPORT_TEMPLATES_DIR", "frontend/templates/reports")
+REPORT_STORAGE_PREFIX = os.getenv("REPORT_STORAGE_PREFIX", "uploads/reports")
+
+FORMATS = {
+    "html": ("compliance_report.html", "text/html"),
+    "pdf": ("compliance_report.txt", "application/pdf"),
+}
+QUEUED, RUNNING, READY, FAILED = "queued", "running", "ready", "failed"
+PENDING_STATUSES = (QUEUED, RUNNING)
+
+def media_type(report_format: str) -> str:
+    return FORMATS[report_format][1]
+
+def request_report(db: Session, client_id: int, report_format: str, user_id: int) -> ComplianceReport:
+    """
+    The report of the client's current data, queued if it doesn't exist yet; commits.
+
+    Reports are keyed by the client's data version, so asking again before
+    anything changed returns the same (possibly still running) report. A
+    failed one is queued again. Raises LookupError for an unknown client.
+    """
+    versions = db.query(Client.data_version, Client.version).filter(Client.id == client_id).first()
+    if versions is None:
+        raise LookupError("Client not found")
+
+    snapshot = (
+        ComplianceReport.client_id == client_id,
+        ComplianceReport.format == report_format,
+        ComplianceReport.data_version == versions.data_version,
+        ComplianceReport.client_version == versions.version,
+    )
+    report = db.query(ComplianceReport).filter(*snapshot).first()
+    if report is None:
+        report = ComplianceReport(
+            client_id=client_id,
+            format=report_format,
+            data_version=versions.data_version,
+            client_version=versions.version,
+            status=QUEUED,
+            requested_by_id=user_id
+        )
+        db.add(report)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Requested concurrently by someone else
+            db.rollback()
+            return db.query(ComplianceReport).filter(*snapshot).one()
+    elif report.status == FAILED:
+        report.status, report.error, report.attempts = QUEUED, None, 0
+        db.commit()
+    else:
+        return report
+
+    report_worker.wake()
+    return report
+
+def claim_reports(db: Session, limit: int) -> List[int]:
+    """Mark up to `limit` queued reports as running for this worker; commits"""
+    now = datetime.utcnow()
+
+    # Reports whose worker died mid-run go back to the queue (or fail for good)
+    stalled = (ComplianceReport.status == RUNNING,
+               ComplianceReport.started_at < now - timedelta(seconds=REPORT_TIMEOUT_SECONDS))
+    db.query(ComplianceReport).filter(*stalled, ComplianceReport.attempts >= REPORT_MAX_ATTEMPTS).update(
+        {ComplianceReport.status: FAILED, ComplianceReport.error: "Generation timed out"}, synchronize_session=False
+    )
+    db.query(ComplianceReport).filter(*stalled).update({ComplianceReport.status: QUEUED}, synchronize_session=False)
+    db.commit()
+
+    claimed = []
+    candidates = db.query(ComplianceReport.id).filter(
+        ComplianceReport.status == QUEUED
+    ).order_by(ComplianceReport.created_at).limit(limit).all()
+    for candidate in candidates:
+        # Conditional update: another worker may take it first
+        taken = db.query(ComplianceReport).filter(
+            ComplianceReport.id == candidate.id,
+            ComplianceReport.status == QUEUED
+        ).update({
+            ComplianceReport.status: RUNNING,
+            ComplianceReport.started_at: now,
+            ComplianceReport.attempts: ComplianceReport.attempts + 1,
+        }, synchronize_session=False)
+        if taken:
+            claimed.append(candidate.id)
+    db.commit()
+    return claimed
+
+def _stream(query) -> Iterator:
+    """Rows REPORT_FETCH_SIZE at a time (a server-side cursor where supported), queried on first use"""
+    yield from query.yield_per(REPORT_FETCH_SIZE)
+
+def _render(db: Session, report: ComplianceReport, client: Client, output) -> None:
+    template_name = FORMATS[report.format][0]
+    environment = Environment(
+        loader=FileSystemLoader(REPORT_TEMPLATES_DIR),
+        autoescape=select_autoescape(["html"]),
+        trim_blocks=True,
+        lstrip_blocks=True
+    )
+    now = datetime.utcnow()
+    task_counts = dict(db.query(Task.status, func.count(Task.id)).filter(
+        Task.client_id == client.id, Task.is_active == True
+    ).group_by(Task.status).all())
+    summary = {
+        "open_tasks": sum(task_counts.get(status, 0) for status in OPEN_STATUSES),
+        "completed_tasks": task_counts.get(TaskStatus.COMPLETED, 0),
+        "overdue_tasks": db.query(func.count(Task.id)).filter(
+            Task.client_id == client.id, Task.is_active == True,
+            Task.status.in_(OPEN_STATUSES), Task.due_date < now
+        ).scalar(),
+        "inquiries": db.query(func.count(ClientInquiry.id)).filter(ClientInquiry.client_id == client.id).scalar(),
+    }
+
+    context = {
+        "client": client,
+        "report": report,
+        "generated_at": now,
+        "summary": summary,
+        "documents": _stream(db.query(DocumentAssignment, Document).join(
+            Document, Document.id == DocumentAssignment.document_id
+        ).filter(
+            DocumentAssignment.client_id == client.id,
+            DocumentAssignment.is_active == True,
+            Document.is_active == True
+        ).order_by(DocumentAssignment.assigned_at, DocumentAssignment.id)),
+        "tasks": _stream(db.query(Task).filter(
+            Task.client_id == client.id, Task.is_active == True
+        ).order_by(Task.created_at, Task.id)),
+        "inquiries": _stream(db.query(ClientInquiry).filter(
+            ClientInquiry.client_id == client.id
+        ).order_by(ClientInquiry.created_at, ClientInquiry.id)),
+    }
+
+    chunks = environment.get_template(template_name).generate(**context)
+    if report.format == "pdf":
+        from app.utils.pdf import TextPDFWriter
+        writer = TextPDFWriter(output, title=f"{client.company_name} compliance report")
+        for chunk in chunks:
+            writer.write(chunk)
+        writer.close()
+    else:
+        for chunk in chunks:
+            output.write(chunk.encode("utf-8"))
+
+def generate_report(report_id: int) -> Tuple[str, int]:
+    """
+    Build one claimed report and store it; runs in a pool process.
+
+    Rows are streamed into the template, which is streamed to a staged
+    file, so memory stays flat however long the client's history is.
+    Older snapshots of the same client and format are removed once the new
+    one is ready. Returns (status, client_id).
+    """
+    with SessionLocal() as db:
+        report = db.query(ComplianceReport).filter(ComplianceReport.id == report_id).one()
+        staged = None
+        try:
+            client = db.query(Client).filter(Client.id == report.client_id).one()
+            handle, staged = tempfile.mkstemp(prefix="report-", suffix=f".{report.format}")
+            with os.fdopen(handle, "wb") as output:
+                _render(db, report, client, output)
+            size = os.path.getsize(staged)
+            key = f"{REPORT_STORAGE_PREFIX}/{client.id}-{uuid.uuid4().hex}.{report.format}"
+            get_storage().put(staged, key)
+            staged = None
+
+            superseded = db.query(ComplianceReport).filter(
+                ComplianceReport.client_id == report.client_id,
+                ComplianceReport.format == report.format,
+                ComplianceReport.id != report.id,
+                ComplianceReport.status.in_([READY, FAILED])
+            ).all()
+            report.status, report.file_path, report.file_size = READY, key, size
+            report.completed_at = datetime.utcnow()
+            for old in superseded:
+                db.delete(old)
+            db.commit()
+            for old in superseded:
+                if old.file_path:
+                    get_storage().delete(old.file_path)
+        except Exception as e:
+            db.rollback()
+            report.status, report.error, report.completed_at = FAILED, str(e)[:1000], datetime.utcnow()
+            db.commit()
+        finally:
+            if staged is not None and os.path.exists(staged):
+                os.remove(staged)
+        return report.status, report.client_id
+
+def _mark_failed(report_id: int, error: str) -> Optional[int]:
+    with SessionLocal() as db:
+        report = db.query(ComplianceReport).filter(ComplianceReport.id == report_id).first()
+        if report is None:
+            return None
+        report.status, report.error, report.completed_at = FAILED, error, datetime.utcnow()
+        db.commit()
+        return report.client_id
+
+class ReportWorker:
+    """
+    Per-app-worker dispatcher feeding queued reports to a process pool.
+
+    Any app worker may pick up any queued report (claims are conditional
+    updates), so the queue drains even if the worker that took the request
+    goes away. Rendering runs in separate processes to keep the event loop
+    and request threads free. Publishes a "report" event when one finishes.
+    """
+
+    def __init__(self, processes: int = REPORT_WORKERS):
+        self.processes = processes
+        self._pool = None  # ProcessPoolExecutor, created when the worker starts
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._running = set()
+
+    def _new_pool(self):
+        # Imported here so app workers only load process pool machinery once the report worker starts
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        # Spawned, not forked: the parent has live threads and pooled connections
+        return ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context("spawn"))
+
+    def wake(self):
+        """Look for queued reports now (safe from any thread)"""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._pool = self._new_pool()
+
+        def claim(limit: int) -> List[int]:
+            with SessionLocal() as db:
+                return claim_reports(db, limit)
+
+        while True:
+            self._wakeup.clear()
+            free = self.processes - len(self._running)
+            if free > 0:
+                try:
+                    for report_id in await self._loop.run_in_executor(None, claim, free):
+                        job = asyncio.create_task(self._generate(report_id))
+                        self._running.add(job)
+                        job.add_done_callback(self._running.discard)
+                except Exception as e:
+                    print(f"Report dispatch failed: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), REPORT_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _generate(self, report_id: int):
+        try:
+            status, client_id = await asyncio.wrap_future(self._pool.submit(generate_report, report_id))
+        except Exception as e:
+            from concurrent.futures.process import BrokenProcessPool
+            if isinstance(e, BrokenProcessPool):
+                # A pool process died (e.g. out of memory); later reports get a fresh pool
+                self._pool.shutdown(wait=False)
+                self._pool = self._new_pool()
+            status = FAILED
+            client_id = await self._loop.run_in_executor(None, _mark_failed, report_id, f"Report worker failed: {e}")
+        event_bus.publish("report", status, report_id, client_id)
+        self._running.discard(asyncio.current_task())
+        self._wakeup.set()
+
+    def stop(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+# Process-wide report dispatcher
+report_worker = ReportWorker()
@@ -0,0 +1,326 @@
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import chain
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.database import DATABASE_URL, REPLICA_MAX_LAG_SECONDS, SessionLocal
+from app.models.client import Client
+from app.models.document import Document, DocumentAssignment
+from app.models.user import User
+
+# Admin list response cache configuration
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "sqlite").lower()  # sqlite, memory or off
+RESPONSE_CACHE_PATH = os.getenv(
+    "RESPONSE_CACHE_PATH",
+    os.path.join(
+        tempfile.gettempdir(),
+        f"hrcompliance-response-cache-{hashlib.sha1(DATABASE_URL.encode()).hexdigest()[:12]}.db"
+    )
+)
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+
+# Tables whose writes bump a generation; cached responses may only depend on these
+CACHED_TABLES = {model.__tablename__ for model in (Client, User, Document, DocumentAssignment)}
+TABLES_KEY = "response_cache_tables"
+# Execution option for writes no cached response shows (e.g. client data version bumps)
+SKIP_OPTION = "skip_response_cache"
+
+Generations = Dict[str, Tuple[int, float]]  # table -> (generation, wall time of the last bump)
+
+class MemoryResponseBackend:
+    """Per-process LRU; only consistent with a single worker"""
+    name = "memory"
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._bytes = 0
+        self._generations: Generations = {}
+        self._lock = threading.Lock()
+
+    def generations(self, tables: Iterable[str]) -> Generations:
+        with self._lock:
+            return {table: self._generations.get(table, (0, 0.0)) for table in tables}
+
+    def bump(self, tables: Iterable[str]):
+        now = time.time()
+        with self._lock:
+            for table in tables:
+                self._generations[table] = (self._generations.get(table, (0, 0.0))[0] + 1, now)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: str, body: bytes):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (body, time.monotonic() + self.ttl)
+            self._bytes += len(body)
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str):
+        body, _ = self._entries.pop(key)
+        self._bytes -= len(body)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes}
+
+class SQLiteResponseBackend:
+    """
+    Entries and generations in a SQLite file on local disk, shared by every
+    uvicorn worker on the host.
+
+    A write in one worker bumps the generation every other worker reads
+    before its next lookup, so there is nothing to fan out. Eviction is
+    least recently used, by entry count and total bytes.
+    """
+    name = "sqlite"
+
+    def __init__(self, path: str, max_entries: int, max_bytes: int, ttl: float):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS generations "
+                "(name TEXT PRIMARY KEY, value INTEGER NOT NULL, bumped_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, body BLOB NOT NULL, "
+                "size INTEGER NOT NULL, expires_at REAL NOT NULL, used_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS ix_entries_used_at ON entries (used_at)")
+            self._local.connection = connection
+        return connection
+
+    def generations(self, tables: Iterable[str]) -> Generations:
+        tables = list(tables)
+        rows = self._connection().execute(
+            f"SELECT name, value, bumped_at FROM generations WHERE name IN ({','.join('?' * len(tables))})",
+            tables
+        ).fetchall()
+        found = {name: (value, bumped_at) for name, value, bumped_at in rows}
+        return {table: found.get(table, (0, 0.0)) for table in tables}
+
+    def bump(self, tables: Iterable[str]):
+        now = time.time()
+        self._connection().executemany(
+            "INSERT INTO generations (name, value, bumped_at) VALUES (?, 1, ?) "
+            "ON CONFLICT (name) DO UPDATE SET value = value + 1, bumped_at = excluded.bumped_at",
+            [(table, now) for table in tables]
+        )
+
+    def get(self, key: str) -> Optional[bytes]:
+        connection = self._connection()
+        now = time.time()
+        row = connection.execute("SELECT body, expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] < now:
+            return None
+        connection.execute("UPDATE entries SET used_at = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def put(self, key: str, body: bytes):
+        connection = self._connection()
+        now = time.time()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (key, body, size, expires_at, used_at) VALUES (?, ?, ?, ?, ?)",
+                (key, body, len(body), now + self.ttl, now)
+            )
+            connection.execute("DELETE FROM entries WHERE expires_at < ?", (now,))
+            count, total = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            if count > self.max_entries or total > self.max_bytes:
+                excess = count - self.max_entries
+                for oldest_key, size in connection.execute("SELECT key, size FROM entries ORDER BY used_at").fetchall():
+                    if excess <= 0 and total <= self.max_bytes:
+                        break
+                    connection.execute("DELETE FROM entries WHERE key = ?", (oldest_key,))
+                    excess -= 1
+                    total -= size
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+    def stats(self) -> Dict:
+        count, total = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        return {"entries": count, "bytes": total}
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema) -> TypeAdapter:
+    return TypeAdapter(List[schema])
+
+class ResponseCache:
+    """
+    Serialized JSON of admin list queries, keyed by route, normalized query
+    parameters and the generations of the tables the response reads.
+
+    Every commit that touches a cached table bumps its generation (see the
+    session listeners below), which moves later lookups to a new key; stale
+    entries age out of the LRU. A backend failure falls back to running
+    the query.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @staticmethod
+    def key(route: str, params: Dict, generations: Generations) -> str:
+        query = urlencode(sorted((name, value) for name, value in params.items() if value is not None))
+        tags = ",".join(f"{table}:{generations[table][0]}" for table in sorted(generations))
+        return f"{route}?{query}|{tags}"
+
+    def respond(self, db: Session, route: str, params: Dict, schema, load: Callable[[], Sequence],
+                models: Iterable) -> Response:
+        """JSON list response for load() rendered with schema, from the cache when current"""
+        if self.backend is None:
+            return self._response(self._serialize(schema, load()), None)
+
+        tables = [model.__tablename__ for model in models]
+        key = None
+        body = None
+        try:
+            generations = self.backend.generations(tables)
+            key = self.key(route, params, generations)
+            body = self.backend.get(key)
+        except Exception as e:
+            self._failed("lookup", e)
+        if body is not None:
+            self.hits += 1
+            return self._response(body, "HIT")
+
+        self.misses += 1
+        body = self._serialize(schema, load())
+        if key is not None and self._storable(db, generations):
+            try:
+                self.backend.put(key, body)
+            except Exception as e:
+                self._failed("store", e)
+        return self._response(body, "MISS")
+
+    def _storable(self, db: Session, generations: Generations) -> bool:
+        """A lagging replica may not have the last bumped write yet"""
+        if not db.info.get("replica"):
+            return True
+        last_bump = max(bumped_at for _, bumped_at in generations.values())
+        return last_bump < time.time() - REPLICA_MAX_LAG_SECONDS
+
+    def _serialize(self, schema, rows: Sequence) -> bytes:
+        adapter = _list_adapter(schema)
+        return adapter.dump_json(adapter.validate_python(list(rows), from_attributes=True))
+
+    def _response(self, body: bytes, status: Optional[str]) -> Response:
+        headers = {"X-Cache": status} if status else None
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def _failed(self, operation: str, error: Exception):
+        self.errors += 1
+        print(f"Response cache {operation} failed: {error}")
+
+    def invalidate(self, tables: Iterable[str] = CACHED_TABLES):
+        if self.backend is None:
+            return
+        try:
+            self.backend.bump(sorted(tables))
+        except Exception as e:
+            self._failed("invalidation", e)
+
+    def stats(self) -> Dict:
+        if self.backend is None:
+            return {"backend": "off"}
+        lookups = self.hits + self.misses
+        stats = {
+            "backend": self.backend.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "errors": self.errors,
+        }
+        try:
+            stats.update(self.backend.stats())
+        except Exception as e:
+            self._failed("stats", e)
+        return stats
+
+def create_backend():
+    if RESPONSE_CACHE_BACKEND == "off":
+        return None
+    if RESPONSE_CACHE_BACKEND == "memory":
+        return MemoryResponseBackend(RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_TTL_SECONDS)
+    if RESPONSE_CACHE_BACKEND == "sqlite":
+        return SQLiteResponseBackend(RESPONSE_CACHE_PATH, RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_MAX_BYTES,
+                                     RESPONSE_CACHE_TTL_SECONDS)
+    raise RuntimeError(f"Unknown RESPONSE_CACHE_BACKEND '{RESPONSE_CACHE_BACKEND}'")
+
+# Process-wide admin list response cache
+response_cache = ResponseCache(create_backend())
+
+# Generation bumps: tables written in a transaction are invalidated once it commits
+@event.listens_for(SessionLocal, "after_flush")
+def _note_flushed_tables(session, flush_context):
+    tables = session.info.setdefault(TABLES_KEY, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table in CACHED_TABLES:
+            tables.add(table)
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _note_statement_tables(orm_execute_state):
+    """Bulk INSERT/UPDATE/DELETE statements bypass the flush"""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    if orm_execute_state.execution_options.get(SKIP_OPTION):
+        return
+    table = getattr(getattr(orm_execute_state.statement, "table", None), "name", None)
+    if table in CACHED_TABLES:
+        orm_execute_state.session.info.setdefault(TABLES_KEY, set()).add(table)
+
+@event.listens_for(SessionLocal, "after_commit")
+def _bump_committed_tables(session):
+    tables = session.info.pop(TABLES_KEY, None)
+    if tables:
+        response_cache.invalidate(tables)
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_rolled_back_tables(session):
+    session.info.pop(TABLES_KEY, None)
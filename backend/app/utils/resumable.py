@@ -0,0 +1,298 @@
+import asyncio
+import hashlib
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import AsyncIterator, List, Optional
+from sqlalchemy.orm import Session
+from starlette.requests import ClientDisconnect
+from app.database import SessionLocal
+from app.models.document import Document, UploadSession
+from app.utils.document_store import add_document_version, create_document
+from app.utils.file_handler import UPLOAD_DIR, delete_file, generate_unique_filename
+
+# Resumable upload configuration
+RESUMABLE_MAX_FILE_SIZE = int(os.getenv("RESUMABLE_MAX_FILE_SIZE", str(1024 * 1024 * 1024)))  # 1GB
+RESUMABLE_UPLOAD_TTL_HOURS = float(os.getenv("RESUMABLE_UPLOAD_TTL_HOURS", "24"))
+RESUMABLE_CLEANUP_INTERVAL_MINUTES = float(os.getenv("RESUMABLE_CLEANUP_INTERVAL_MINUTES", "60"))
+RESUMABLE_MAX_TRACKED_HASHERS = int(os.getenv("RESUMABLE_MAX_TRACKED_HASHERS", "256"))
+PARTIAL_UPLOAD_DIR = os.path.join(UPLOAD_DIR, "partial")
+HASH_READ_SIZE = 1024 * 1024
+MAX_RANGE_RETRIES = 20
+
+def merge_ranges(ranges: List[List[int]], start: int, end: int) -> List[List[int]]:
+    """Add [start, end) to sorted, non-overlapping ranges, merging neighbours"""
+    merged = []
+    for range_start, range_end in sorted(ranges + [[start, end]]):
+        if merged and range_start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], range_end)
+        else:
+            merged.append([range_start, range_end])
+    return merged
+
+def contiguous_offset(ranges: List[List[int]]) -> int:
+    """Length of the gap-free prefix, i.e. the tus Upload-Offset"""
+    return ranges[0][1] if ranges and ranges[0][0] == 0 else 0
+
+def format_ranges(ranges: List[List[int]]) -> str:
+    return ",".join(f"{start}-{end - 1}" for start, end in ranges)
+
+class PrefixHasher:
+    """SHA-256 of an upload's gap-free prefix, advanced as chunks land"""
+
+    def __init__(self):
+        self.digest = hashlib.sha256()
+        self.offset = 0
+        self.lock = threading.Lock()
+
+    def catch_up(self, path: str, prefix_end: int):
+        """Hash bytes that arrived out of order and are now part of the prefix"""
+        with self.lock:
+            if self.offset >= prefix_end:
+                return
+            with open(path, "rb") as source:
+                source.seek(self.offset)
+                while self.offset < prefix_end:
+                    block = source.read(min(HASH_READ_SIZE, prefix_end - self.offset))
+                    if not block:
+                        break
+                    self.digest.update(block)
+                    self.offset += len(block)
+
+class PrefixHasherRegistry:
+    """
+    Per-process hashers for active uploads, least recently used evicted.
+
+    Chunks that arrive in order are hashed while they stream in, so the
+    digest is ready the moment the last byte lands. Uploads whose hasher
+    lives in another worker (or was evicted) are hashed from disk once at
+    completion instead.
+    """
+
+    def __init__(self, capacity: int = RESUMABLE_MAX_TRACKED_HASHERS):
+        self.capacity = capacity
+        self._hashers: "OrderedDict[str, PrefixHasher]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, upload_id: str, create: bool = False) -> Optional[PrefixHasher]:
+        with self._lock:
+            hasher = self._hashers.get(upload_id)
+            if hasher is None and create:
+                hasher = self._hashers[upload_id] = PrefixHasher()
+                while len(self._hashers) > self.capacity:
+                    self._hashers.popitem(last=False)
+            if hasher is not None:
+                self._hashers.move_to_end(upload_id)
+            return hasher
+
+    def discard(self, upload_id: str):
+        with self._lock:
+            self._hashers.pop(upload_id, None)
+
+# Process-wide prefix hashers
+prefix_hashers = PrefixHasherRegistry()
+
+def create_upload_session(db: Session, created_by_id: int, original_filename: str, mime_type: str,
+                          upload_length: int, description: Optional[str] = None, document_type: str = "general",
+                          document_id: Optional[int] = None, change_note: Optional[str] = None) -> UploadSession:
+    """Register an upload and preallocate its (sparse) target file"""
+    os.makedirs(PARTIAL_UPLOAD_DIR, exist_ok=True)
+    upload_id = str(uuid.uuid4())
+    storage_path = os.path.join(PARTIAL_UPLOAD_DIR, f"{upload_id}.part")
+    with open(storage_path, "wb") as target:
+        target.truncate(upload_length)
+
+    upload = UploadSession(
+        id=upload_id,
+        original_filename=original_filename,
+        mime_type=mime_type,
+        upload_length=upload_length,
+        storage_path=storage_path,
+        received_ranges=[],
+        document_id=document_id,
+        description=description,
+        document_type=document_type,
+        change_note=change_note,
+        created_by_id=created_by_id,
+        expires_at=datetime.utcnow() + timedelta(hours=RESUMABLE_UPLOAD_TTL_HOURS)
+    )
+    db.add(upload)
+    db.commit()
+    db.refresh(upload)
+    prefix_hashers.get(upload_id, create=True)
+    return upload
+
+async def write_chunk(upload_id: str, storage_path: str, offset: int, upload_length: int,
+                      chunks: AsyncIterator[bytes]) -> int:
+    """
+    Write a request body into the upload file at offset; returns bytes written.
+
+    Writes are positional, so chunks for different ranges can arrive in
+    parallel. A client that disconnects keeps what arrived. Raises
+    ValueError if the body runs past the upload length.
+    """
+    hasher = prefix_hashers.get(upload_id)
+    hashing = hasher is not None and hasher.lock.acquire(blocking=False)
+    if hashing and hasher.offset != offset:
+        hasher.lock.release()
+        hashing = False
+
+    written = 0
+    descriptor = os.open(storage_path, os.O_WRONLY)
+    try:
+        async for chunk in chunks:
+            if offset + written + len(chunk) > upload_length:
+                # Bytes already hashed may not be what the client meant to send
+                if hashing:
+                    prefix_hashers.discard(upload_id)
+                raise ValueError("Chunk exceeds Upload-Length")
+            os.pwrite(descriptor, chunk, offset + written)
+            written += len(chunk)
+            if hashing:
+                hasher.digest.update(chunk)
+    except ClientDisconnect:
+        pass  # Keep the partial chunk; the client resumes from HEAD
+    finally:
+        os.close(descriptor)
+        if hashing:
+            hasher.offset = offset + written
+            hasher.lock.release()
+    return written
+
+def record_received_range(db: Session, upload_id: str, start: int, end: int) -> List[List[int]]:
+    """Merge a written range into the session, retrying on concurrent updates; commits"""
+    expires_at = datetime.utcnow() + timedelta(hours=RESUMABLE_UPLOAD_TTL_HOURS)
+    for _ in range(MAX_RANGE_RETRIES):
+        row = db.query(UploadSession.received_ranges, UploadSession.revision).filter(
+            UploadSession.id == upload_id
+        ).first()
+        if row is None:
+            raise LookupError("Upload not found")
+        merged = merge_ranges(row.received_ranges or [], start, end) if end > start else (row.received_ranges or [])
+        updated = db.query(UploadSession).filter(
+            UploadSession.id == upload_id,
+            UploadSession.revision == row.revision
+        ).update({
+            "received_ranges": merged,
+            "revision": row.revision + 1,
+            "expires_at": expires_at,
+        }, synchronize_session=False)
+        db.commit()
+        if updated:
+            return merged
+    raise RuntimeError("Upload is being modified too concurrently, please retry")
+
+def _file_digest(path: str, length: int, upload_id: str) -> str:
+    hasher = prefix_hashers.get(upload_id)
+    if hasher is not None:
+        hasher.catch_up(path, length)
+        if hasher.offset == length:
+            return hasher.digest.hexdigest()
+    # Fallback: the hasher lived in another worker or was evicted
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        while block := source.read(HASH_READ_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+def complete_upload(db: Session, upload_id: str) -> Optional[int]:
+    """
+    Turn a fully received upload into a document (or a new version of one).
+
+    The part file is renamed into place rather than copied. Returns the
+    document id, or None if another request is already completing it.
+    Raises ValueError if the target document can't take the new version,
+    or QuotaExceeded.
+    """
+    claimed = db.query(UploadSession).filter(
+        UploadSession.id == upload_id,
+        UploadSession.status == "active"
+    ).update({"status": "completing"}, synchronize_session=False)
+    db.commit()
+    if not claimed:
+        return None
+
+    upload = db.query(UploadSession).filter(UploadSession.id == upload_id).first()
+    file_path = None
+    try:
+        sha256 = _file_digest(upload.storage_path, upload.upload_length, upload_id)
+        filename = generate_unique_filename(upload.original_filename)
+        file_path = os.path.join(UPLOAD_DIR, filename)
+        os.replace(upload.storage_path, file_path)
+
+        details = dict(
+            uploaded_by_id=upload.created_by_id,
+            filename=filename,
+            original_filename=upload.original_filename,
+            file_path=file_path,
+            file_size=upload.upload_length,
+            mime_type=upload.mime_type,
+            sha256=sha256,
+        )
+        if upload.document_id is not None:
+            document = db.query(Document).filter(Document.id == upload.document_id, Document.is_active == True).first()
+            if document is None:
+                raise ValueError("Target document no longer exists")
+            document = add_document_version(db, document, change_note=upload.change_note, **details)
+        else:
+            document = create_document(db, description=upload.description or "",
+                                       document_type=upload.document_type, **details)
+    except Exception:
+        db.rollback()
+        if file_path and os.path.exists(file_path) and not os.path.exists(upload.storage_path):
+            os.replace(file_path, upload.storage_path)  # Put the data back so completion can be retried
+        if os.path.exists(upload.storage_path):
+            db.query(UploadSession).filter(UploadSession.id == upload_id).update(
+                {"status": "active"}, synchronize_session=False
+            )
+            db.commit()
+        else:
+            # The data already went to (and was dropped from) remote storage: start over
+            terminate_upload(db, upload)
+        raise
+
+    db.query(UploadSession).filter(UploadSession.id == upload_id).update({
+        "status": "completed",
+        "result_document_id": document.id,
+        "sha256": sha256,
+    }, synchronize_session=False)
+    db.commit()
+    prefix_hashers.discard(upload_id)
+    return document.id
+
+def terminate_upload(db: Session, upload: UploadSession):
+    """Delete an upload and its partial data; commits"""
+    if upload.status != "completed":
+        delete_file(upload.storage_path)
+    prefix_hashers.discard(upload.id)
+    db.delete(upload)
+    db.commit()
+
+def expire_upload_sessions(db: Session) -> int:
+    """Remove abandoned uploads and completed sessions past their expiry"""
+    expired = db.query(UploadSession).filter(
+        UploadSession.expires_at < datetime.utcnow(),
+        UploadSession.status != "completing"
+    ).all()
+    for upload in expired:
+        terminate_upload(db, upload)
+    return len(expired)
+
+async def run_upload_cleanup():
+    """Background loop expiring abandoned uploads every RESUMABLE_CLEANUP_INTERVAL_MINUTES"""
+    loop = asyncio.get_running_loop()
+
+    def cleanup():
+        with SessionLocal() as db:
+            return expire_upload_sessions(db)
+
+    while True:
+        try:
+            expired = await loop.run_in_executor(None, cleanup)
+            if expired:
+                print(f"Expired {expired} resumable upload sessions")
+        except Exception as e:
+            print(f"Upload session cleanup failed: {e}")
+        await asyncio.sleep(RESUMABLE_CLEANUP_INTERVAL_MINUTES * 60)
@@ -0,0 +1,235 @@
+import asyncio
+import heapq
+import itertools
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import update
+from app.database import SessionLocal
+from app.models.task import Task, TaskStatus, TaskPriority
+from app.utils.audit import record_change
+from app.utils.events import event_bus
+from app.utils.notifications import enqueue_notification
+from app.utils.versioning import bump_client_version
+
+# Scheduler configuration
+TASK_SCHEDULER_ENABLED = os.getenv("TASK_SCHEDULER_ENABLED", "true").lower() == "true"
+TASK_REMINDER_LEAD_HOURS = float(os.getenv("TASK_REMINDER_LEAD_HOURS", "72"))
+TASK_SCHEDULER_HORIZON_HOURS = float(os.getenv("TASK_SCHEDULER_HORIZON_HOURS", "24"))
+TASK_ESCALATION_CATCHUP_DAYS = float(os.getenv("TASK_ESCALATION_CATCHUP_DAYS", "7"))
+MAX_SLEEP_SECONDS = 3600
+
+OPEN_STATUSES = (TaskStatus.PENDING, TaskStatus.IN_PROGRESS)
+REMINDER = "reminder"
+ESCALATION = "escalation"
+
+# One step up per escalation; urgent stays urgent (as do tasks without a priority)
+ESCALATION_STEPS = {
+    TaskPriority.LOW: TaskPriority.MEDIUM,
+    TaskPriority.MEDIUM: TaskPriority.HIGH,
+    TaskPriority.HIGH: TaskPriority.URGENT,
+    TaskPriority.URGENT: TaskPriority.URGENT,
+    None: TaskPriority.URGENT,
+}
+
+def as_utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """Normalize to naive UTC, matching how datetimes come back from SQLite"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+class DeadlineScheduler:
+    """
+    Timer heap of upcoming task reminders and escalations.
+
+    Only deadlines inside a rolling horizon are held in memory; each
+    horizon is loaded with one indexed range query on (status, due_date),
+    and task create/update events keep the heap current in between.
+    Firing uses conditional UPDATEs, so several workers running their own
+    scheduler never remind or escalate the same task twice.
+    """
+
+    def __init__(self):
+        self.reminder_lead = timedelta(hours=TASK_REMINDER_LEAD_HOURS)
+        self.horizon = timedelta(hours=TASK_SCHEDULER_HORIZON_HOURS)
+        self._heap: List[Tuple[datetime, int, int, str]] = []
+        self._sequence = itertools.count()
+        self._due_dates: Dict[int, Optional[datetime]] = {}
+        self._window_end: Optional[datetime] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._runner: Optional[asyncio.Task] = None
+
+    async def start(self):
+        self._wakeup = asyncio.Event()
+        event_bus.add_listener(self._on_event)
+        now = datetime.utcnow()
+        await self._load_window(now - timedelta(days=TASK_ESCALATION_CATCHUP_DAYS), now + self.horizon)
+        self._runner = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._runner is not None:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+
+    def pending_count(self) -> int:
+        return len(self._heap)
+
+    def schedule(self, task_id: int, due_date: Optional[datetime], is_open: bool):
+        """Add or refresh a task's timers; stale heap entries are skipped when popped"""
+        due_date = as_utc_naive(due_date)
+        if not is_open or due_date is None or self._window_end is None:
+            self._due_dates.pop(task_id, None)
+            return
+        if due_date - self.reminder_lead >= self._window_end:
+            # Picked up by a later window load
+            self._due_dates.pop(task_id, None)
+            return
+        self._due_dates[task_id] = due_date
+
+        now = datetime.utcnow()
+        for fire_at, kind in ((due_date - self.reminder_lead, REMINDER), (due_date, ESCALATION)):
+            if fire_at < self._window_end:
+                self._push(max(fire_at, now), task_id, kind)
+
+    def _push(self, fire_at: datetime, task_id: int, kind: str):
+        if self._wakeup is not None and (not self._heap or fire_at < self._heap[0][0]):
+            self._wakeup.set()
+        heapq.heappush(self._heap, (fire_at, next(self._sequence), task_id, kind))
+
+    def _on_event(self, event: dict):
+        if event.get("entity") != "task" or event.get("id") is None:
+            return
+        if event.get("action") not in ("created", "updated"):
+            return
+        due_date = event.get("due_date")
+        if isinstance(due_date, str):
+            due_date = datetime.fromisoformat(due_date.replace("Z", "+00:00"))
+        is_open = event.get("status") in {status.value for status in OPEN_STATUSES} and event.get("is_active", True)
+        self.schedule(event["id"], due_date, is_open)
+
+    async def _load_window(self, start: datetime, end: datetime):
+        """Load timers firing in [start, end) with one range query"""
+        rows = await asyncio.get_running_loop().run_in_executor(None, self._query_window, start, end)
+        self._window_end = end
+        for task_id, due_date, reminder_sent_at in rows:
+            due_date = as_utc_naive(due_date)
+            self._due_dates[task_id] = due_date
+            if reminder_sent_at is None and start <= due_date - self.reminder_lead < end:
+                self._push(due_date - self.reminder_lead, task_id, REMINDER)
+            if due_date < end:
+                self._push(due_date, task_id, ESCALATION)
+
+    def _query_window(self, start: datetime, end: datetime):
+        # A task fires in the window if its reminder (due - lead) or escalation (due) does
+        with SessionLocal() as db:
+            return db.query(Task.id, Task.due_date, Task.reminder_sent_at).filter(
+                Task.status.in_(OPEN_STATUSES),
+                Task.due_date >= start,
+                Task.due_date < end + self.reminder_lead,
+                Task.escalated_at.is_(None),
+                Task.is_active == True
+            ).all()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            now = datetime.utcnow()
+            if now >= self._window_end:
+                await self._load_window(self._window_end, now + self.horizon)
+
+            due = {REMINDER: set(), ESCALATION: set()}
+            while self._heap and self._heap[0][0] <= now:
+                fire_at, _, task_id, kind = heapq.heappop(self._heap)
+                current_due = self._due_dates.get(task_id)
+                if current_due is None:
+                    continue
+                expected = current_due - self.reminder_lead if kind == REMINDER else current_due
+                if expected <= now:
+                    due[kind].add(task_id)
+                    if kind == ESCALATION:
+                        del self._due_dates[task_id]
+                elif expected < self._window_end:
+                    # Rescheduled later since this entry was pushed
+                    self._push(expected, task_id, kind)
+
+            if due[REMINDER] or due[ESCALATION]:
+                try:
+                    await loop.run_in_executor(None, self._fire, due[REMINDER], due[ESCALATION])
+                except Exception as e:
+                    print(f"Deadline scheduler failed to fire timers: {e}")
+
+            next_at = self._window_end
+            if self._heap:
+                next_at = min(next_at, self._heap[0][0])
+            timeout = min(max((next_at - datetime.utcnow()).total_seconds(), 0), MAX_SLEEP_SECONDS)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _fire(self, reminder_ids, escalation_ids):
+        """Apply due reminders and escalations in one transaction each"""
+        now = datetime.utcnow()
+        with SessionLocal() as db:
+            reminded = []
+            if reminder_ids:
+                reminded = db.execute(
+                    update(Task)
+                    .where(
+                        Task.id.in_(reminder_ids),
+                        Task.reminder_sent_at.is_(None),
+                        Task.status.in_(OPEN_STATUSES),
+                        Task.due_date > now,  # Overdue tasks are escalated instead
+                        Task.due_date <= now + self.reminder_lead,
+                        Task.is_active == True
+                    )
+                    .values(reminder_sent_at=now, updated_at=Task.updated_at)
+                    .returning(Task.id, Task.client_id, Task.due_date, Task.title)
+                    .execution_options(synchronize_session=False)
+                ).all()
+                for row in reminded:
+                    record_change(db, "task", row.id, REMINDER, row.client_id, {"reminder_sent_at": [None, now.isoformat()]})
+                    enqueue_notification(db, "task_reminder", row.client_id,
+                                         f"Reminder: {row.title} is due {as_utc_naive(row.due_date):%Y-%m-%d}",
+                                         entity_id=row.id)
+                db.commit()
+
+            escalated = []
+            if escalation_ids:
+                # One conditional UPDATE per current priority, so each row's previous priority is known
+                for previous, priority in ESCALATION_STEPS.items():
+                    rows = db.execute(
+                        update(Task)
+                        .where(
+                            Task.id.in_(escalation_ids),
+                            Task.priority.is_(None) if previous is None else Task.priority == previous,
+                            Task.escalated_at.is_(None),
+                            Task.status.in_(OPEN_STATUSES),
+                            Task.due_date <= now,
+                            Task.is_active == True
+                        )
+                        .values(escalated_at=now, priority=priority, version=Task.version + 1)
+                        .returning(Task.id, Task.client_id, Task.priority)
+                        .execution_options(synchronize_session=False)
+                    ).all()
+                    for row in rows:
+                        changes = {"escalated_at": [None, now.isoformat()]}
+                        if priority != previous:
+                            changes["priority"] = [previous.value if previous else None, priority.value]
+                        record_change(db, "task", row.id, "escalated", row.client_id, changes)
+                    escalated.extend(rows)
+                bump_client_version(db, [row.client_id for row in escalated])
+                db.commit()
+
+        for row in reminded:
+            event_bus.publish("task", REMINDER, row.id, row.client_id, due_date=row.due_date)
+        for row in escalated:
+            event_bus.publish("task", "escalated", row.id, row.client_id, priority=row.priority.value)
+
+# Process-wide deadline scheduler
+deadline_scheduler = DeadlineScheduler()
@@ -0,0 +1,241 @@
+import asyncio
+import os
+from datetime import datetime
+from typing import Dict, FrozenSet, Iterable, List, Optional
+from sqlalchemy import case, func, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models.client import Client
+from app.models.document import Document, DocumentAssignment
+from app.models.scorecard import ClientScorecard
+from app.models.task import Task, TaskStatus, TaskPriority, ClientInquiry
+from app.utils.scheduler import OPEN_STATUSES
+
+# Scorecard configuration
+SCORECARD_REFRESH_SECONDS = float(os.getenv("SCORECARD_REFRESH_SECONDS", "60"))
+SCORECARD_REFRESH_DELAY_SECONDS = float(os.getenv("SCORECARD_REFRESH_DELAY_SECONDS", "2"))  # Debounce after changes
+SCORECARD_BATCH_SIZE = int(os.getenv("SCORECARD_BATCH_SIZE", "500"))
+# Document types each industry must have assigned: "*:handbook;healthcare:hipaa_training,handbook"
+SCORECARD_REQUIRED_DOCUMENTS = os.getenv("SCORECARD_REQUIRED_DOCUMENTS", "*:handbook")
+
+OPEN_INQUIRY_STATUSES = ("open", "in_review")
+HIGH_PRIORITIES = (TaskPriority.HIGH, TaskPriority.URGENT)
+
+# Risk score: points per overdue task and open high/urgent inquiry, plus
+# up to the full weight for a 0% completion rate or document coverage
+RISK_WEIGHTS = {
+    "overdue_tasks": 10.0,
+    "open_high_inquiries": 5.0,
+    "incomplete": 20.0,
+    "uncovered": 20.0,
+}
+
+# Ranking sort keys; prefix with "-" for descending
+SORT_COLUMNS = {
+    "risk_score": ClientScorecard.risk_score,
+    "overdue_tasks": ClientScorecard.overdue_tasks,
+    "open_tasks": ClientScorecard.open_tasks,
+    "completion_rate": ClientScorecard.completion_rate,
+    "open_high_inquiries": ClientScorecard.open_high_inquiries,
+    "document_coverage": ClientScorecard.document_coverage,
+    "company_name": Client.company_name,
+}
+
+def parse_required_documents(spec: str) -> Dict[str, FrozenSet[str]]:
+    """{industry: document types}; "*" applies to every industry"""
+    required = {}
+    for entry in spec.split(";"):
+        if not entry.strip():
+            continue
+        industry, _, types = entry.partition(":")
+        required[industry.strip().lower()] = frozenset(t.strip() for t in types.split(",") if t.strip())
+    return required
+
+REQUIRED_DOCUMENTS = parse_required_documents(SCORECARD_REQUIRED_DOCUMENTS)
+
+def required_types(industry: Optional[str]) -> FrozenSet[str]:
+    return REQUIRED_DOCUMENTS.get("*", frozenset()) | REQUIRED_DOCUMENTS.get((industry or "").lower(), frozenset())
+
+def risk_score(overdue_tasks: int, open_high_inquiries: int,
+               completion_rate: Optional[float], document_coverage: Optional[float]) -> float:
+    score = (
+        overdue_tasks * RISK_WEIGHTS["overdue_tasks"]
+        + open_high_inquiries * RISK_WEIGHTS["open_high_inquiries"]
+        + (1 - (1.0 if completion_rate is None else completion_rate)) * RISK_WEIGHTS["incomplete"]
+        + (1 - (1.0 if document_coverage is None else document_coverage)) * RISK_WEIGHTS["uncovered"]
+    )
+    return round(score, 2)
+
+def _count(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+def compute_scorecards(db: Session, client_ids: List[int]) -> int:
+    """
+    Recompute the scorecards of these clients with one grouped query per
+    source table; does not commit. Returns the number of rows written.
+
+    Client versions are read before the metrics, so a write racing
+    the computation leaves the row stamped with an older version and it is
+    simply recomputed on the next refresh.
+    """
+    now = datetime.utcnow()
+    clients = db.query(Client.id, Client.industry, Client.data_version, Client.version).filter(Client.id.in_(client_ids)).all()
+    if not clients:
+        return 0
+    ids = [client.id for client in clients]
+
+    is_open = Task.status.in_(OPEN_STATUSES)
+    tasks = {row.client_id: row for row in db.query(
+        Task.client_id,
+        _count(is_open).label("open"),
+        _count(is_open & (Task.due_date < now)).label("overdue"),
+        _count(Task.status == TaskStatus.COMPLETED).label("completed"),
+        _count(Task.status != TaskStatus.CANCELLED).label("total"),
+        func.min(case((is_open & (Task.due_date >= now), Task.due_date))).label("next_overdue_at"),
+    ).filter(Task.client_id.in_(ids), Task.is_active == True).group_by(Task.client_id)}
+
+    inquiries = {row.client_id: row for row in db.query(
+        ClientInquiry.client_id,
+        func.count(ClientInquiry.id).label("open"),
+        _count(ClientInquiry.priority.in_(HIGH_PRIORITIES)).label("high"),
+    ).filter(
+        ClientInquiry.client_id.in_(ids),
+        ClientInquiry.status.in_(OPEN_INQUIRY_STATUSES)
+    ).group_by(ClientInquiry.client_id)}
+
+    covered: Dict[int, set] = {}
+    all_required = set().union(*REQUIRED_DOCUMENTS.values()) if REQUIRED_DOCUMENTS else set()
+    if all_required:
+        assigned = db.query(DocumentAssignment.client_id, Document.document_type).join(
+            Document, Document.id == DocumentAssignment.document_id
+        ).filter(
+            DocumentAssignment.client_id.in_(ids),
+            DocumentAssignment.is_active == True,
+            Document.is_active == True,
+            Document.document_type.in_(all_required)
+        ).distinct()
+        for client_id, document_type in assigned:
+            covered.setdefault(client_id, set()).add(document_type)
+
+    existing = {row.client_id: row for row in db.query(ClientScorecard).filter(ClientScorecard.client_id.in_(ids))}
+    for client in clients:
+        task_counts = tasks.get(client.id)
+        inquiry_counts = inquiries.get(client.id)
+        required = required_types(client.industry)
+
+        scorecard = existing.get(client.id)
+        if scorecard is None:
+            scorecard = ClientScorecard(client_id=client.id)
+            db.add(scorecard)
+        scorecard.data_version = client.data_version
+        scorecard.client_version = client.version
+        scorecard.open_tasks = task_counts.open if task_counts else 0
+        scorecard.overdue_tasks = task_counts.overdue if task_counts else 0
+        scorecard.completed_tasks = task_counts.completed if task_counts else 0
+        scorecard.total_tasks = task_counts.total if task_counts else 0
+        scorecard.completion_rate = round(scorecard.completed_tasks / scorecard.total_tasks, 4) \
+            if scorecard.total_tasks else None
+        scorecard.open_inquiries = inquiry_counts.open if inquiry_counts else 0
+        scorecard.open_high_inquiries = inquiry_counts.high if inquiry_counts else 0
+        scorecard.required_documents = len(required)
+        scorecard.covered_documents = len(required & covered.get(client.id, set()))
+        scorecard.document_coverage = round(scorecard.covered_documents / len(required), 4) if required else None
+        scorecard.risk_score = risk_score(scorecard.overdue_tasks, scorecard.open_high_inquiries,
+                                          scorecard.completion_rate, scorecard.document_coverage)
+        scorecard.next_overdue_at = task_counts.next_overdue_at if task_counts else None
+        scorecard.computed_at = now
+    db.flush()
+    return len(clients)
+
+def stale_client_ids(db: Session, limit: Optional[int] = None) -> List[int]:
+    """
+    Active clients whose scorecard is missing, behind their data_version,
+    behind an edit of the client itself (e.g. its industry), or past
+    next_overdue_at.
+    """
+    query = db.query(Client.id).outerjoin(ClientScorecard, ClientScorecard.client_id == Client.id).filter(
+        Client.is_active == True,
+        or_(
+            ClientScorecard.id == None,
+            ClientScorecard.data_version != Client.data_version,
+            ClientScorecard.client_version != Client.version,
+            ClientScorecard.next_overdue_at <= datetime.utcnow(),
+        )
+    )
+    if limit:
+        query = query.limit(limit)
+    return [row.id for row in query]
+
+def _compute_in_batches(db: Session, client_ids: Iterable[int]) -> int:
+    client_ids = list(client_ids)
+    total = 0
+    for start in range(0, len(client_ids), SCORECARD_BATCH_SIZE):
+        batch = client_ids[start:start + SCORECARD_BATCH_SIZE]
+        for attempt in range(2):
+            try:
+                computed = compute_scorecards(db, batch)
+                db.commit()
+                total += computed
+                break
+            except IntegrityError:
+                # A concurrent refresh created some of these rows; the retry updates them instead
+                db.rollback()
+    return total
+
+def refresh_scorecards(db: Session) -> int:
+    """Recompute only the stale scorecards; commits per batch. Returns how many were recomputed"""
+    return _compute_in_batches(db, stale_client_ids(db))
+
+def rebuild_scorecards(db: Session) -> int:
+    """Recompute every active client's scorecard from scratch; commits per batch"""
+    client_ids = [row.id for row in db.query(Client.id).filter(Client.is_active == True).order_by(Client.id)]
+    return _compute_in_batches(db, client_ids)
+
+class ScorecardRefresher:
+    """
+    Background loop keeping scorecards current: it runs shortly after
+    task, inquiry or assignment changes (debounced) and at least every
+    SCORECARD_REFRESH_SECONDS, which catches tasks going overdue.
+    """
+
+    def __init__(self):
+        self._wakeup: Optional[asyncio.Event] = None
+        self.last_refreshed_at: Optional[datetime] = None  # When this worker last finished a refresh
+
+    def on_event(self, event: dict):
+        """Event bus listener: a change may have made a scorecard stale"""
+        if self._wakeup is not None and event.get("entity") in ("task", "inquiry", "assignment", "document"):
+            self._wakeup.set()
+
+    async def run(self):
+        self._wakeup = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def refresh():
+            started = datetime.utcnow()
+            with SessionLocal() as db:
+                refresh_scorecards(db)
+            self.last_refreshed_at = started
+
+        while True:
+            try:
+                await loop.run_in_executor(None, refresh)
+            except Exception as e:
+                print(f"Scorecard refresh failed: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), SCORECARD_REFRESH_SECONDS)
+                await asyncio.sleep(SCORECARD_REFRESH_DELAY_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+# Process-wide scorecard refresher
+scorecard_refresher = ScorecardRefresher()
+
+if __name__ == "__main__":
+    # Full rebuild: python -m app.utils.scorecards
+    from app.boot import ensure_schema
+    ensure_schema()
+    with SessionLocal() as db:
+        print(f"Rebuilt {rebuild_scorecards(db)} client scorecards")
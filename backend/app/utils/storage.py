@@ -0,0 +1,233 @@
+import os
+from functools import lru_cache
+from typing import BinaryIO, Iterator
+from urllib.parse import quote
+from fastapi.responses import FileResponse, RedirectResponse, Response, StreamingResponse
+from app.utils.file_handler import delete_file
+
+# Storage configuration
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")  # local or s3
+S3_BUCKET = os.getenv("S3_BUCKET", "")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL") or None  # MinIO, R2, etc.; unset for AWS
+S3_REGION = os.getenv("S3_REGION") or None
+S3_PREFIX = os.getenv("S3_PREFIX", "")
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "20"))
+STORAGE_PRESIGNED_DOWNLOADS = os.getenv("STORAGE_PRESIGNED_DOWNLOADS", "true").lower() == "true"
+STORAGE_PRESIGN_SECONDS = int(os.getenv("STORAGE_PRESIGN_SECONDS", "300"))
+STORAGE_READ_SIZE = 64 * 1024
+
+# Local download offload: app (stream through Python), x-accel-redirect (nginx),
+# x-sendfile (Apache mod_xsendfile, lighttpd) or zerocopy (ASGI zerocopysend)
+DOWNLOAD_OFFLOAD = os.getenv("DOWNLOAD_OFFLOAD", "app").lower()
+DOWNLOAD_ACCEL_PREFIX = os.getenv("DOWNLOAD_ACCEL_PREFIX", "/protected/")  # nginx internal location
+DOWNLOAD_CHUNK_SIZE = int(os.getenv("DOWNLOAD_CHUNK_SIZE", str(1024 * 1024)))
+
+def content_disposition(filename: str) -> str:
+    """attachment header value, RFC 5987-encoded when the name isn't plain ASCII"""
+    quoted = quote(filename or "download")
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+class LocalFileResponse(FileResponse):
+    """
+    FileResponse with a larger read size that hands the file to the server
+    for zero-copy sendfile when the ASGI server supports the
+    http.response.zerocopysend extension.
+
+    Servers without the extension (uvicorn) get the regular chunked body.
+    """
+    chunk_size = DOWNLOAD_CHUNK_SIZE
+
+    def __init__(self, *args, zerocopy: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.zerocopy = zerocopy
+
+    async def __call__(self, scope, receive, send):
+        if not self.zerocopy or "http.response.zerocopysend" not in scope.get("extensions", {}):
+            await super().__call__(scope, receive, send)
+            return
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if self.send_header_only:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        else:
+            with open(self.path, "rb") as file:
+                await send({"type": "http.response.zerocopysend", "file": file, "more_body": False})
+        if self.background is not None:
+            await self.background()
+
+class StorageBackend:
+    """
+    Where document bytes live.
+
+    Keys are the values stored in Document.file_path ("uploads/<uuid>.pdf"),
+    so moving between drivers only means copying objects. Uploads are
+    staged on local disk first (to hash and size-check them) and handed
+    over with put().
+    """
+    name = "base"
+
+    def put(self, staged_path: str, key: str):
+        """Move a staged local file into storage under key"""
+        raise NotImplementedError
+
+    def open(self, key: str) -> BinaryIO:
+        """Readable binary stream; raises FileNotFoundError"""
+        raise NotImplementedError
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def download_response(self, key: str, filename: str, media_type: str) -> Response:
+        """Response serving key as a download; raises FileNotFoundError"""
+        raise NotImplementedError
+
+class LocalStorage(StorageBackend):
+    """Files on the local (or a mounted) disk; keys are paths relative to the working directory"""
+    name = "local"
+
+    def put(self, staged_path: str, key: str):
+        if os.path.abspath(staged_path) == os.path.abspath(key):
+            return
+        os.makedirs(os.path.dirname(key) or ".", exist_ok=True)
+        os.replace(staged_path, key)
+
+    def open(self, key: str) -> BinaryIO:
+        return open(key, "rb")
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(key)
+
+    def delete(self, key: str) -> bool:
+        return delete_file(key)
+
+    def download_response(self, key: str, filename: str, media_type: str) -> Response:
+        stat_result = os.stat(key)  # Raises FileNotFoundError
+        if DOWNLOAD_OFFLOAD in ("x-accel-redirect", "x-sendfile"):
+            # The fronting proxy sends the file; we only answer with headers
+            if DOWNLOAD_OFFLOAD == "x-accel-redirect":
+                target = {"X-Accel-Redirect": DOWNLOAD_ACCEL_PREFIX.rstrip("/") + "/" + quote(key.replace(os.sep, "/"))}
+            else:
+                target = {"X-Sendfile": os.path.abspath(key)}
+            return Response(media_type=media_type, headers={
+                **target,
+                "Content-Disposition": content_disposition(filename),
+            })
+        return LocalFileResponse(
+            path=key,
+            filename=filename,
+            media_type=media_type,
+            stat_result=stat_result,
+            zerocopy=DOWNLOAD_OFFLOAD == "zerocopy"
+        )
+
+class S3Storage(StorageBackend):
+    """
+    S3-compatible object storage (AWS S3, MinIO, R2, ...).
+
+    Downloads redirect to short-lived presigned URLs, so the bytes go from
+    the bucket to the browser without passing through the app server.
+    Set STORAGE_PRESIGNED_DOWNLOADS=false to proxy them instead (buckets
+    not reachable from browsers).
+    """
+    name = "s3"
+
+    def __init__(self, bucket: str, endpoint_url: str = None, region: str = None, prefix: str = ""):
+        try:
+            import boto3
+            from botocore.config import Config
+            from botocore.exceptions import ClientError
+        except ImportError:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires boto3 (pip install boto3)")
+        if not bucket:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires S3_BUCKET")
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self._client_error = ClientError
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            config=Config(signature_version="s3v4", max_pool_connections=S3_MAX_POOL_CONNECTIONS)
+        )
+
+    def object_key(self, key: str) -> str:
+        return self.prefix + key.replace(os.sep, "/")
+
+    def _missing(self, error) -> bool:
+        return error.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
+
+    def put(self, staged_path: str, key: str):
+        self.client.upload_file(staged_path, self.bucket, self.object_key(key))  # Multipart for large files
+        delete_file(staged_path)
+
+    def _get_object(self, key: str) -> dict:
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=self.object_key(key))
+        except self._client_error as e:
+            if self._missing(e):
+                raise FileNotFoundError(key)
+            raise
+
+    def open(self, key: str) -> BinaryIO:
+        return self._get_object(key)["Body"]
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.object_key(key))
+            return True
+        except self._client_error as e:
+            if self._missing(e):
+                return False
+            raise
+
+    def delete(self, key: str) -> bool:
+        self.client.delete_object(Bucket=self.bucket, Key=self.object_key(key))
+        return True
+
+    def presigned_url(self, key: str, filename: str, media_type: str, expires_in: int = STORAGE_PRESIGN_SECONDS) -> str:
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": self.object_key(key),
+                "ResponseContentDisposition": content_disposition(filename),
+                "ResponseContentType": media_type,
+            },
+            ExpiresIn=expires_in
+        )
+
+    def download_response(self, key: str, filename: str, media_type: str) -> Response:
+        if STORAGE_PRESIGNED_DOWNLOADS:
+            # No existence check: a missing object is a 404 from the bucket, and we save a round trip
+            return RedirectResponse(
+                self.presigned_url(key, filename, media_type),
+                status_code=307,
+                headers={"Cache-Control": "no-store"}
+            )
+
+        obj = self._get_object(key)
+        body = obj["Body"]
+
+        def chunks() -> Iterator[bytes]:
+            try:
+                while block := body.read(STORAGE_READ_SIZE):
+                    yield block
+            finally:
+                body.close()
+
+        headers = {"Content-Disposition": content_disposition(filename), "Content-Length": str(obj["ContentLength"])}
+        return StreamingResponse(chunks(), media_type=media_type, headers=headers)
+
+@lru_cache(maxsize=1)
+def get_storage() -> StorageBackend:
+    """Storage driver selected by STORAGE_BACKEND"""
+    if STORAGE_BACKEND == "s3":
+        return S3Storage(S3_BUCKET, S3_ENDPOINT_URL, S3_REGION, S3_PREFIX)
+    if STORAGE_BACKEND != "local":
+        raise RuntimeError(f"Unknown STORAGE_BACKEND '{STORAGE_BACKEND}'")
+    return LocalStorage()
@@ -0,0 +1,207 @@
+import asyncio
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models.document import Document, DocumentAssignment, DocumentVersion
+from app.models.storage import StorageUsage
+
+# Quotas in bytes; 0 disables
+STORAGE_QUOTA_CLIENT_BYTES = int(os.getenv("STORAGE_QUOTA_CLIENT_BYTES", "0"))
+STORAGE_QUOTA_UPLOADER_BYTES = int(os.getenv("STORAGE_QUOTA_UPLOADER_BYTES", "0"))
+STORAGE_QUOTA_TOTAL_BYTES = int(os.getenv("STORAGE_QUOTA_TOTAL_BYTES", "0"))
+STORAGE_RECONCILE_INTERVAL_HOURS = float(os.getenv("STORAGE_RECONCILE_INTERVAL_HOURS", "24"))
+
+SCOPE_CLIENT = "client"
+SCOPE_UPLOADER = "uploader"
+SCOPE_TOTAL = "total"
+QUOTAS = {
+    SCOPE_CLIENT: STORAGE_QUOTA_CLIENT_BYTES,
+    SCOPE_UPLOADER: STORAGE_QUOTA_UPLOADER_BYTES,
+    SCOPE_TOTAL: STORAGE_QUOTA_TOTAL_BYTES,
+}
+
+class QuotaExceeded(ValueError):
+    """A write would take a storage total past its quota"""
+
+def _upsert_statement(db: Session, scope: str, owner_id: int, bytes_delta: int, count_delta: int):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    table = StorageUsage.__table__
+    statement = insert(table).values(scope=scope, owner_id=owner_id, bytes_used=bytes_delta, file_count=count_delta)
+    return statement.on_conflict_do_update(
+        index_elements=["scope", "owner_id"],
+        set_={
+            "bytes_used": table.c.bytes_used + statement.excluded.bytes_used,
+            "file_count": table.c.file_count + statement.excluded.file_count,
+            "updated_at": func.now(),
+        }
+    )
+
+def adjust_usage(db: Session, scope: str, owner_id: int, bytes_delta: int, count_delta: int = 0):
+    """Add to a running total in the current transaction (created on first use)"""
+    if not bytes_delta and not count_delta:
+        return
+    statement = _upsert_statement(db, scope, owner_id, bytes_delta, count_delta)
+    if statement is not None:
+        db.execute(statement)
+        return
+    # Dialects without ON CONFLICT: update, insert if missing
+    updated = db.query(StorageUsage).filter(
+        StorageUsage.scope == scope,
+        StorageUsage.owner_id == owner_id
+    ).update({
+        StorageUsage.bytes_used: StorageUsage.bytes_used + bytes_delta,
+        StorageUsage.file_count: StorageUsage.file_count + count_delta,
+    }, synchronize_session=False)
+    if not updated:
+        db.add(StorageUsage(scope=scope, owner_id=owner_id, bytes_used=bytes_delta, file_count=count_delta))
+        db.flush()
+
+def usage(db: Session, scope: str, owner_id: int) -> int:
+    return db.query(StorageUsage.bytes_used).filter(
+        StorageUsage.scope == scope,
+        StorageUsage.owner_id == owner_id
+    ).scalar() or 0
+
+def _enforce(db: Session, scope: str, owner_id: int, adding: int = 0):
+    quota = QUOTAS[scope]
+    if quota and usage(db, scope, owner_id) + adding > quota:
+        label = "overall" if scope == SCOPE_TOTAL else f"{scope} {owner_id}"
+        limit = f"{quota // (1024*1024)}MB" if quota >= 1024 * 1024 else f"{quota} bytes"
+        raise QuotaExceeded(f"Storage quota exceeded ({label}: limit {limit})")
+
+def check_upload_quota(db: Session, uploader_id: int, size: int):
+    """Reject an upload before it streams to disk; charge_upload() re-checks on commit"""
+    _enforce(db, SCOPE_UPLOADER, uploader_id, size)
+    _enforce(db, SCOPE_TOTAL, 0, size)
+
+def charge_upload(db: Session, uploader_id: int, size: int):
+    """
+    Count a stored file against its uploader and the overall total.
+
+    The increment happens first, so concurrent uploads serialize on the
+    counter rows and the re-read sees every committed charge. Raises
+    QuotaExceeded; the caller rolls back.
+    """
+    adjust_usage(db, SCOPE_UPLOADER, uploader_id, size, 1)
+    adjust_usage(db, SCOPE_TOTAL, 0, size, 1)
+    _enforce(db, SCOPE_UPLOADER, uploader_id)
+    _enforce(db, SCOPE_TOTAL, 0)
+
+def charge_assignment(db: Session, client_id: int, size: int, enforce: bool = True):
+    """Count a newly assigned document against the client; raises QuotaExceeded"""
+    adjust_usage(db, SCOPE_CLIENT, client_id, size, 1)
+    if enforce:
+        _enforce(db, SCOPE_CLIENT, client_id)
+
+def release_assignment(db: Session, client_id: int, size: int):
+    adjust_usage(db, SCOPE_CLIENT, client_id, -size, -1)
+
+def resize_assignments(db: Session, client_ids: Iterable[int], size_delta: int):
+    """A new version changed the size of a document these clients have assigned (never blocked)"""
+    for client_id in client_ids:
+        adjust_usage(db, SCOPE_CLIENT, client_id, size_delta)
+
+def release_document(db: Session, document: Document, client_ids: Iterable[int]):
+    """Uncount a deleted document: every stored version, and its active assignments"""
+    stored = [(version.uploaded_by_id, version.file_size) for version in document.versions] or \
+        [(document.uploaded_by_id, document.file_size)]
+    for uploader_id, size in stored:
+        adjust_usage(db, SCOPE_UPLOADER, uploader_id, -size, -1)
+        adjust_usage(db, SCOPE_TOTAL, 0, -size, -1)
+    for client_id in client_ids:
+        release_assignment(db, client_id, document.file_size)
+
+def compute_usage(db: Session) -> Dict[Tuple[str, int], Tuple[int, int]]:
+    """Totals recomputed from the source tables: {(scope, owner_id): (bytes, files)}"""
+    totals: Dict[Tuple[str, int], Tuple[int, int]] = {}
+
+    def add(scope: str, owner_id: int, size: int, count: int):
+        current = totals.get((scope, owner_id), (0, 0))
+        totals[(scope, owner_id)] = (current[0] + int(size or 0), current[1] + count)
+
+    # Versions of active documents, plus documents that predate version rows
+    versions = db.query(
+        DocumentVersion.uploaded_by_id, func.sum(DocumentVersion.file_size), func.count(DocumentVersion.id)
+    ).join(Document, Document.id == DocumentVersion.document_id).filter(
+        Document.is_active == True
+    ).group_by(DocumentVersion.uploaded_by_id)
+    unversioned = db.query(
+        Document.uploaded_by_id, func.sum(Document.file_size), func.count(Document.id)
+    ).filter(
+        Document.is_active == True,
+        ~select(DocumentVersion.id).where(DocumentVersion.document_id == Document.id).exists()
+    ).group_by(Document.uploaded_by_id)
+    for uploader_id, size, count in list(versions) + list(unversioned):
+        add(SCOPE_UPLOADER, uploader_id, size, count)
+        add(SCOPE_TOTAL, 0, size, count)
+
+    assigned = db.query(
+        DocumentAssignment.client_id, func.sum(Document.file_size), func.count(DocumentAssignment.id)
+    ).join(Document, Document.id == DocumentAssignment.document_id).filter(
+        DocumentAssignment.is_active == True,
+        Document.is_active == True
+    ).group_by(DocumentAssignment.client_id)
+    for client_id, size, count in assigned:
+        add(SCOPE_CLIENT, client_id, size, count)
+
+    return totals
+
+def reconcile_storage_usage(db: Session) -> List[Dict]:
+    """
+    Reset every running total to the value recomputed from the source tables; commits.
+
+    Returns the totals that had drifted. A write racing the recount can
+    leave a small error, which the next run corrects.
+    """
+    totals = compute_usage(db)
+    rows = {(row.scope, row.owner_id): row for row in db.query(StorageUsage).all()}
+    now = datetime.utcnow()
+    drifted = []
+
+    for key in set(totals) | set(rows):
+        bytes_used, file_count = totals.get(key, (0, 0))
+        row = rows.get(key)
+        if row is None:
+            row = StorageUsage(scope=key[0], owner_id=key[1], bytes_used=0, file_count=0)
+            db.add(row)
+        if (row.bytes_used, row.file_count) != (bytes_used, file_count):
+            drifted.append({
+                "scope": key[0],
+                "owner_id": key[1],
+                "recorded_bytes": row.bytes_used,
+                "actual_bytes": bytes_used,
+                "recorded_files": row.file_count,
+                "actual_files": file_count,
+            })
+        row.bytes_used = bytes_used
+        row.file_count = file_count
+        row.reconciled_at = now
+
+    db.commit()
+    return drifted
+
+async def run_storage_reconciler():
+    """Background loop recomputing storage totals every STORAGE_RECONCILE_INTERVAL_HOURS"""
+    loop = asyncio.get_running_loop()
+
+    def reconcile():
+        with SessionLocal() as db:
+            return reconcile_storage_usage(db)
+
+    while True:
+        try:
+            drifted = await loop.run_in_executor(None, reconcile)
+            if drifted:
+                print(f"Corrected {len(drifted)} drifted storage totals")
+        except Exception as e:
+            print(f"Storage reconciliation failed: {e}")
+        await asyncio.sleep(STORAGE_RECONCILE_INTERVAL_HOURS * 3600)
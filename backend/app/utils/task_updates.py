@@ -0,0 +1,104 @@
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import case, or_, update
+from sqlalchemy.orm import Session
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+from app.utils.versioning import bump_client_version, update_returning
+
+# Most tasks one bulk update changes, whether picked by id or by filter
+TASK_BULK_MAX_IDS = int(os.getenv("TASK_BULK_MAX_IDS", "1000"))
+
+BULK_FIELDS = ("status", "priority", "assigned_to_id", "due_date")
+
+def _status_value(status) -> Optional[str]:
+    return status.value if hasattr(status, "value") else status
+
+def status_values(changes: Dict, now: datetime) -> Dict:
+    """Extra values that keep completed_date in step with a status change"""
+    if "status" not in changes:
+        return {}
+    if _status_value(changes["status"]) == TaskStatus.COMPLETED.value:
+        # Tasks that were already completed keep their completion date
+        return {"completed_date": case((Task.status == TaskStatus.COMPLETED, Task.completed_date), else_=now)}
+    return {"completed_date": None}
+
+def schedule_values(changes: Dict) -> Dict:
+    """A new deadline gets a fresh reminder and escalation"""
+    if "due_date" not in changes:
+        return {}
+    return {"reminder_sent_at": None, "escalated_at": None}
+
+def _filter_conditions(filters: Dict) -> List:
+    conditions = []
+    if filters.get("client_id") is not None:
+        conditions.append(Task.client_id == filters["client_id"])
+    if filters.get("status") is not None:
+        conditions.append(Task.status == _status_value(filters["status"]))
+    if filters.get("due_from") is not None:
+        conditions.append(Task.due_date >= filters["due_from"])
+    if filters.get("due_to") is not None:
+        conditions.append(Task.due_date < filters["due_to"])
+    return conditions
+
+def bulk_update_tasks(db: Session, changes: Dict, task_ids: Optional[Iterable[int]] = None,
+                      filters: Optional[Dict] = None) -> Tuple[List[Task], List[int], List[int]]:
+    """
+    Apply the same change to many active tasks in one UPDATE ... RETURNING.
+
+    Tasks are picked by id or by filter (client_id, status, due_from,
+    due_to); either way at most TASK_BULK_MAX_IDS tasks change. Tasks
+    already in the requested state are left alone and keep their version.
+    Does not commit. Returns (updated tasks, unchanged ids, missing ids);
+    the id lists are only filled for an explicit id list. Raises
+    ValueError for an invalid request.
+    """
+    if (task_ids is None) == (filters is None):
+        raise ValueError("Select tasks with either task_ids or filter")
+    unknown = set(changes) - set(BULK_FIELDS)
+    if unknown:
+        raise ValueError(f"Fields can't be changed in bulk: {', '.join(sorted(unknown))}")
+    if not changes:
+        raise ValueError("No changes given")
+    if changes.get("assigned_to_id") is not None and \
+            db.query(User.id).filter(User.id == changes["assigned_to_id"]).first() is None:
+        raise ValueError("Assignee not found")
+
+    conditions = [Task.is_active == True]
+    if task_ids is not None:
+        ids = list(dict.fromkeys(task_ids))
+        if len(ids) > TASK_BULK_MAX_IDS:
+            raise ValueError(f"At most {TASK_BULK_MAX_IDS} task ids per request")
+        if not ids:
+            return [], [], []
+        conditions.append(Task.id.in_(ids))
+    else:
+        criteria = _filter_conditions(filters)
+        if not criteria:
+            raise ValueError("Filter must include at least one criterion")
+        conditions.extend(criteria)
+    conditions.append(or_(*(getattr(Task, field).is_distinct_from(value) for field, value in changes.items())))
+    if task_ids is None:
+        # Pin the filter to the ids it matches now, refusing matches past the cap
+        matched = [row.id for row in db.query(Task.id).filter(*conditions).limit(TASK_BULK_MAX_IDS + 1)]
+        if len(matched) > TASK_BULK_MAX_IDS:
+            raise ValueError(f"Filter matches more than {TASK_BULK_MAX_IDS} tasks; narrow it or split the change")
+        if not matched:
+            return [], [], []
+        conditions.append(Task.id.in_(matched))
+
+    now = datetime.utcnow()
+    values = {**changes, **status_values(changes, now), **schedule_values(changes)}
+    updated = update_returning(db, Task, update(Task).where(*conditions), values)
+    bump_client_version(db, [task.client_id for task in updated])
+
+    if task_ids is None:
+        return updated, [], []
+    remaining = set(ids) - {task.id for task in updated}
+    existing = set()
+    if remaining:
+        existing = {row.id for row in db.query(Task.id).filter(Task.id.in_(remaining), Task.is_active == True)}
+    unchanged = [task_id for task_id in ids if task_id in existing]
+    missing = [task_id for task_id in ids if task_id in remaining and task_id not in existing]
+    return updated, unchanged, missing
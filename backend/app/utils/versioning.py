@@ -0,0 +1,159 @@
+import time
+from typing import Dict, Iterable, List, Optional, Set
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app.models.client import Client
+from app.utils.audit import AUDITED_MODELS, json_value, record_change
+
+# Time-dependent payloads (e.g. "due in the next 7 days") are revalidated at least this often
+TIME_BUCKET_SECONDS = 600
+
+def bump_client_version(db: Session, client_ids: Iterable[int]):
+    """
+    Increment the data version of each client in the current transaction.
+
+    Call before committing any write to a client's tasks, document
+    assignments or inquiries so cached collections are invalidated.
+    """
+    ids = {client_id for client_id in client_ids if client_id is not None}
+    if not ids:
+        return
+    # Not shown in any cached admin list, so the client list stays cached
+    db.query(Client).execution_options(skip_response_cache=True).filter(Client.id.in_(ids)).update(
+        {
+            Client.data_version: Client.data_version + 1,
+            Client.updated_at: Client.updated_at,  # Not a change to the client itself
+        },
+        synchronize_session=False
+    )
+
+def get_client_version(db: Session, client_id: int) -> Optional[int]:
+    """Single primary-key lookup of a client's data version"""
+    return db.query(Client.data_version).filter(Client.id == client_id).scalar()
+
+def client_etag(scope: str, client_id: int, version: Optional[int], time_dependent: bool = False) -> str:
+    """Weak ETag for a client-scoped collection"""
+    tag = f"{scope}-{client_id}-{version or 0}"
+    if time_dependent:
+        tag += f"-{int(time.time() // TIME_BUCKET_SECONDS)}"
+    return f'W/"{tag}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison of If-None-Match against the current ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    current = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == current:
+            return True
+    return False
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+
+def set_etag(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+
+# Row versions: optimistic concurrency for admin edits
+
+class VersionConflict(ValueError):
+    """A compare-and-swap update found the row changed (or failing its other conditions)"""
+
+    def __init__(self, current):
+        super().__init__("Modified since it was read; reload and retry")
+        self.current = current
+
+def row_etag(version: int) -> str:
+    """Strong ETag for a single versioned row"""
+    return f'"{version}"'
+
+def precondition_failed(conflict: VersionConflict) -> HTTPException:
+    """412 response carrying the row's current ETag"""
+    return HTTPException(status_code=412, detail=str(conflict), headers={"ETag": row_etag(conflict.current.version)})
+
+def if_match_versions(request: Request) -> Optional[Set[int]]:
+    """
+    Row versions an If-Match header accepts.
+
+    None means no precondition (header absent or "*"). Tags that are not
+    row versions (e.g. weak collection ETags) match nothing.
+    """
+    header = request.headers.get("if-match")
+    if header is None or header.strip() == "*":
+        return None
+    versions = set()
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith('"') and candidate.endswith('"') and candidate[1:-1].isdigit():
+            versions.add(int(candidate[1:-1]))
+    return versions
+
+def update_returning(db: Session, model, statement, values: Dict, action: str = "updated") -> List:
+    """
+    Run an UPDATE of model rows with RETURNING and audit each changed row.
+
+    values may hold SQL expressions; the audit records what the rows ended
+    up with. Postgres also returns the previous values from a self-join;
+    other databases record only the new ones. Returns the updated objects.
+    """
+    fields = list(values)
+    previous = None
+    if db.get_bind().dialect.name == "postgresql":
+        previous = model.__table__.alias("previous")
+        statement = statement.where(previous.c.id == model.id)
+        returning = [model] + [previous.c[field] for field in fields]
+    else:
+        returning = [model]  # SQLite's RETURNING can't see the FROM clause
+
+    rows = db.execute(
+        statement.values(**values, version=model.version + 1)
+        .returning(*returning)
+        .execution_options(synchronize_session=False)
+    ).all()
+
+    entity = AUDITED_MODELS[model]
+    updated = []
+    for row in rows:
+        obj = row[0]
+        old_values = row[1:] if previous is not None else [None] * len(fields)
+        changes = {}
+        for field, old in zip(fields, old_values):
+            old, new = json_value(old), json_value(getattr(obj, field))
+            if previous is None or old != new:
+                changes[field] = [old, new]
+        if changes:
+            client_id = obj.id if model is Client else obj.client_id
+            record_change(db, entity, obj.id, action, client_id, changes)
+        updated.append(obj)
+    return updated
+
+def update_versioned(db: Session, model, row_id: int, values: Dict,
+                     expected_versions: Optional[Set[int]] = None, conditions: Iterable = ()):
+    """
+    Compare-and-swap update of one row in a single statement:
+    UPDATE ... SET ..., version = version + 1 WHERE id = ? AND version IN (...) RETURNING *.
+
+    Nothing is read first and nothing is refreshed after. Raises LookupError
+    if the row doesn't exist and VersionConflict (carrying the current row)
+    if the version or one of the extra conditions doesn't match. The change
+    is audited on commit (see update_returning).
+    """
+    statement = update(model).where(model.id == row_id, *conditions)
+    if expected_versions is not None:
+        statement = statement.where(model.version.in_(expected_versions))
+
+    updated = update_returning(db, model, statement, values)
+    if not updated:
+        current = db.query(model).filter(model.id == row_id).first()
+        if current is None:
+            raise LookupError(f"{model.__name__} {row_id} not found")
+        raise VersionConflict(current)
+    return updated[0]
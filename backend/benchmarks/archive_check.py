@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Client archiving check.
+
+Archives a deactivated client together with the rows derived from it
+(scorecard, reports and their files, notification outbox) on a scratch SQLite database
+with foreign keys enforced, so a derived table the client archive policy
+doesn't know about shows up as a failure rather than as orphaned rows:
+
+    python -m benchmarks.archive_check
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Archive a deactivated client and check nothing is left behind")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    scratch = tempfile.mkdtemp(prefix="hrc-archive-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{scratch}/check.db"
+    os.chdir(scratch)
+
+    from sqlalchemy import event
+    from app.database import SessionLocal, engine
+    event.listen(engine, "connect", lambda connection, record: connection.execute("PRAGMA foreign_keys=ON"))
+
+    from app.boot import ensure_schema
+    from app.models.archive import ArchivedRecord
+    from app.models.client import Client
+    from app.models.notification import NotificationOutbox
+    from app.models.report import ComplianceReport
+    from app.models.scorecard import ClientScorecard
+    from app.models.user import User
+    from app.utils.archive import archive_cold_records
+    from app.utils.scorecards import compute_scorecards
+    from app.utils.storage import get_storage
+
+    ensure_schema()
+    with SessionLocal() as db:
+        # The newest client always stays hot, so archive the older of two
+        clients = [Client(company_name=f"Archive check {i}", industry="other", employee_count=1,
+                          point_of_contact="Check", contact_email=f"check{i}@example.com") for i in range(2)]
+        db.add_all(clients)
+        db.flush()
+        client_id = clients[0].id
+        clients[0].is_active = False
+        compute_scorecards(db, [client_id])
+
+        admin = User(email="admin@example.com", hashed_password="-", full_name="Admin", is_admin=True)
+        db.add(admin)
+        db.flush()
+        report_file = f"uploads/reports/{client_id}-check.pdf"
+        os.makedirs(os.path.dirname(report_file), exist_ok=True)
+        Path(report_file).write_bytes(b"%PDF-1.4\n")
+        db.add(ComplianceReport(client_id=client_id, format="pdf", data_version=0, client_version=0,
+                                status="ready", file_path=report_file, requested_by_id=admin.id))
+        db.add(NotificationOutbox(recipient_email="user@example.com", client_id=client_id, kind="task_created",
+                                  subject="Check", next_attempt_at=datetime.utcnow()))
+        db.commit()
+
+    failures = []
+    with SessionLocal() as db:
+        counts = archive_cold_records(db, retention_days=-1)
+        if not db.query(ArchivedRecord).filter(ArchivedRecord.entity == "client",
+                                               ArchivedRecord.record_id == client_id).first():
+            failures.append("client was not archived")
+        if db.query(ClientScorecard).filter(ClientScorecard.client_id == client_id).count():
+            failures.append("scorecard left behind")
+        if db.query(ComplianceReport).filter(ComplianceReport.client_id == client_id).count():
+            failures.append("report left behind")
+        if db.query(NotificationOutbox).filter(NotificationOutbox.client_id == client_id).count():
+            failures.append("outbox rows left behind")
+    if get_storage().exists(report_file):
+        failures.append("report file left behind")
+
+    report = {"archived": counts, "failures": failures}
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
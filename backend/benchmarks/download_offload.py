@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Download offload benchmark.
+
+Starts a uvicorn server per DOWNLOAD_OFFLOAD mode against a scratch
+database holding one --size byte document, downloads it --requests times
+with --concurrency parallel clients, and reports throughput plus server
+CPU seconds per GB served (from /proc, Linux only).
+
+The "app" mode streams bytes through Python and is run once per
+--chunk-sizes entry (65536 is the previous FileResponse default). The
+x-accel-redirect and x-sendfile modes answer with headers only, so without
+a fronting proxy they measure the app's share of the work: served_bytes
+stays 0 and cpu_s_per_gb is per GB the proxy would send. zerocopy falls
+back to the app path on servers without the zerocopysend extension.
+
+Usage (from the backend directory):
+    python -m benchmarks.download_offload --size 104857600 --requests 40 \
+        --concurrency 8 --output offload.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib import request
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+FRONTEND_DIR = BACKEND_DIR.parent / "frontend"
+ADMIN_EMAIL = "offload-admin@paradigm.com"
+ADMIN_PASSWORD = "benchmark123"
+READ_SIZE = 1024 * 1024
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def process_cpu_seconds(pid: int):
+    """User + system CPU time of a process, or None where /proc is unavailable"""
+    try:
+        fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+def seed(workdir: str, size: int) -> int:
+    """Create the admin user and one document of size bytes; returns the document id"""
+    from app.database import SessionLocal, init_db
+    from app.models.document import Document
+    from app.models.user import User
+    from app.utils.auth import get_password_hash
+
+    init_db()
+    key = os.path.join("uploads", "offload-bench.bin")
+    os.makedirs(os.path.join(workdir, "uploads"), exist_ok=True)
+    with open(os.path.join(workdir, key), "wb") as target:
+        remaining = size
+        while remaining:
+            block = os.urandom(min(READ_SIZE, remaining))
+            target.write(block)
+            remaining -= len(block)
+
+    with SessionLocal() as db:
+        admin = User(email=ADMIN_EMAIL, hashed_password=get_password_hash(ADMIN_PASSWORD),
+                     full_name="Offload Bench", is_admin=True)
+        db.add(admin)
+        db.flush()
+        document = Document(filename="offload-bench.bin", original_filename="offload-bench.bin",
+                            file_path=key, file_size=size, mime_type="application/octet-stream",
+                            document_type="general", uploaded_by_id=admin.id)
+        db.add(document)
+        db.commit()
+        return document.id
+
+def run_mode(workdir: str, env: dict, mode: str, chunk_size: int, document_id: int, size: int,
+             requests: int, concurrency: int) -> dict:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        env=dict(env, DOWNLOAD_OFFLOAD=mode, DOWNLOAD_CHUNK_SIZE=str(chunk_size))
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                with request.urlopen(f"{base_url}/health/ready", timeout=1) as response:
+                    if response.status == 200:
+                        break
+            except Exception:
+                if server.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"Server failed to start: {server.stderr.read().decode()[-500:]}")
+                time.sleep(0.2)
+
+        login = request.Request(f"{base_url}/api/auth/login", method="POST",
+                                data=json.dumps({"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD}).encode(),
+                                headers={"Content-Type": "application/json"})
+        with request.urlopen(login) as response:
+            token = json.loads(response.read())["access_token"]
+
+        def download():
+            req = request.Request(f"{base_url}/api/documents/{document_id}/download",
+                                  headers={"Authorization": f"Bearer {token}"})
+            received = 0
+            with request.urlopen(req) as response:
+                offloaded = response.headers.get("X-Accel-Redirect") or response.headers.get("X-Sendfile")
+                while block := response.read(READ_SIZE):
+                    received += len(block)
+            return received, bool(offloaded)
+
+        cpu_before = process_cpu_seconds(server.pid)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(lambda _: download(), range(requests)))
+        wall_s = time.perf_counter() - started
+        cpu_after = process_cpu_seconds(server.pid)
+    finally:
+        server.terminate()
+        server.wait(10)
+
+    served = sum(received for received, _ in results)
+    offloaded = sum(1 for _, flag in results if flag)
+    delivered_gb = requests * size / 1e9  # What clients get once the proxy sends the file
+    cpu_s = None if cpu_before is None or cpu_after is None else cpu_after - cpu_before
+    return {
+        "mode": mode,
+        "chunk_size": chunk_size if mode in ("app", "zerocopy") else None,
+        "requests": requests,
+        "offloaded_responses": offloaded,
+        "served_bytes": served,
+        "wall_s": round(wall_s, 3),
+        "throughput_mb_s": round(served / 1048576 / wall_s, 1) if served else None,
+        "requests_per_s": round(requests / wall_s, 1),
+        "server_cpu_s": round(cpu_s, 3) if cpu_s is not None else None,
+        "cpu_s_per_gb": round(cpu_s / delivered_gb, 3) if cpu_s is not None else None,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare document download offload modes")
+    parser.add_argument("--size", type=int, default=50 * 1024 * 1024, help="Document size in bytes")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--modes", default="app,zerocopy,x-accel-redirect,x-sendfile")
+    parser.add_argument("--chunk-sizes", default="65536,1048576", help="Read sizes to compare in app mode")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="hrc-offload-")
+    os.symlink(FRONTEND_DIR, os.path.join(workdir, "frontend"))  # Static mounts are cwd-relative
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{workdir}/offload.db",
+        SCHEMA_LOCK_PATH=os.path.join(workdir, "schema.lock"),
+        EVENTS_SOCKET_DIR=os.path.join(workdir, "events"),
+        PYTHONPATH=str(BACKEND_DIR),
+        STORAGE_BACKEND="local",
+    )
+    os.environ.update(DATABASE_URL=env["DATABASE_URL"], SCHEMA_LOCK_PATH=env["SCHEMA_LOCK_PATH"])
+    sys.path.insert(0, str(BACKEND_DIR))
+    try:
+        document_id = seed(workdir, args.size)
+
+        runs = []
+        for mode in args.modes.split(","):
+            chunk_sizes = [int(size) for size in args.chunk_sizes.split(",")] if mode == "app" else [1024 * 1024]
+            for chunk_size in chunk_sizes:
+                runs.append(run_mode(workdir, env, mode, chunk_size, document_id, args.size,
+                                     args.requests, args.concurrency))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)  # Seeded file and database are scratch
+
+    report = {"size_bytes": args.size, "concurrency": args.concurrency, "runs": runs}
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Scripted load harness for the HR Compliance Platform API.
+
+Drives the real API routes of a running server (seeded with
+benchmarks.seed_data) and writes p50/p95/p99 latency and throughput per
+scenario as JSON, so runs can be diffed across changes.
+
+Usage (from the backend directory, server already running):
+    python -m benchmarks.load_test --base-url http://localhost:8000 \
+        --concurrency 16 --requests 500 --output baseline.json
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from urllib import error, request
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.seed_data import BENCH_ADMIN_EMAIL, BENCH_PASSWORD, client_user_email
+
+SCENARIOS = ["login", "portal", "dashboard_summary", "list_pagination", "scorecards", "upload", "download"]
+
+
+class ApiClient:
+    """Minimal blocking HTTP client on top of urllib"""
+
+    def __init__(self, base_url: str, timeout: float):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def call(self, method: str, path: str, token: str = None, body: bytes = None, headers: dict = None):
+        req = request.Request(f"{self.base_url}{path}", data=body, method=method)
+        for name, value in (headers or {}).items():
+            req.add_header(name, value)
+        if token:
+            req.add_header("Authorization", f"Bearer {token}")
+        try:
+            with request.urlopen(req, timeout=self.timeout) as response:
+                return response.status, response.read()
+        except error.HTTPError as exc:
+            return exc.code, exc.read()
+
+    def login(self, email: str) -> str:
+        payload = json.dumps({"email": email, "password": BENCH_PASSWORD}).encode()
+        status, body = self.call("POST", "/api/auth/login", body=payload,
+                                 headers={"Content-Type": "application/json"})
+        if status != 200:
+            raise RuntimeError(f"Login failed for {email}: {status} {body[:200]!r}")
+        return json.loads(body)["access_token"]
+
+
+def _multipart(field: str, filename: str, content: bytes, content_type: str):
+    boundary = uuid.uuid4().hex
+    body = b"".join([
+        f"--{boundary}\r\n".encode(),
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'.encode(),
+        f"Content-Type: {content_type}\r\n\r\n".encode(),
+        content,
+        f"\r\n--{boundary}--\r\n".encode(),
+    ])
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+class LoadRunner:
+    """Runs each scenario with a fixed number of requests at fixed concurrency"""
+
+    def __init__(self, args):
+        self.args = args
+        self.api = ApiClient(args.base_url, args.timeout)
+        self.rng = random.Random(args.seed)
+        self.rng_lock = threading.Lock()
+        self.admin_token = self.api.login(BENCH_ADMIN_EMAIL)
+        self.client_tokens = [
+            self.api.login(client_user_email(i)) for i in range(args.client_sessions)
+        ]
+        self.upload_payload = os.urandom(args.upload_bytes)
+        self.uploaded_ids = []  # Deleted again by cleanup() so runs leave no files behind
+        self.download_ids = self._discover_download_ids()
+
+    def _pick(self, seq):
+        with self.rng_lock:
+            return self.rng.choice(seq)
+
+    def _randint(self, low, high):
+        with self.rng_lock:
+            return self.rng.randint(low, high)
+
+    def _discover_download_ids(self):
+        ids = []
+        for token in self.client_tokens:
+            status, body = self.api.call("GET", "/api/client/documents", token=token)
+            if status == 200:
+                ids.extend((token, item["document"]["id"]) for item in json.loads(body))
+        return ids
+
+    # Scenarios: each returns True on success
+    def login(self):
+        payload = json.dumps({
+            "email": client_user_email(self._randint(0, self.args.client_sessions - 1)),
+            "password": BENCH_PASSWORD,
+        }).encode()
+        status, _ = self.api.call("POST", "/api/auth/login", body=payload,
+                                  headers={"Content-Type": "application/json"})
+        return status == 200
+
+    def portal(self):
+        token = self._pick(self.client_tokens)
+        paths = ["/api/client/dashboard/summary", "/api/client/documents",
+                 "/api/client/tasks", "/api/client/inquiries"]
+        return all(self.api.call("GET", path, token=token)[0] == 200 for path in paths)
+
+    def dashboard_summary(self):
+        token = self._pick(self.client_tokens)
+        return self.api.call("GET", "/api/client/dashboard/summary", token=token)[0] == 200
+
+    def list_pagination(self):
+        path = self._pick(["/api/admin/clients", "/api/admin/users", "/api/documents/",
+                           "/api/admin/tasks", "/api/admin/documents/assignments"])
+        skip = self._randint(0, self.args.max_page) * self.args.page_size
+        separator = "&" if "?" in path else "?"
+        status, _ = self.api.call("GET", f"{path}{separator}skip={skip}&limit={self.args.page_size}",
+                                  token=self.admin_token)
+        return status == 200
+
+    def scorecards(self):
+        sort = self._pick(["-risk_score", "-overdue_tasks", "completion_rate", "document_coverage"])
+        skip = self._randint(0, self.args.max_page) * self.args.page_size
+        status, _ = self.api.call("GET", f"/api/admin/scorecards?sort={sort}&skip={skip}&limit={self.args.page_size}",
+                                  token=self.admin_token)
+        return status == 200
+
+    def upload(self):
+        body, content_type = _multipart("file", "benchmark_upload.pdf", self.upload_payload, "application/pdf")
+        status, response = self.api.call("POST", "/api/documents/upload?document_type=benchmark",
+                                         token=self.admin_token, body=body,
+                                         headers={"Content-Type": content_type})
+        if status != 200:
+            return False
+        with self.rng_lock:
+            self.uploaded_ids.append(json.loads(response)["id"])
+        return True
+
+    def download(self):
+        if not self.download_ids:
+            return False
+        token, document_id = self._pick(self.download_ids)
+        return self.api.call("GET", f"/api/documents/{document_id}/download", token=token)[0] == 200
+
+    def run_scenario(self, name: str) -> dict:
+        scenario = getattr(self, name)
+        latencies = []
+        errors = 0
+        lock = threading.Lock()
+
+        def one(_):
+            nonlocal errors
+            started = time.perf_counter()
+            try:
+                ok = scenario()
+            except Exception:
+                ok = False
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                if not ok:
+                    errors += 1
+
+        wall_started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.args.concurrency) as pool:
+            list(pool.map(one, range(self.args.requests)))
+        wall = time.perf_counter() - wall_started
+
+        return summarize(latencies, errors, wall)
+
+    def cleanup(self) -> int:
+        """Delete the documents the upload scenario created; returns how many failed"""
+        failed = 0
+        for document_id in self.uploaded_ids:
+            status, _ = self.api.call("DELETE", f"/api/documents/{document_id}", token=self.admin_token)
+            if status != 200:
+                failed += 1
+        self.uploaded_ids.clear()
+        return failed
+
+
+def percentile(sorted_values, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies, errors: int, wall_seconds: float) -> dict:
+    ordered = sorted(latencies)
+    to_ms = lambda seconds: round(seconds * 1000, 3)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput_rps": round(len(ordered) / wall_seconds, 2) if wall_seconds else 0.0,
+        "latency_ms": {
+            "min": to_ms(ordered[0]) if ordered else 0.0,
+            "p50": to_ms(percentile(ordered, 50)),
+            "p95": to_ms(percentile(ordered, 95)),
+            "p99": to_ms(percentile(ordered, 99)),
+            "max": to_ms(ordered[-1]) if ordered else 0.0,
+        },
+    }
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return "unknown"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the HR Compliance Platform API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"Comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--client-sessions", type=int, default=50, help="Distinct client users to log in")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--max-page", type=int, default=20)
+    parser.add_argument("--upload-bytes", type=int, default=256 * 1024)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    runner = LoadRunner(args)
+    results = {}
+    try:
+        for name in scenarios:
+            print(f"Running {name}...", file=sys.stderr)
+            results[name] = runner.run_scenario(name)
+    finally:
+        failed = runner.cleanup()
+        if failed:
+            print(f"Could not delete {failed} benchmark uploads", file=sys.stderr)
+
+    report = {
+        "generated_at": datetime.utcnow().isoformat() + "Z",
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "parameters": {
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "requests_per_scenario": args.requests,
+            "client_sessions": args.client_sessions,
+            "page_size": args.page_size,
+            "upload_bytes": args.upload_bytes,
+            "seed": args.seed,
+        },
+        "scenarios": results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
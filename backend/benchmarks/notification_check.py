@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Notification delivery check.
+
+Queues --events notifications for a scratch client with --recipients
+portal users, then drains the outbox against the SMTP server in SMTP_HOST
+and reports how many digests went out and how long it took. Point it at a
+local sink, which accepts and prints every message:
+
+    pip install aiosmtpd
+    python -m aiosmtpd -n -l localhost:1025
+    SMTP_HOST=localhost SMTP_PORT=1025 python -m benchmarks.notification_check --events 20 --recipients 200
+
+Uses a scratch SQLite database unless DATABASE_URL is set.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drain the notification outbox against an SMTP server")
+    parser.add_argument("--events", type=int, default=10, help="Notifications queued per recipient")
+    parser.add_argument("--recipients", type=int, default=100, help="Portal users of the scratch client")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    if not os.getenv("SMTP_HOST"):
+        parser.error("SMTP_HOST is not set")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='hrc-notify-')}/check.db")
+    os.environ.setdefault("NOTIFY_DIGEST_SECONDS", "0")
+
+    from sqlalchemy import func
+    from app.boot import ensure_schema
+    from app.database import SessionLocal
+    from app.models.client import Client
+    from app.models.notification import NotificationOutbox
+    from app.models.user import User
+    from app.utils.notifications import enqueue_notification, notification_dispatcher
+
+    ensure_schema()
+    run = uuid.uuid4().hex[:8]
+    with SessionLocal() as db:
+        client = Client(company_name=f"Notification check {run}", industry="other", employee_count=1,
+                        point_of_contact="Check", contact_email=f"check-{run}@example.com")
+        db.add(client)
+        db.flush()
+        db.add_all(User(email=f"user{i}-{run}@example.com", hashed_password="-", full_name=f"User {i}",
+                        client_id=client.id) for i in range(args.recipients))
+        db.flush()
+        for i in range(args.events):
+            enqueue_notification(db, "task_created", client.id, f"Check notification {i + 1}", "Sent by notification_check")
+        db.commit()
+        client_id = client.id
+
+    started = time.perf_counter()
+    totals = {"sent": 0, "failed": 0}
+    while True:
+        counts = notification_dispatcher.deliver_once()
+        if not counts["sent"] + counts["failed"]:
+            break
+        for key in totals:
+            totals[key] += counts[key]
+    elapsed = time.perf_counter() - started
+    notification_dispatcher.stop()
+
+    with SessionLocal() as db:
+        statuses = dict(db.query(NotificationOutbox.status, func.count(NotificationOutbox.id)).filter(
+            NotificationOutbox.client_id == client_id
+        ).group_by(NotificationOutbox.status).all())
+
+    failures = [] if totals["sent"] == args.recipients else [
+        f"expected {args.recipients} digests, sent {totals['sent']}"
+    ]
+    report = {
+        "smtp": f"{os.environ['SMTP_HOST']}:{os.getenv('SMTP_PORT', '587')}",
+        "notifications": args.events * args.recipients,
+        "digests": totals,
+        "outbox_statuses": statuses,
+        "seconds": round(elapsed, 2),
+        "digests_per_s": round(totals["sent"] / elapsed, 1) if elapsed else None,
+        "failures": failures,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Pool saturation harness.
+
+Runs more concurrent "requests" than the pool can serve against a local
+database (a scratch SQLite file unless DATABASE_URL is set). Each one
+checks out a connection, runs a query and holds it for --hold seconds.
+The report shows how many were served, how many timed out fast instead of
+hanging, checkout wait percentiles and the final pool statistics.
+
+Usage (from the backend directory):
+    python -m benchmarks.pool_saturation --pool-size 2 --max-overflow 1 \
+        --pool-timeout 0.5 --concurrency 12 --hold 0.3 --output pool.json
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)], 1)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate connection pool saturation")
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--max-overflow", type=int, default=1)
+    parser.add_argument("--pool-timeout", type=float, default=0.5)
+    parser.add_argument("--concurrency", type=int, default=12)
+    parser.add_argument("--hold", type=float, default=0.3, help="Seconds each request holds its connection")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    # The pool profile is read at import time
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='hrc-pool-')}/pool.db")
+    os.environ["DB_POOL_SIZE"] = str(args.pool_size)
+    os.environ["DB_MAX_OVERFLOW"] = str(args.max_overflow)
+    os.environ["DB_POOL_TIMEOUT"] = str(args.pool_timeout)
+    os.environ["READ_REPLICA_URLS"] = ""
+
+    from sqlalchemy import text
+    from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+    from app.database import SessionLocal, pool_stats
+
+    lock = threading.Lock()
+    waits, timeouts, errors = [], [], []
+    peak = {"checked_out": 0}
+
+    def simulated_request():
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            db.execute(text("SELECT 1"))
+            waited = time.perf_counter() - started
+            with lock:
+                waits.append(waited * 1000)
+                peak["checked_out"] = max(peak["checked_out"], pool_stats()["primary"].get("checked_out", 0))
+            time.sleep(args.hold)
+        except PoolTimeoutError:
+            with lock:
+                timeouts.append((time.perf_counter() - started) * 1000)
+        except Exception as e:
+            with lock:
+                errors.append(str(e))
+        finally:
+            db.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        for _ in range(args.concurrency):
+            executor.submit(simulated_request)
+    wall_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    capacity = args.pool_size + args.max_overflow
+    report = {
+        "pool_size": args.pool_size,
+        "max_overflow": args.max_overflow,
+        "pool_timeout_s": args.pool_timeout,
+        "concurrency": args.concurrency,
+        "hold_s": args.hold,
+        "wall_ms": wall_ms,
+        "served": len(waits),
+        "timed_out": len(timeouts),
+        "errors": errors,
+        "peak_checked_out": peak["checked_out"],
+        "checkout_wait_ms": {
+            "p50": percentile(waits, 50),
+            "p95": percentile(waits, 95),
+            "max": round(max(waits), 1) if waits else None,
+        },
+        "max_time_to_timeout_ms": round(max(timeouts), 1) if timeouts else None,
+        "pool": pool_stats(),
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+    # Saturation must never exceed capacity, and waiting must be bounded by the pool timeout
+    bounded = report["max_time_to_timeout_ms"] is None or report["max_time_to_timeout_ms"] < (args.pool_timeout + 1) * 1000
+    ok = not errors and report["peak_checked_out"] <= capacity and bounded
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
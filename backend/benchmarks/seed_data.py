@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Synthetic large-tenant dataset generator for benchmarking.
+
+Populates the database pointed to by DATABASE_URL with a reproducible
+dataset through batched bulk inserts. Every generated client user and the
+benchmark admin share the same password so the load harness can log in.
+
+Usage (from the backend directory):
+    python -m benchmarks.seed_data --clients 5000 --users 100000 \
+        --tasks 2000000 --inquiries 500000 --documents 50000 --assignments 50000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import event, func, insert, select
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.database import engine, init_db
+from app.models.client import Client
+from app.models.document import Document, DocumentAssignment
+from app.models.task import Task, ClientInquiry, TaskStatus, TaskPriority, PRIORITY_RANKS
+from app.models.user import User
+from app.utils.auth import get_password_hash
+from app.utils.file_handler import UPLOAD_DIR
+
+BENCH_PASSWORD = "benchmark123"
+BENCH_ADMIN_EMAIL = "bench-admin@paradigm.com"
+BENCH_EMAIL_DOMAIN = "bench.example.com"
+
+INDUSTRIES = ["healthcare", "construction", "professional_services", "manufacturing", "retail"]
+DOCUMENT_TYPES = ["handbook", "training", "checklist", "policy", "form", "template"]
+TASK_TYPES = ["compliance_audit", "training", "handbook_review", "safety_inspection", "certification", "note"]
+INQUIRY_TYPES = ["question", "incident", "complaint", "request"]
+INQUIRY_STATUSES = ["open", "in_review", "resolved", "closed"]
+FIXTURE_SIZES = [8 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024]
+
+
+def client_user_email(index: int) -> str:
+    """Deterministic email of the n-th generated client user"""
+    return f"user{index}@{BENCH_EMAIL_DOMAIN}"
+
+
+def _next_id(conn, model) -> int:
+    """First free primary key for a table"""
+    return (conn.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def _bulk_insert(conn, model, rows_iter, total: int, batch_size: int):
+    """Insert rows from an iterator in executemany batches"""
+    started = time.perf_counter()
+    batch = []
+    inserted = 0
+    for row in rows_iter:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            conn.execute(insert(model), batch)
+            inserted += len(batch)
+            batch = []
+    if batch:
+        conn.execute(insert(model), batch)
+        inserted += len(batch)
+
+    elapsed = time.perf_counter() - started
+    rate = inserted / elapsed if elapsed else 0
+    print(f"  {model.__tablename__}: {inserted}/{total} rows in {elapsed:.1f}s ({rate:,.0f} rows/s)")
+
+
+def _write_fixture_files() -> list:
+    """Create a handful of shared payload files that generated documents point at"""
+    fixture_dir = Path(UPLOAD_DIR).resolve() / "bench"
+    fixture_dir.mkdir(parents=True, exist_ok=True)
+    fixtures = []
+    for size in FIXTURE_SIZES:
+        path = fixture_dir / f"fixture_{size}.pdf"
+        if not path.exists() or path.stat().st_size != size:
+            path.write_bytes(os.urandom(size))
+        fixtures.append((str(path), size))
+    return fixtures
+
+
+def _enable_fast_sqlite_writes():
+    """Relax durability for the seeding connection only"""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.close()
+
+
+def seed(args):
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+
+    _enable_fast_sqlite_writes()
+    init_db()
+
+    print("Hashing shared benchmark password...")
+    password_hash = get_password_hash(BENCH_PASSWORD)
+    fixtures = _write_fixture_files()
+
+    with engine.begin() as conn:
+        admin_id = conn.execute(
+            select(User.id).where(User.email == BENCH_ADMIN_EMAIL)
+        ).scalar()
+        if admin_id is None:
+            admin_id = _next_id(conn, User)
+            conn.execute(insert(User), [{
+                "id": admin_id,
+                "email": BENCH_ADMIN_EMAIL,
+                "hashed_password": password_hash,
+                "full_name": "Benchmark Admin",
+                "is_admin": True,
+                "is_active": True,
+            }])
+
+        existing = conn.execute(
+            select(func.count(User.id)).where(User.email.like(f"%@{BENCH_EMAIL_DOMAIN}"))
+        ).scalar()
+        if existing:
+            print(f"Database already contains {existing} benchmark users; refusing to seed twice.")
+            return
+
+        client_start = _next_id(conn, Client)
+        user_start = _next_id(conn, User)
+        document_start = _next_id(conn, Document)
+        client_ids = list(range(client_start, client_start + args.clients))
+        document_ids = list(range(document_start, document_start + args.documents))
+
+    def clients():
+        for i, client_id in enumerate(client_ids):
+            yield {
+                "id": client_id,
+                "company_name": f"Benchmark Company {i:05d}",
+                "industry": rng.choice(INDUSTRIES),
+                "employee_count": rng.randint(10, 200),
+                "point_of_contact": f"Contact {i}",
+                "contact_email": f"contact{i}@{BENCH_EMAIL_DOMAIN}",
+                "is_active": rng.random() > 0.02,
+            }
+
+    def users():
+        for i in range(args.users):
+            yield {
+                "id": user_start + i,
+                "email": client_user_email(i),
+                "hashed_password": password_hash,
+                "full_name": f"Benchmark User {i}",
+                "is_admin": False,
+                "is_active": True,
+                "client_id": client_ids[i % len(client_ids)],
+            }
+
+    def documents():
+        for i, document_id in enumerate(document_ids):
+            file_path, file_size = fixtures[i % len(fixtures)]
+            yield {
+                "id": document_id,
+                "filename": os.path.basename(file_path),
+                "original_filename": f"benchmark_document_{i}.pdf",
+                "file_path": file_path,
+                "file_size": file_size,
+                "mime_type": "application/pdf",
+                "document_type": rng.choice(DOCUMENT_TYPES),
+                "uploaded_by_id": admin_id,
+                "is_active": rng.random() > 0.05,
+            }
+
+    def assignments():
+        seen = set()
+        max_pairs = len(client_ids) * len(document_ids)
+        target = min(args.assignments, max_pairs)
+        while len(seen) < target:
+            pair = (rng.choice(document_ids), client_ids[len(seen) % len(client_ids)])
+            if pair in seen:
+                continue
+            seen.add(pair)
+            yield {
+                "document_id": pair[0],
+                "client_id": pair[1],
+                "assigned_by_id": admin_id,
+                "is_active": rng.random() > 0.05,
+            }
+
+    statuses = list(TaskStatus)
+    priorities = list(TaskPriority)
+
+    def tasks():
+        for i in range(args.tasks):
+            status = rng.choice(statuses)
+            due_date = now + timedelta(days=rng.randint(-365, 365), hours=rng.randint(0, 23))
+            yield {
+                "title": f"Benchmark task {i}",
+                "task_type": rng.choice(TASK_TYPES),
+                "status": status,
+                "priority": rng.choice(priorities),
+                "due_date": due_date,
+                "completed_date": due_date if status == TaskStatus.COMPLETED else None,
+                "client_id": client_ids[i % len(client_ids)],
+                "created_by_id": admin_id,
+                "is_active": rng.random() > 0.03,
+            }
+
+    def inquiries():
+        for i in range(args.inquiries):
+            priority = rng.choice(priorities)
+            yield {
+                "subject": f"Benchmark inquiry {i}",
+                "description": "Generated for load testing",
+                "inquiry_type": rng.choice(INQUIRY_TYPES),
+                "status": rng.choice(INQUIRY_STATUSES),
+                "priority": priority,
+                "priority_rank": PRIORITY_RANKS[priority.value],
+                "client_id": client_ids[i % len(client_ids)],
+                "submitted_by_id": user_start + (i % max(args.users, 1)) if args.users else admin_id,
+            }
+
+    print(f"Seeding with seed={args.seed}, batch size={args.batch_size}")
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        _bulk_insert(conn, Client, clients(), args.clients, args.batch_size)
+        _bulk_insert(conn, User, users(), args.users, args.batch_size)
+        _bulk_insert(conn, Document, documents(), args.documents, args.batch_size)
+        _bulk_insert(conn, DocumentAssignment, assignments(), args.assignments, args.batch_size)
+        _bulk_insert(conn, Task, tasks(), args.tasks, args.batch_size)
+        _bulk_insert(conn, ClientInquiry, inquiries(), args.inquiries, args.batch_size)
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+    print(f"Admin login: {BENCH_ADMIN_EMAIL} / {BENCH_PASSWORD}")
+    print(f"Client logins: {client_user_email(0)} ... / {BENCH_PASSWORD}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Seed a synthetic large-tenant dataset")
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--tasks", type=int, default=2000000)
+    parser.add_argument("--inquiries", type=int, default=500000)
+    parser.add_argument("--documents", type=int, default=50000)
+    parser.add_argument("--assignments", type=int, default=50000)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed for reproducible data")
+    args = parser.parse_args(argv)
+    if args.clients < 1:
+        parser.error("--clients must be at least 1")
+    return args
+
+
+if __name__ == "__main__":
+    seed(parse_args())
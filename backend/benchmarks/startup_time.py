@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Cold-start measurement for the boot sequence.
+
+Starts N worker processes at once against a fresh SQLite database, each
+importing app.main and running its startup hooks, and reports import and
+boot timings per worker plus how many workers applied the schema. A
+correct boot has exactly one schema-applying worker and no failures.
+
+Usage (from the backend directory):
+    python -m benchmarks.startup_time --workers 4 --output startup.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+FRONTEND_DIR = BACKEND_DIR.parent / "frontend"
+
+WORKER_SCRIPT = r"""
+import asyncio, json, time
+started = time.perf_counter()
+import app.boot as boot
+applied = []
+original = boot.ensure_schema
+boot.ensure_schema = lambda: applied.append(original()) or applied[-1]
+from app.main import app
+imported = time.perf_counter()
+async def main():
+    await app.router.startup()
+    booted = time.perf_counter()
+    await app.router.shutdown()
+    return booted
+booted = asyncio.run(main())
+print(json.dumps({
+    "import_ms": round((imported - started) * 1000, 1),
+    "startup_ms": round((booted - imported) * 1000, 1),
+    "boot_steps_ms": boot.boot_state.timings,
+    "applied_schema": bool(applied and applied[0]),
+}))
+"""
+
+def run(workers: int) -> dict:
+    workdir = tempfile.mkdtemp(prefix="hrc-startup-")
+    os.symlink(FRONTEND_DIR, os.path.join(workdir, "frontend"))  # Static mounts are cwd-relative
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{workdir}/startup.db",
+        SCHEMA_LOCK_PATH=os.path.join(workdir, "schema.lock"),
+        EVENTS_SOCKET_DIR=os.path.join(workdir, "events"),
+        PYTHONPATH=str(BACKEND_DIR),
+    )
+
+    started = time.perf_counter()
+    processes = [
+        subprocess.Popen([sys.executable, "-c", WORKER_SCRIPT], cwd=workdir, env=env,
+                         stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        for _ in range(workers)
+    ]
+    results, failures = [], []
+    for process in processes:
+        stdout, stderr = process.communicate()
+        lines = [line for line in stdout.splitlines() if line.startswith("{")]
+        if process.returncode != 0 or not lines:
+            failures.append(stderr.strip().splitlines()[-1:] or ["no output"])
+        else:
+            results.append(json.loads(lines[-1]))
+    wall_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    return {
+        "workers": workers,
+        "wall_ms": wall_ms,
+        "failures": failures,
+        "schema_applied_by": sum(1 for r in results if r["applied_schema"]),
+        "max_startup_ms": max((r["startup_ms"] for r in results), default=None),
+        "max_import_ms": max((r["import_ms"] for r in results), default=None),
+        "per_worker": results,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure concurrent cold starts")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run(args.workers)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+    ok = not report["failures"] and report["schema_applied_by"] == 1
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
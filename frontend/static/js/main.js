@@ -242,6 +242,47 @@ function hideModal(modalId) {
     }
 }
 
+// Live updates: subscribe to server-sent change events, falling back to polling
+function subscribeToChanges(onChange, onResync) {
+    if (!authToken || typeof EventSource === 'undefined') {
+        return null;
+    }
+    
+    const source = new EventSource(`${API_BASE_URL}/events/stream?token=${encodeURIComponent(authToken)}`);
+    let reconnecting = false;
+    
+    source.addEventListener('change', (e) => {
+        const event = JSON.parse(e.data);
+        if (event.action === 'resync' && onResync) {
+            onResync();
+        } else {
+            onChange(event);
+        }
+    });
+    
+    source.onerror = () => {
+        reconnecting = true;
+    };
+    
+    source.onopen = () => {
+        // Events may have been missed while disconnected
+        if (reconnecting && onResync) {
+            onResync();
+        }
+        reconnecting = false;
+    };
+    
+    return source;
+}
+
+function startPolling(interval) {
+    return setInterval(() => {
+        if (typeof refreshDashboard === 'function') {
+            refreshDashboard();
+        }
+    }, interval);
+}
+
 // Initialize common functionality
 document.addEventListener('DOMContentLoaded', function() {
     // Add logout functionality to logout buttons
@@ -268,15 +309,15 @@ document.addEventListener('DOMContentLoaded', function() {
     const sortableTables = document.querySelectorAll('.table[data-sortable]');
     sortableTables.forEach(makeSortable);
     
-    // Auto-refresh functionality for dashboards
+    // Live updates for pages that handle change events; polling otherwise
+    const resync = typeof refreshDashboard === 'function' ? refreshDashboard : null;
+    const liveSource = typeof handleChangeEvent === 'function'
+        ? subscribeToChanges(handleChangeEvent, resync)
+        : null;
+    
     const autoRefresh = document.querySelector('[data-auto-refresh]');
-    if (autoRefresh) {
-        const interval = parseInt(autoRefresh.dataset.autoRefresh) || 30000;
-        setInterval(() => {
-            if (typeof refreshDashboard === 'function') {
-                refreshDashboard();
-            }
-        }, interval);
+    if (autoRefresh && !liveSource) {
+        startPolling(parseInt(autoRefresh.dataset.autoRefresh) || 30000);
     }
 });
 
@@ -288,6 +329,7 @@ window.HRApp = {
     uploadDocument,
     downloadDocument,
     apiRequest,
+    subscribeToChanges,
     showAlert,
     formatDate,
     formatFileSize,